@@ -1,54 +1,368 @@
 """TerneoMQ integration for Home Assistant."""
 
+import asyncio
 import logging
+from functools import partial
+from pathlib import Path
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
+from .archive import ARCHIVE_MAINTENANCE_INTERVAL, TerneoArchive
+from .const import (
+    DATA_RUNTIME,
+    DOMAIN,
+    SIGNAL_DEVICE_ADDED,
+    SIGNAL_DEVICE_REMOVED,
+    SIGNAL_OPTIONS_UPDATED,
+)
 from .coordinator import TerneoCoordinator
-from .helpers import get_mqtt_prefixes
+from .discovery import TerneoDiscovery
+from .helpers import get_entry_settings
+from .hub import get_hub
+from .outbound import PRIORITY_BACKGROUND
+from .runtime import TerneoEntryRuntime, get_entry_runtime
+from .scheduler import get_scheduler
+from .services import async_setup_services
+from .statistics import TerneoStatisticsImporter
+from .websocket import async_setup_websocket_api
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, _config: ConfigType) -> bool:
+    """Set up TerneoMQ services and websocket commands."""
+    async_setup_services(hass)
+    async_setup_websocket_api(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up TerneoMQ from a config entry."""
-    # Create coordinators for each device
+    # Acquire shared coordinators for each device
     hass.data.setdefault(DOMAIN, {}).setdefault(entry.entry_id, {})
-    publish_prefix, command_prefix = get_mqtt_prefixes(entry)
-    supports_air_temp = entry.options.get(
-        "supports_air_temp", entry.data.get("supports_air_temp", True)
-    )
+    settings = get_entry_settings(entry)
+    runtime = TerneoEntryRuntime(settings, get_scheduler(hass).scope())
+    hass.data[DOMAIN].setdefault(DATA_RUNTIME, {})[entry.entry_id] = runtime
+    entry.async_on_unload(runtime.scheduler.cancel_all)
+    if settings["archive_days"] > 0:
+        runtime.archive = TerneoArchive(
+            Path(hass.config.path(DOMAIN, entry.entry_id)), settings["archive_days"]
+        )
+        await hass.async_add_executor_job(runtime.archive.load)
+        runtime.scheduler.schedule_interval(
+            "archive",
+            ARCHIVE_MAINTENANCE_INTERVAL,
+            partial(_async_maintain_archive, hass, entry, runtime.archive),
+        )
     reset_status_on_start = entry.options.get("reset_status_on_start", False)
     for device in entry.data.get("devices", []):
-        client_id = device["client_id"]
-        coordinator = TerneoCoordinator(
-            hass, client_id, publish_prefix, command_prefix, supports_air_temp
+        coordinator = await _async_acquire_device(
+            hass, entry.entry_id, runtime, device["client_id"]
         )
-        hass.data[DOMAIN][entry.entry_id][client_id] = coordinator
-        await coordinator.async_setup()
-        if reset_status_on_start:
+        if coordinator is not None and reset_status_on_start:
             coordinator.set_cached_value("powerOff", 1)
             coordinator.set_cached_value("setTemp", 18.0)
-            await coordinator.publish_command("powerOff", "1")
-            await coordinator.publish_command("setTemp", "18")
+
+    if settings["energy_statistics"] and "recorder" not in hass.config.components:
+        _LOGGER.warning("Energy statistics are not imported without the recorder")
+    elif settings["energy_statistics"]:
+        runtime.statistics = TerneoStatisticsImporter(
+            hass, entry.entry_id, settings["rated_power_w"]
+        )
+        runtime.statistics.start()
+        for coordinator in hass.data[DOMAIN][entry.entry_id].values():
+            runtime.statistics.add_device(coordinator)
 
     # Forward the setup to the platforms
     await hass.config_entries.async_forward_entry_setups(
         entry, ["climate", "sensor", "binary_sensor", "number", "select"]
     )
+
+    if reset_status_on_start:
+        # Queued behind interactive commands, so setup does not wait for it
+        entry.async_create_background_task(
+            hass,
+            _async_reset_devices(list(hass.data[DOMAIN][entry.entry_id].values())),
+            "terneo reset on start",
+        )
+    if settings["discovery"]:
+        await _async_start_discovery(hass, entry, runtime)
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    # Teardown coordinators
-    if DOMAIN in hass.data and entry.entry_id in hass.data[DOMAIN]:
-        for coordinator in hass.data[DOMAIN][entry.entry_id].values():
-            await coordinator.async_teardown()
-        del hass.data[DOMAIN][entry.entry_id]
+    runtime = hass.data.get(DOMAIN, {}).get(DATA_RUNTIME, {}).pop(entry.entry_id, None)
+    if runtime is not None:
+        if runtime.discovery is not None:
+            runtime.discovery.async_stop()
+        if runtime.statistics is not None:
+            runtime.statistics.stop()
+        if runtime.archive is not None:
+            runtime.scheduler.cancel("archive")
+            for coordinator in [
+                *hass.data[DOMAIN].get(entry.entry_id, {}).values(),
+                *runtime.standby.values(),
+            ]:
+                _detach_archive(coordinator, runtime.archive)
+            await hass.async_add_executor_job(runtime.archive.close)
 
-    return await hass.config_entries.async_unload_platforms(
+    unloaded = await hass.config_entries.async_unload_platforms(
         entry, ["climate", "sensor", "binary_sensor", "number", "select"]
     )
+
+    # Release shared coordinators; the last entry using one tears it down
+    if DOMAIN in hass.data and entry.entry_id in hass.data[DOMAIN]:
+        hub = get_hub(hass)
+        owned = hass.data[DOMAIN].pop(entry.entry_id)
+        standby = runtime.standby.values() if runtime is not None else ()
+        for coordinator in [*owned.values(), *standby]:
+            await hub.async_release(entry.entry_id, coordinator)
+        # Our entities are gone, so other entries can show the devices now
+        for coordinator in owned.values():
+            _async_hand_over(hass, coordinator)
+
+    return unloaded
+
+
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options to a loaded entry without reloading it."""
+    runtime = get_entry_runtime(hass, entry.entry_id)
+    old = runtime.settings
+    new = get_entry_settings(entry)
+    if new == old:
+        return
+    if (
+        new["publish_prefix"] != old["publish_prefix"]
+        or new["command_prefix"] != old["command_prefix"]
+        or new["reduced_recording"] != old["reduced_recording"]
+        or new["aggregate_windows"] != old["aggregate_windows"]
+        or new["duty_cycle_windows"] != old["duty_cycle_windows"]
+        or new["daily_rollups"] != old["daily_rollups"]
+        or new["fleet_sensors"] != old["fleet_sensors"]
+        or new["energy_statistics"] != old["energy_statistics"]
+        or new["energy_sensor"] != old["energy_sensor"]
+        or new["archive_days"] != old["archive_days"]
+    ):
+        # Every topic or entity changes, so there is nothing to keep
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+        return
+    runtime.settings = new
+    coordinators = hass.data[DOMAIN][entry.entry_id]
+
+    if new["supports_air_temp"] != old["supports_air_temp"]:
+        for coordinator in coordinators.values():
+            await coordinator.async_set_supports_air_temp(new["supports_air_temp"])
+
+    if any(
+        new[key] != old[key]
+        for key in (
+            "deadband",
+            "min_interval",
+            "max_silent_interval",
+            "history_hours",
+        )
+    ):
+        for coordinator in coordinators.values():
+            _apply_coordinator_settings(coordinator, new)
+
+    if new["model"] != old["model"]:
+        device_registry = dr.async_get(hass)
+        for client_id in coordinators:
+            device = device_registry.async_get_device(identifiers={(DOMAIN, client_id)})
+            if device is not None:
+                device_registry.async_update_device(device.id, model=new["model"])
+
+    if new["discovery"] != old["discovery"]:
+        if new["discovery"]:
+            await _async_start_discovery(hass, entry, runtime)
+        elif runtime.discovery is not None:
+            runtime.discovery.async_stop()
+            runtime.discovery = None
+
+    changes = {key: value for key, value in new.items() if old[key] != value}
+    async_dispatcher_send(hass, SIGNAL_OPTIONS_UPDATED.format(entry.entry_id), changes)
+
+
+def _apply_coordinator_settings(
+    coordinator: TerneoCoordinator, settings: dict[str, Any]
+) -> None:
+    """Configure filtering, aggregates and history of a coordinator."""
+    coordinator.set_change_filter(
+        settings["deadband"],
+        settings["min_interval"],
+        settings["max_silent_interval"],
+    )
+    for minutes in settings["aggregate_windows"]:
+        coordinator.add_aggregate_window(minutes * 60)
+    for minutes in settings["duty_cycle_windows"]:
+        coordinator.add_duty_cycle_window(minutes * 60)
+    coordinator.set_history_horizon(settings["history_hours"])
+
+
+async def _async_reset_devices(coordinators: list[TerneoCoordinator]) -> None:
+    """Turn devices off and set them to 18 °C at background priority."""
+
+    async def _async_reset(coordinator: TerneoCoordinator) -> None:
+        await coordinator.publish_command("powerOff", "1", priority=PRIORITY_BACKGROUND)
+        await coordinator.publish_command("setTemp", "18", priority=PRIORITY_BACKGROUND)
+
+    await asyncio.gather(*(_async_reset(coordinator) for coordinator in coordinators))
+
+
+def _detach_archive(coordinator: TerneoCoordinator, archive: TerneoArchive) -> None:
+    """Stop writing a device to one entry's archive, keeping the others."""
+    if archive in coordinator.archives:
+        coordinator.archives.remove(archive)
+
+
+@callback
+def _async_maintain_archive(
+    hass: HomeAssistant, entry: ConfigEntry, archive: TerneoArchive
+) -> None:
+    """Run the archive's file maintenance in the executor."""
+    entry.async_create_background_task(
+        hass,
+        hass.async_add_executor_job(archive.maintain),
+        "terneo archive maintenance",
+    )
+
+
+async def _async_acquire_device(
+    hass: HomeAssistant, entry_id: str, runtime: TerneoEntryRuntime, client_id: str
+) -> TerneoCoordinator | None:
+    """Acquire a device for an entry, returning it if the entry shows it."""
+    settings = runtime.settings
+    hub = get_hub(hass)
+    coordinator = await hub.async_acquire(
+        entry_id,
+        client_id,
+        settings["publish_prefix"],
+        settings["command_prefix"],
+        settings["supports_air_temp"],
+    )
+    if runtime.archive is not None:
+        coordinator.archives.append(runtime.archive)
+    if hub.entity_owner(settings["publish_prefix"], client_id) != entry_id:
+        # Filter, window and history settings also stay with that entry
+        _LOGGER.debug(
+            "Device %s is shown by another entry until that entry releases it",
+            client_id,
+        )
+        runtime.standby[client_id] = coordinator
+        return None
+    hass.data[DOMAIN][entry_id][client_id] = coordinator
+    _apply_coordinator_settings(coordinator, settings)
+    return coordinator
+
+
+@callback
+def _async_hand_over(hass: HomeAssistant, coordinator: TerneoCoordinator) -> None:
+    """Let the next entry using a released device create its entities."""
+    entry_id = get_hub(hass).entity_owner(
+        coordinator.telemetry_prefix, coordinator.client_id
+    )
+    if entry_id is None:
+        return
+    runtime = get_entry_runtime(hass, entry_id)
+    if runtime.standby.pop(coordinator.client_id, None) is None:
+        return
+    hass.data[DOMAIN][entry_id][coordinator.client_id] = coordinator
+    _apply_coordinator_settings(coordinator, runtime.settings)
+    if runtime.statistics is not None:
+        runtime.statistics.add_device(coordinator)
+    async_dispatcher_send(
+        hass, SIGNAL_DEVICE_ADDED.format(entry_id), coordinator.client_id
+    )
+
+
+async def _async_start_discovery(
+    hass: HomeAssistant, entry: ConfigEntry, runtime: TerneoEntryRuntime
+) -> None:
+    """Start listening for unconfigured devices on the telemetry prefix."""
+    runtime.discovery = TerneoDiscovery(hass, entry, runtime.settings["publish_prefix"])
+    await runtime.discovery.async_start()
+
+
+async def async_add_device(
+    hass: HomeAssistant, entry: ConfigEntry, client_id: str
+) -> bool:
+    """Add a device to an entry without reloading the other devices."""
+    devices = entry.data.get("devices", [])
+    if any(device["client_id"] == client_id for device in devices):
+        return False
+    hass.config_entries.async_update_entry(
+        entry,
+        data={**entry.data, "devices": [*devices, {"client_id": client_id}]},
+    )
+    runtime = hass.data.get(DOMAIN, {}).get(DATA_RUNTIME, {}).get(entry.entry_id)
+    if runtime is None:
+        # Entry is not loaded; the device is picked up on next setup
+        return True
+
+    coordinator = await _async_acquire_device(hass, entry.entry_id, runtime, client_id)
+    if coordinator is None:
+        return True
+    if runtime.statistics is not None:
+        runtime.statistics.add_device(coordinator)
+    async_dispatcher_send(hass, SIGNAL_DEVICE_ADDED.format(entry.entry_id), client_id)
+    return True
+
+
+async def async_remove_device(
+    hass: HomeAssistant, entry: ConfigEntry, client_id: str
+) -> bool:
+    """Remove a device from an entry without reloading the other devices."""
+    devices = entry.data.get("devices", [])
+    if not any(device["client_id"] == client_id for device in devices):
+        return False
+    hass.config_entries.async_update_entry(
+        entry,
+        data={
+            **entry.data,
+            "devices": [
+                device for device in devices if device["client_id"] != client_id
+            ],
+        },
+    )
+
+    # Detaching the entry from the device also removes the entry's entities
+    device_registry = dr.async_get(hass)
+    device = device_registry.async_get_device(identifiers={(DOMAIN, client_id)})
+    if device is not None:
+        device_registry.async_update_device(
+            device.id, remove_config_entry_id=entry.entry_id
+        )
+    for entry_runtime in hass.data.get(DOMAIN, {}).get(DATA_RUNTIME, {}).values():
+        if entry_runtime.discovery is not None:
+            entry_runtime.discovery.forget(client_id)
+
+    runtime = hass.data.get(DOMAIN, {}).get(DATA_RUNTIME, {}).get(entry.entry_id)
+    if runtime is None:
+        return True
+    if (coordinator := runtime.standby.pop(client_id, None)) is not None:
+        if runtime.archive is not None:
+            _detach_archive(coordinator, runtime.archive)
+        await get_hub(hass).async_release(entry.entry_id, coordinator)
+        return True
+    coordinators = hass.data[DOMAIN].get(entry.entry_id, {})
+    if client_id not in coordinators:
+        return True
+    coordinator = coordinators.pop(client_id)
+    if runtime.archive is not None:
+        _detach_archive(coordinator, runtime.archive)
+    if runtime.statistics is not None:
+        runtime.statistics.remove_device(client_id)
+    async_dispatcher_send(hass, SIGNAL_DEVICE_REMOVED.format(entry.entry_id), client_id)
+    await get_hub(hass).async_release(entry.entry_id, coordinator)
+    _async_hand_over(hass, coordinator)
+    return True
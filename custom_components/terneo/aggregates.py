@@ -0,0 +1,117 @@
+"""Rolling window aggregates of telemetry for TerneoMQ integration."""
+
+from __future__ import annotations
+
+from collections import deque
+
+AGGREGATE_KEYS = ("floorTemp", "airTemp")
+AGGREGATE_STEPS = 12  # aggregate sensors update this many times per window
+DUTY_CYCLE_WINDOWS = (60, 1440)  # minutes, always tracked
+DUTY_CYCLE_MAX_PUBLISH_INTERVAL = 600  # seconds
+
+
+class TerneoRollingWindow:
+    """Min, max and mean of the samples seen over a sliding time window.
+
+    Min and max are kept in monotonic deques and the mean in a running sum,
+    so adding a sample and reading the aggregates are amortized O(1).
+    """
+
+    def __init__(self, length: float) -> None:
+        """Initialize an empty window of length seconds."""
+        self.length = length
+        self._samples: deque[tuple[float, float]] = deque()
+        self._sum = 0.0
+        # Candidates for the minimum, values increasing from the left
+        self._min: deque[tuple[float, float]] = deque()
+        # Candidates for the maximum, values decreasing from the left
+        self._max: deque[tuple[float, float]] = deque()
+
+    def add(self, now: float, value: float) -> None:
+        """Add a sample taken at now."""
+        self._evict(now)
+        self._samples.append((now, value))
+        self._sum += value
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((now, value))
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((now, value))
+
+    def stats(self, now: float) -> tuple[float, float, float] | None:
+        """Return min, max and mean over the window ending at now."""
+        self._evict(now)
+        if not self._samples:
+            return None
+        return self._min[0][1], self._max[0][1], self._sum / len(self._samples)
+
+    def _evict(self, now: float) -> None:
+        """Drop samples that fell out of the window."""
+        cutoff = now - self.length
+        samples = self._samples
+        while samples and samples[0][0] <= cutoff:
+            self._sum -= samples.popleft()[1]
+        if not samples:
+            # Start again from an exact zero instead of accumulated rounding
+            self._sum = 0.0
+        while self._min and self._min[0][0] <= cutoff:
+            self._min.popleft()
+        while self._max and self._max[0][0] <= cutoff:
+            self._max.popleft()
+
+
+class TerneoDutyCycle:
+    """Share of a sliding time window during which the load was on.
+
+    Closed on-intervals are kept in a deque with a running total of their
+    length, so a load transition and a query are amortized O(1). Until a
+    full window has been observed the share is taken over the observed
+    time only.
+    """
+
+    def __init__(self, length: float) -> None:
+        """Initialize an empty duty cycle over length seconds."""
+        self.length = length
+        self._intervals: deque[tuple[float, float]] = deque()
+        self._total = 0.0
+        self._on_since: float | None = None
+        self._started: float | None = None
+
+    def add(self, now: float, on: bool) -> None:
+        """Record the load state reported at now."""
+        if self._started is None:
+            self._started = now
+        if on and self._on_since is None:
+            self._on_since = now
+        elif not on and self._on_since is not None:
+            self._intervals.append((self._on_since, now))
+            self._total += now - self._on_since
+            self._on_since = None
+            self._evict(now)
+
+    def ratio(self, now: float) -> float | None:
+        """Return the on share of the window ending at now."""
+        if self._started is None:
+            return None
+        self._evict(now)
+        cutoff = now - self.length
+        on_time = self._total
+        if self._intervals and self._intervals[0][0] < cutoff:
+            on_time -= cutoff - self._intervals[0][0]
+        if self._on_since is not None:
+            on_time += now - max(self._on_since, cutoff)
+        observed = min(self.length, now - self._started)
+        if observed <= 0:
+            return float(self._on_since is not None)
+        return on_time / observed
+
+    def _evict(self, now: float) -> None:
+        """Drop on-intervals that ended before the window."""
+        cutoff = now - self.length
+        intervals = self._intervals
+        while intervals and intervals[0][1] <= cutoff:
+            start, end = intervals.popleft()
+            self._total -= end - start
+        if not intervals:
+            self._total = 0.0
@@ -0,0 +1,230 @@
+"""Fleet-wide anomaly detection for TerneoMQ integration."""
+
+from __future__ import annotations
+
+import logging
+from bisect import bisect_left
+from statistics import median
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import issue_registry as ir
+
+from .const import DOMAIN, EVENT_ANOMALY
+from .thermal import Samples, load_runs
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from .clock import TerneoClock
+    from .coordinator import TerneoCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+ANOMALY_INTERVAL = 300  # seconds between fleet passes
+
+ANOMALY_STUCK_SENSOR = "stuck_floor_sensor"
+ANOMALY_NO_RISE = "heating_without_rise"
+ANOMALY_FLAPPING = "load_flapping"
+ANOMALY_PROT_CREEP = "prot_temp_creep"
+
+STUCK_WINDOW = 7200  # seconds of floor temperature checked for a stuck sensor
+STUCK_MIN_SAMPLES = 20
+STUCK_MAX_RANGE = 0.05  # °C the floor moves at most while heating to count as stuck
+NO_RISE_MIN_ON = 3600  # seconds of continuous heating before a rise is expected
+NO_RISE_MIN_RISE = 0.3  # °C
+FLAP_WINDOW = 300  # seconds
+FLAP_MAX_TRANSITIONS = 10
+CREEP_MIN_SAMPLES = 10
+CREEP_MIN_SPAN = 3600  # seconds of protTemp a creep slope needs
+CREEP_MIN_RATE = 1.0  # °C per hour
+CREEP_MAD_FACTOR = 3.0  # fleet deviations above the median that make an outlier
+CREEP_MIN_FLEET = 3  # devices needed to compare against the fleet
+
+
+def _stuck_range(floor: Samples, load: Samples, now: float) -> float | None:
+    """Return the floor temperature range while the load ran in the window."""
+    times, values = floor
+    lo = bisect_left(times, now - STUCK_WINDOW)
+    if len(times) - lo < STUCK_MIN_SAMPLES or times[lo] > now - STUCK_WINDOW * 0.75:
+        return None
+    load_times, load_values = load
+    first = bisect_left(load_times, now - STUCK_WINDOW)
+    heated = any(load_values[first:]) or (first > 0 and load_values[first - 1])
+    if not heated:
+        return None
+    window = values[lo:]
+    return max(window) - min(window)
+
+
+def _longest_run_rise(floor: Samples, load: Samples, now: float) -> float | None:
+    """Return the floor temperature rise of the longest long heating run."""
+    times, values = floor
+    runs = load_runs(load)
+    longest = None
+    for index, (start, state, _) in enumerate(runs):
+        end = runs[index + 1][0] if index + 1 < len(runs) else now
+        if state and end - start >= NO_RISE_MIN_ON:
+            if longest is None or end - start > longest[1] - longest[0]:
+                longest = (start, end)
+    if longest is None:
+        return None
+    lo = bisect_left(times, longest[0])
+    hi = bisect_left(times, longest[1])
+    if hi - lo < 2:
+        return None
+    return max(values[lo:hi]) - values[lo]
+
+
+def _flaps(load: Samples, now: float) -> int:
+    """Return the number of load transitions in the flapping window."""
+    return sum(
+        1 for start, _, seen in load_runs(load) if seen and start > now - FLAP_WINDOW
+    )
+
+
+def _creep_rate(prot: Samples) -> float | None:
+    """Return the least-squares slope of protTemp in °C per hour."""
+    times, values = prot
+    count = len(times)
+    if count < CREEP_MIN_SAMPLES or times[-1] - times[0] < CREEP_MIN_SPAN:
+        return None
+    mean_t = sum(times) / count
+    mean_v = sum(values) / count
+    sxx = sum((timestamp - mean_t) ** 2 for timestamp in times)
+    sxy = sum(
+        (timestamp - mean_t) * (value - mean_v)
+        for timestamp, value in zip(times, values, strict=True)
+    )
+    return sxy / sxx * 3600
+
+
+def detect_fleet_anomalies(
+    inputs: dict[str, tuple[Samples, Samples, Samples]], now: float
+) -> dict[str, dict[str, float]]:
+    """Return the anomalies of every device with the value that tripped them.
+
+    Each indicator is computed per device from its history in plain Python
+    and then compared with its threshold; protTemp creep is additionally
+    compared against the fleet so that a warm day raising every protTemp
+    is not reported.
+    """
+    client_ids = list(inputs)
+    stuck = [_stuck_range(floor, load, now) for floor, load, _ in inputs.values()]
+    rise = [_longest_run_rise(floor, load, now) for floor, load, _ in inputs.values()]
+    flaps = [_flaps(load, now) for _, load, _ in inputs.values()]
+    creep = [_creep_rate(prot) for _, _, prot in inputs.values()]
+
+    creep_limit = CREEP_MIN_RATE
+    rates = [rate for rate in creep if rate is not None]
+    if len(rates) >= CREEP_MIN_FLEET:
+        center = median(rates)
+        spread = median(abs(rate - center) for rate in rates) * 1.4826
+        creep_limit = max(creep_limit, center + CREEP_MAD_FACTOR * spread)
+
+    checks = (
+        (ANOMALY_STUCK_SENSOR, stuck, lambda value: value < STUCK_MAX_RANGE),
+        (ANOMALY_NO_RISE, rise, lambda value: value < NO_RISE_MIN_RISE),
+        (ANOMALY_FLAPPING, flaps, lambda value: value >= FLAP_MAX_TRANSITIONS),
+        (ANOMALY_PROT_CREEP, creep, lambda value: value > creep_limit),
+    )
+    anomalies: dict[str, dict[str, float]] = {client_id: {} for client_id in client_ids}
+    for anomaly, values, tripped in checks:
+        for client_id, value in zip(client_ids, values, strict=True):
+            if value is not None and tripped(value):
+                anomalies[client_id][anomaly] = round(value, 2)
+    return anomalies
+
+
+class TerneoAnomalyDetector:
+    """Periodically check the whole fleet and report devices that misbehave.
+
+    A repair issue is raised and an event fired when a device starts
+    showing an anomaly; the issue is removed once the anomaly clears.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinators: Callable[[], Iterable[TerneoCoordinator]],
+    ) -> None:
+        """Initialize the detector."""
+        self.hass = hass
+        self._coordinators = coordinators
+        self._cancel: CALLBACK_TYPE | None = None
+        self._clock: TerneoClock | None = None
+        self._running = False
+        self.active: set[tuple[str, str]] = set()
+
+    def start(self, clock: TerneoClock) -> None:
+        """Check the fleet every ANOMALY_INTERVAL seconds."""
+        if self._cancel is None:
+            self._clock = clock
+            self._cancel = clock.track_interval(self._run, ANOMALY_INTERVAL)
+
+    def stop(self) -> None:
+        """Stop checking and withdraw the raised issues."""
+        if self._cancel is not None:
+            self._cancel()
+            self._cancel = None
+        for client_id, anomaly in self.active:
+            ir.async_delete_issue(self.hass, DOMAIN, f"{anomaly}_{client_id}")
+        self.active.clear()
+
+    @callback
+    def _run(self) -> None:
+        """Start a fleet pass unless the previous one is still running."""
+        if self._running:
+            return
+        self._running = True
+        self.hass.async_create_background_task(
+            self.async_update(), "terneo anomaly detection"
+        )
+
+    async def async_update(self) -> None:
+        """Run a fleet pass in the executor and report the outliers."""
+        now = self._clock.monotonic()
+        inputs = {
+            coordinator.client_id: (
+                coordinator.history["floorTemp"].copy(),
+                coordinator.history["load"].copy(),
+                coordinator.history["protTemp"].copy(),
+            )
+            for coordinator in self._coordinators()
+        }
+        try:
+            results = await self.hass.async_add_executor_job(
+                detect_fleet_anomalies, inputs, now
+            )
+        finally:
+            self._running = False
+        self._report(results)
+
+    @callback
+    def _report(self, results: dict[str, dict[str, float]]) -> None:
+        """Raise issues for new anomalies and remove cleared ones."""
+        current = {
+            (client_id, anomaly): value
+            for client_id, anomalies in results.items()
+            for anomaly, value in anomalies.items()
+        }
+        for client_id, anomaly in self.active - current.keys():
+            ir.async_delete_issue(self.hass, DOMAIN, f"{anomaly}_{client_id}")
+        for (client_id, anomaly), value in current.items():
+            if (client_id, anomaly) in self.active:
+                continue
+            _LOGGER.warning("Device %s shows %s (%s)", client_id, anomaly, value)
+            ir.async_create_issue(
+                self.hass,
+                DOMAIN,
+                f"{anomaly}_{client_id}",
+                is_fixable=False,
+                severity=ir.IssueSeverity.WARNING,
+                translation_key=anomaly,
+                translation_placeholders={"client_id": client_id, "value": str(value)},
+            )
+            self.hass.bus.async_fire(
+                EVENT_ANOMALY,
+                {"client_id": client_id, "anomaly": anomaly, "value": value},
+            )
+        self.active = set(current)
@@ -0,0 +1,329 @@
+"""On-disk telemetry archive for TerneoMQ integration."""
+
+from __future__ import annotations
+
+import csv
+import json
+import logging
+import mmap
+import struct
+import threading
+import time
+from datetime import UTC, date, datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Container, Iterator
+    from pathlib import Path
+
+_LOGGER = logging.getLogger(__name__)
+
+# Key ids are stored in the records, so new keys may only be appended
+ARCHIVE_KEYS = (
+    "floorTemp",
+    "airTemp",
+    "protTemp",
+    "setTemp",
+    "load",
+    "powerOff",
+    "mode",
+    "bright",
+)
+KEY_IDS = {key: index for index, key in enumerate(ARCHIVE_KEYS)}
+
+HEADER = struct.Struct("<4sQ")  # magic, number of records
+RECORD = struct.Struct("<HHdd")  # device index, key id, UTC timestamp, value
+MAGIC = b"TRA1"
+SEGMENT_GROWTH = 16384  # records a segment file grows by when it is full
+INDEX_FILE = "devices.json"
+PREPARE_AHEAD = 600  # seconds before UTC midnight the next segment is opened
+ARCHIVE_MAINTENANCE_INTERVAL = 30  # seconds between executor maintenance passes
+CSV_HEADER = ("time", "client_id", "key", "value")
+
+
+def segment_day(path: Path) -> date | None:
+    """Return the UTC day of a segment file, or None for other files."""
+    if path.suffix != ".bin":
+        return None
+    try:
+        return date.fromisoformat(path.stem)
+    except ValueError:
+        return None
+
+
+def _utc_day(timestamp: float) -> date:
+    """Return the UTC day of a timestamp."""
+    return datetime.fromtimestamp(timestamp, UTC).date()
+
+
+class TerneoArchiveSegment:
+    """One day of records in a memory-mapped, append-only file."""
+
+    def __init__(self, path: Path) -> None:
+        """Open or create the segment for writing; blocks on file I/O."""
+        self.path = path
+        new = not path.exists() or path.stat().st_size < HEADER.size
+        self._file = path.open("r+b" if not new else "w+b")
+        if new:
+            self._file.truncate(HEADER.size + SEGMENT_GROWTH * RECORD.size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        # Mappings replaced by grow, unmapped when the segment is closed
+        self._old_maps: list[mmap.mmap] = []
+        if new:
+            HEADER.pack_into(self._map, 0, MAGIC, 0)
+        magic, self.count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a telemetry archive segment")
+        # A crash can leave a count that the file is too short for
+        self.count = min(self.count, self.capacity)
+
+    @property
+    def capacity(self) -> int:
+        """Return the number of records the file has room for."""
+        return (len(self._map) - HEADER.size) // RECORD.size
+
+    def append(self, device: int, key_id: int, timestamp: float, value: float) -> bool:
+        """Write a record and make it visible to readers, if there is room."""
+        mapped = self._map
+        offset = HEADER.size + self.count * RECORD.size
+        if offset + RECORD.size > len(mapped):
+            return False
+        RECORD.pack_into(mapped, offset, device, key_id, timestamp, value)
+        self.count += 1
+        HEADER.pack_into(mapped, 0, MAGIC, self.count)
+        return True
+
+    def grow(self) -> None:
+        """Extend the file by SEGMENT_GROWTH records; blocks on file I/O.
+
+        The old mapping stays valid until close, so a record packed into it
+        while the new one is swapped in still lands in the shared file.
+        """
+        self._file.truncate(len(self._map) + SEGMENT_GROWTH * RECORD.size)
+        self._old_maps.append(self._map)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+    def close(self) -> None:
+        """Flush and close the segment."""
+        self._map.flush()
+        self._map.close()
+        for mapped in self._old_maps:
+            mapped.close()
+        self._old_maps.clear()
+        self._file.close()
+
+
+def read_segment(
+    path: Path, start: float, end: float
+) -> Iterator[tuple[int, int, float, float]]:
+    """Yield the records of a segment file between start and end.
+
+    The file is mapped read-only on its own, so a segment that is still
+    being appended to can be read from another thread.
+    """
+    try:
+        file = path.open("rb")
+    except FileNotFoundError:
+        # Dropped past retention since the export started
+        return
+    with file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        magic, count = HEADER.unpack_from(mapped, 0)
+        if magic != MAGIC:
+            return
+        count = min(count, (len(mapped) - HEADER.size) // RECORD.size)
+        with memoryview(mapped)[
+            HEADER.size : HEADER.size + count * RECORD.size
+        ] as view:
+            for record in RECORD.iter_unpack(view):
+                if start <= record[2] < end:
+                    yield record
+
+
+class TerneoArchive:
+    """Append-only archive of raw telemetry in daily segment files.
+
+    Records are fixed-width and written into memory-mapped files, one per
+    UTC day, so appending costs a struct pack and no system call. Every
+    file operation happens in maintain, which runs in the executor: it
+    opens the next day's segment ahead of UTC midnight, grows the current
+    one before it fills up, drops segments past retention and saves the
+    index that numbers the devices. Until a new day's segment is ready,
+    its records go to the previous one.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        retention_days: int,
+        wall_clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Initialize the archive; call load before appending."""
+        self.path = path
+        self.retention_days = retention_days
+        self._wall_clock = wall_clock
+        self._devices: list[str] = []
+        self._device_ids: dict[str, int] = {}
+        self._saved_devices = 0
+        self.segments: dict[date, Path] = {}
+        self._day: date | None = None
+        self._segment: TerneoArchiveSegment | None = None
+        # Start timestamp and segment of the next day, opened ahead of time
+        self._next: tuple[float, date, TerneoArchiveSegment] | None = None
+        self._retired: list[TerneoArchiveSegment] = []
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def load(self) -> None:
+        """Read the indexes and open today's segment; blocks on file I/O."""
+        with self._lock:
+            self.path.mkdir(parents=True, exist_ok=True)
+            index = self.path / INDEX_FILE
+            if index.exists():
+                self._devices = json.loads(index.read_text())
+            self._device_ids = {
+                client_id: device for device, client_id in enumerate(self._devices)
+            }
+            self._saved_devices = len(self._devices)
+            for file in self.path.iterdir():
+                if (day := segment_day(file)) is not None:
+                    self.segments[day] = file
+            today = _utc_day(self._wall_clock())
+            self._segment = self._open_segment(today)
+            self._day = today
+            self._drop_expired(today)
+        _LOGGER.debug(
+            "Telemetry archive at %s has %d segments", self.path, len(self.segments)
+        )
+
+    def append(self, client_id: str, key: str, value: Any) -> None:
+        """Archive a telemetry value received now; never blocks."""
+        key_id = KEY_IDS.get(key)
+        if key_id is None or not isinstance(value, int | float):
+            return
+        timestamp = self._wall_clock()
+        if (upcoming := self._next) is not None and timestamp >= upcoming[0]:
+            self._next = None
+            if self._segment is not None:
+                self._retired.append(self._segment)
+            _, self._day, self._segment = upcoming
+        if self._segment is None:
+            return
+        device = self._device_ids.get(client_id)
+        if device is None:
+            # Numbered right away, saved to the index by the next maintain
+            device = self._device_ids[client_id] = len(self._devices)
+            self._devices.append(client_id)
+        if not self._segment.append(device, key_id, timestamp, value):
+            self.dropped += 1
+            _LOGGER.debug("Telemetry archive segment is full, dropping %s", key)
+
+    def maintain(self) -> None:
+        """Prepare segments and save the device index; blocks on file I/O."""
+        with self._lock:
+            if self._day is None:
+                return
+            while self._retired:
+                self._retired.pop().close()
+            if self._segment is not None and (
+                self._segment.capacity - self._segment.count < SEGMENT_GROWTH // 2
+            ):
+                self._segment.grow()
+            now = self._wall_clock()
+            if self._next is None:
+                day = max(self._day + timedelta(days=1), _utc_day(now))
+                start = datetime.combine(day, datetime.min.time(), UTC).timestamp()
+                if now >= start - PREPARE_AHEAD:
+                    self._next = (start, day, self._open_segment(day))
+            self._drop_expired(_utc_day(now))
+            self._save_index()
+
+    def _open_segment(self, day: date) -> TerneoArchiveSegment:
+        """Open the segment of day and add it to the segment index."""
+        path = self.path / f"{day.isoformat()}.bin"
+        segment = TerneoArchiveSegment(path)
+        # Replaced rather than changed so that running exports keep their view
+        self.segments = {**self.segments, day: path}
+        return segment
+
+    def _drop_expired(self, today: date) -> None:
+        """Delete the segments past retention."""
+        oldest = today - timedelta(days=self.retention_days - 1)
+        expired = [day for day in self.segments if day < oldest]
+        if not expired:
+            return
+        segments = dict(self.segments)
+        for day in expired:
+            segments.pop(day).unlink(missing_ok=True)
+        self.segments = segments
+
+    def _save_index(self) -> None:
+        """Write the device index if devices were added since the last save."""
+        devices = list(self._devices)
+        if len(devices) != self._saved_devices:
+            (self.path / INDEX_FILE).write_text(json.dumps(devices))
+            self._saved_devices = len(devices)
+
+    def close(self) -> None:
+        """Close every open segment and save the index; blocks on file I/O."""
+        with self._lock:
+            segments = [*self._retired, self._segment]
+            if self._next is not None:
+                segments.append(self._next[2])
+            for segment in segments:
+                if segment is not None:
+                    segment.close()
+            self._retired.clear()
+            self._segment = None
+            self._next = None
+            if self._day is not None:
+                self._save_index()
+            self._day = None
+
+    def iter_records(
+        self,
+        start: datetime,
+        end: datetime,
+        client_ids: Container[str] | None = None,
+    ) -> Iterator[tuple[datetime, str, str, float]]:
+        """Yield the archived values between start and end in time order."""
+        first = start.timestamp()
+        last = end.timestamp()
+        devices = list(self._devices)
+        segments = self.segments
+        # A segment can end with the first records of the following day
+        first_day = start.astimezone(UTC).date() - timedelta(days=1)
+        for day in sorted(segments):
+            if not first_day <= day <= end.astimezone(UTC).date():
+                continue
+            for device, key_id, timestamp, value in read_segment(
+                segments[day], first, last
+            ):
+                client_id = devices[device] if device < len(devices) else str(device)
+                if client_ids is not None and client_id not in client_ids:
+                    continue
+                yield (
+                    datetime.fromtimestamp(timestamp, UTC),
+                    client_id,
+                    ARCHIVE_KEYS[key_id] if key_id < len(ARCHIVE_KEYS) else "",
+                    value,
+                )
+
+    def export_csv(
+        self,
+        path: Path,
+        start: datetime,
+        end: datetime,
+        client_ids: Container[str] | None = None,
+    ) -> int:
+        """Stream the archived values between start and end into a CSV file."""
+        rows = 0
+        with path.open("w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(CSV_HEADER)
+            for moment, client_id, key, value in self.iter_records(
+                start, end, client_ids
+            ):
+                writer.writerow((moment.isoformat(), client_id, key, value))
+                rows += 1
+        return rows
@@ -1,22 +1,112 @@
 """Base entity for TerneoMQ integration."""
 
+from __future__ import annotations
+
 import logging
-import time
 from abc import ABC, abstractmethod
-from datetime import timedelta
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.mqtt import ReceiveMessage
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.restore_state import RestoreEntity
 
-from .const import DOMAIN
-from .coordinator import TerneoCoordinator
+from .const import DOMAIN, SIGNAL_SNAPSHOT
+from .coordinator import TerneoCoordinator, parse_payload
+from .runtime import get_entity_scheduler
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .scheduler import TerneoScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
+AVAILABILITY_TIMEOUT = 300  # seconds
+PENDING_TIMEOUT = 60  # seconds
+
+
+class TerneoPendingState:
+    """Requested values shown until telemetry confirms them.
+
+    Telemetry that disagrees with a pending value is assumed to predate the
+    command and is ignored. If no matching echo arrives in time, the entity
+    is rolled back to the last value the device reported.
+    """
+
+    def __init__(
+        self,
+        entity: Entity,
+        coordinator: TerneoCoordinator,
+        rollback: Callable[[str, Any], None],
+    ) -> None:
+        """Initialize the pending state."""
+        self._entity = entity
+        self._coordinator = coordinator
+        self._rollback = rollback
+        self._pending: dict[str, Any] = {}
+        self._scheduler: TerneoScheduler | None = None
+
+    def __contains__(self, key: str) -> bool:
+        """Return whether a command for key awaits confirmation."""
+        return key in self._pending
+
+    def request(self, key: str, value: Any) -> None:
+        """Wait for telemetry to report value for key."""
+        self._pending[key] = value
+        if self._scheduler is None:
+            self._scheduler = get_entity_scheduler(
+                self._entity, self._coordinator.clock
+            )
+        self._scheduler.schedule(
+            self._deadline_key(key), PENDING_TIMEOUT, lambda: self._expire(key)
+        )
+
+    def accept(self, key: str, value: Any) -> bool:
+        """Return whether telemetry for key should be applied."""
+        if key not in self._pending:
+            return True
+        if self._pending[key] != value:
+            _LOGGER.debug(
+                "Ignoring stale %s=%s for %s while %s is pending",
+                key,
+                value,
+                self._entity.name,
+                self._pending[key],
+            )
+            return False
+        self.cancel(key)
+        return True
+
+    def cancel(self, key: str) -> None:
+        """Stop waiting for key."""
+        if self._pending.pop(key, None) is not None and self._scheduler is not None:
+            self._scheduler.cancel(self._deadline_key(key))
+
+    def clear(self) -> None:
+        """Stop waiting for every key."""
+        for key in list(self._pending):
+            self.cancel(key)
+
+    def _deadline_key(self, key: str) -> tuple[str | None, str, str]:
+        """Return the scheduler key of the deadline for key."""
+        return (self._entity.unique_id, "pending", key)
+
+    def _expire(self, key: str) -> None:
+        """Roll back a command that was never confirmed."""
+        expected = self._pending.pop(key, None)
+        value = self._coordinator.get_value(key)
+        _LOGGER.warning(
+            "%s did not confirm %s=%s within %d s, reverting to %s",
+            self._entity.name,
+            key,
+            expected,
+            PENDING_TIMEOUT,
+            value,
+        )
+        self._rollback(key, value)
+
 
 class TerneoMQTTEntity(RestoreEntity, ABC):
     """Base class for TerneoMQ entities."""
@@ -24,7 +114,7 @@ class TerneoMQTTEntity(RestoreEntity, ABC):
     def __init__(
         self,
         hass: HomeAssistant,
-        coordinator: "TerneoCoordinator",
+        coordinator: TerneoCoordinator,
         sensor_type: str,
         name: str,
         topic_suffix: str,
@@ -51,6 +141,7 @@ class TerneoMQTTEntity(RestoreEntity, ABC):
             f"{coordinator.telemetry_prefix}/{coordinator.client_id}/{topic_suffix}"
         )
         self._unsubscribe = None
+        self._pending = TerneoPendingState(self, coordinator, self._rollback_pending)
 
     @abstractmethod
     def parse_value(self, payload: str) -> Any:
@@ -72,6 +163,19 @@ class TerneoMQTTEntity(RestoreEntity, ABC):
         )
         await self.coordinator.publish_command(topic_suffix, payload, retain=retain)
 
+    async def publish_optimistic(self, payload: str, retain: bool = False) -> None:
+        """Publish a command and show its value until telemetry confirms it."""
+        value = parse_payload(self._topic_suffix, payload)
+        # Registered first, as the echo can arrive while the publish is queued
+        self._pending.request(self._topic_suffix, value)
+        try:
+            await self.publish_command(self._topic_suffix, payload, retain=retain)
+        except BaseException:
+            self._pending.cancel(self._topic_suffix)
+            raise
+        self.update_value(value)
+        self.async_write_ha_state()
+
     async def async_added_to_hass(self) -> None:
         """Set up availability timer and dispatcher listener when entity is added."""
         await super().async_added_to_hass()
@@ -80,35 +184,65 @@ class TerneoMQTTEntity(RestoreEntity, ABC):
             f"{DOMAIN}_{self._client_id}_update",
             self._handle_coordinator_update,
         )
+        self._unsub_snapshot = async_dispatcher_connect(
+            self.hass,
+            SIGNAL_SNAPSHOT.format(self._client_id),
+            self._handle_snapshot,
+        )
         # Update with current coordinator data
         for key, value in self.coordinator._data.items():
             self._handle_coordinator_update(key, value)
         if self.track_availability:
-            self._unavailable_timer = async_track_time_interval(
-                self.hass, self._check_availability, timedelta(minutes=5)
+            scheduler = get_entity_scheduler(self, self.coordinator.clock)
+            self._unavailable_timer = scheduler.schedule_interval(
+                (self._unique_id, "availability"),
+                AVAILABILITY_TIMEOUT,
+                self._check_availability,
             )
 
     async def async_will_remove_from_hass(self) -> None:
         """Cancel availability timer and dispatcher listener when entity is removed."""
         if self._unsub_dispatcher:
             self._unsub_dispatcher()
+        if self._unsub_snapshot:
+            self._unsub_snapshot()
         if self._unavailable_timer:
             self._unavailable_timer()
+        self._pending.clear()
         await super().async_will_remove_from_hass()
 
     @callback
     def _handle_coordinator_update(self, key: str, value: Any) -> None:
         """Handle update from coordinator."""
         if key == self._topic_suffix:
-            self.update_value(value)
-            self._last_update = time.time()
+            if self._pending.accept(key, value):
+                self.update_value(value)
+            self._last_update = self.coordinator.clock.monotonic()
             self._attr_available = True
             self.async_write_ha_state()
 
     @callback
-    def _check_availability(self, now: Any) -> None:
+    def _handle_snapshot(self) -> None:
+        """Write the cached value once after a retained burst."""
+        value = self.coordinator.get_value(self._topic_suffix)
+        if value is not None:
+            self._handle_coordinator_update(self._topic_suffix, value)
+
+    @callback
+    def _rollback_pending(self, key: str, value: Any) -> None:
+        """Show the last reported value after a command was not confirmed."""
+        if value is not None:
+            self.update_value(value)
+        self.async_write_ha_state()
+
+    @callback
+    def _check_availability(self) -> None:
         """Check if entity is still available based on last update time."""
-        if self._last_update and (time.time() - self._last_update) > 300:  # 5 minutes
+        if (
+            self._last_update is not None
+            and (self.coordinator.clock.monotonic() - self._last_update)
+            > AVAILABILITY_TIMEOUT
+        ):
             self._attr_available = False
             self.async_write_ha_state()
 
@@ -121,7 +255,7 @@ class TerneoMQTTEntity(RestoreEntity, ABC):
             msg.topic,
             msg.payload,
         )
-        self._last_update = time.time()
+        self._last_update = self.coordinator.clock.monotonic()
         if self.track_availability:
             self._attr_available = True
         try:
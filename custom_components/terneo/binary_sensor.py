@@ -12,6 +12,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from .base_entity import TerneoMQTTEntity
 from .const import DOMAIN
 from .coordinator import TerneoCoordinator
+from .helpers import async_setup_device_entities
 
 
 async def async_setup_entry(
@@ -20,13 +21,10 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the TerneoMQ binary sensor platform."""
-    devices = config_entry.data.get("devices", [])
     model = config_entry.options.get("model", config_entry.data.get("model", "AX"))
-    entities = []
-    for device in devices:
-        client_id = device["client_id"]
-        coordinator = hass.data[DOMAIN][config_entry.entry_id][client_id]
-        entities.append(
+
+    def create_entities(coordinator: TerneoCoordinator) -> list[TerneoBinarySensor]:
+        return [
             TerneoBinarySensor(
                 hass=hass,
                 coordinator=coordinator,
@@ -36,8 +34,9 @@ async def async_setup_entry(
                 model=model,
                 topic_suffix="load",
             )
-        )
-    async_add_entities(entities)
+        ]
+
+    async_setup_device_entities(hass, config_entry, async_add_entities, create_entities)
 
 
 class TerneoBinarySensor(TerneoMQTTEntity, BinarySensorEntity):
@@ -0,0 +1,80 @@
+"""Bulk commands to many devices for TerneoMQ integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import MODE_PAYLOADS
+from .outbound import PRIORITY_AUTOMATION
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from .coordinator import TerneoCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Published in this order, as the climate entity does when turning a device on
+BULK_FIELDS = ("mode", "powerOff", "setTemp", "bright")
+DEFAULT_MAX_CONCURRENCY = 5
+
+
+def bulk_payloads(fields: dict[str, Any]) -> list[tuple[str, str]]:
+    """Return the command topics and payloads for a field map."""
+    converters = {
+        "mode": MODE_PAYLOADS.__getitem__,
+        "powerOff": lambda value: "1" if value else "0",
+        "setTemp": str,
+        "bright": lambda value: str(int(value)),
+    }
+    return [(key, converters[key](fields[key])) for key in BULK_FIELDS if key in fields]
+
+
+async def async_bulk_command(
+    coordinators: Iterable[TerneoCoordinator],
+    fields: dict[str, Any],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    jitter: float = 0.0,
+) -> dict[str, dict[str, Any]]:
+    """Send the same commands to many devices and return the result of each.
+
+    Each device waits a random delay of up to jitter seconds first so that
+    the broker and the devices do not see every command in the same
+    instant; after that, at most max_concurrency devices are commanded at
+    once.
+    """
+    payloads = bulk_payloads(fields)
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _async_command(coordinator: TerneoCoordinator) -> dict[str, Any]:
+        published: list[str] = []
+        # Slept before taking a slot, so the slots stay busy meanwhile
+        if jitter > 0:
+            await coordinator.clock.async_sleep(random.uniform(0, jitter))  # noqa: S311
+        async with semaphore:
+            try:
+                for key, payload in payloads:
+                    await coordinator.publish_command(
+                        key, payload, priority=PRIORITY_AUTOMATION
+                    )
+                    published.append(key)
+            except HomeAssistantError as err:
+                _LOGGER.warning(
+                    "Bulk command to %s failed: %s", coordinator.client_id, err
+                )
+                return {"success": False, "published": published, "error": str(err)}
+        return {"success": True, "published": published}
+
+    coordinators = list(coordinators)
+    results = await asyncio.gather(
+        *(_async_command(coordinator) for coordinator in coordinators)
+    )
+    return {
+        coordinator.client_id: result
+        for coordinator, result in zip(coordinators, results, strict=True)
+    }
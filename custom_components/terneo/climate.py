@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import asyncio
 import logging
 from typing import Any
 
@@ -13,29 +12,84 @@ from homeassistant.const import UnitOfTemperature
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.restore_state import RestoreEntity
-
-from .const import DOMAIN
-from .coordinator import TerneoCoordinator
+from homeassistant.helpers.restore_state import (
+    ExtraStoredData,
+    RestoredExtraData,
+    RestoreEntity,
+)
+
+from .base_entity import PENDING_TIMEOUT, TerneoPendingState
+from .const import DOMAIN, RECORDING_CLIMATE, SIGNAL_OPTIONS_UPDATED, SIGNAL_SNAPSHOT
+from .coordinator import TerneoCoordinator, parse_payload
+from .helpers import async_setup_device_entities, get_entry_settings
+from .runtime import get_entity_scheduler
+from .scheduler import TerneoScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def calculate_hvac_state(
+    power_off: int | None,
+    load: int | None,
+    target_temp: float | None,
+    floor_temp: float | None,
+) -> tuple[str, str] | None:
+    """Return hvac_mode and hvac_action of device values, or None if unknown."""
+    if power_off is None:
+        return None
+    if power_off != 0:
+        # Powered off, or an unknown power_off state, counts as OFF
+        return (climate.HVACMode.OFF, climate.HVACAction.OFF)
+    # Assume heating is needed if temperatures are unknown
+    heating_needed = (
+        target_temp is None or floor_temp is None or target_temp > floor_temp
+    )
+    if heating_needed and load == 1:
+        return (climate.HVACMode.HEAT, climate.HVACAction.HEATING)
+    return (climate.HVACMode.AUTO, climate.HVACAction.IDLE)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up TerneoMQ climate from a config entry."""
-    devices = config_entry.data.get("devices", [])
     model = config_entry.options.get("model", config_entry.data.get("model", "AX"))
-    entities = []
-    for device in devices:
-        client_id = device["client_id"]
-        coordinator = hass.data[DOMAIN][config_entry.entry_id][client_id]
-        entities.append(TerneoMQTTClimate(hass, coordinator, model))
-    if entities:
-        async_add_entities(entities)
+    reduced_recording = (
+        RECORDING_CLIMATE in get_entry_settings(config_entry)["reduced_recording"]
+    )
+
+    entities: dict[str, TerneoMQTTClimate] = {}
+
+    def create_entities(coordinator: TerneoCoordinator) -> list[TerneoMQTTClimate]:
+        entity = entities[coordinator.client_id] = TerneoMQTTClimate(
+            hass, coordinator, model, reduced_recording
+        )
+        return [entity]
+
+    def device_removed(client_id: str) -> None:
+        entities.pop(client_id, None)
+
+    async_setup_device_entities(
+        hass, config_entry, async_add_entities, create_entities, device_removed
+    )
+
+    @callback
+    def _async_options_updated(changes: dict[str, Any]) -> None:
+        """Switch current temperature source when airTemp support changes."""
+        if "supports_air_temp" not in changes:
+            return
+        for entity in entities.values():
+            entity.set_supports_air_temp(changes["supports_air_temp"])
+
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_OPTIONS_UPDATED.format(config_entry.entry_id),
+            _async_options_updated,
+        )
+    )
 
 
 class TerneoMQTTClimate(RestoreEntity, ClimateEntity):
@@ -63,12 +117,14 @@ class TerneoMQTTClimate(RestoreEntity, ClimateEntity):
         hass: HomeAssistant,
         coordinator: TerneoCoordinator,
         model: str = "AX",
+        reduced_recording: bool = False,
     ) -> None:
         """Initialize the climate device."""
         self.hass = hass
         self.coordinator = coordinator
         self._client_id = coordinator.client_id
         self._model = model
+        self._reduced_recording = reduced_recording
         self._supports_air_temp = coordinator.supports_air_temp
         # Status topics
         telemetry_prefix = coordinator.telemetry_prefix
@@ -94,12 +150,14 @@ class TerneoMQTTClimate(RestoreEntity, ClimateEntity):
         self._load = None
         self._mode = None  # 0 = auto, 1 = manual
         self._optimistic_mode = None
-        self._optimistic_task = None
+        self._unsub_optimistic_reset = None
+        self._scheduler: TerneoScheduler | None = None
+        self._pending = TerneoPendingState(self, coordinator, self._rollback_pending)
 
     def _reset_optimistic_mode(self) -> None:
         """Reset optimistic mode after timeout."""
         self._optimistic_mode = None
-        self._optimistic_task = None
+        self._unsub_optimistic_reset = None
         self._update_hvac_mode_from_temps()
         self.async_write_ha_state()
 
@@ -118,38 +176,13 @@ class TerneoMQTTClimate(RestoreEntity, ClimateEntity):
                 climate.HVACMode.OFF,
             ]:
                 self._attr_hvac_mode = old_state.state
-            if old_state.attributes.get("power_off") is not None:
-                self._power_off = int(old_state.attributes.get("power_off"))
-            if old_state.attributes.get("load") is not None:
-                self._load = int(old_state.attributes.get("load"))
-
-        # Seed state from coordinator cache to avoid stale restore values on startup
-        cached_power_off = self.coordinator.get_value("powerOff")
-        cached_load = self.coordinator.get_value("load")
-        cached_set_temp = self.coordinator.get_value("setTemp")
-        cached_floor_temp = self.coordinator.get_value("floorTemp")
-        cached_air_temp = self.coordinator.get_value("airTemp")
-
-        if cached_power_off is not None:
-            self._power_off = int(cached_power_off)
-        if cached_load is not None:
-            self._load = int(cached_load)
-        if cached_set_temp is not None:
-            self._attr_target_temperature = float(cached_set_temp)
-        if cached_floor_temp is not None:
-            self._floor_temp = float(cached_floor_temp)
-        if cached_air_temp is not None:
-            self._air_temp = float(cached_air_temp)
-
-        if (
-            cached_power_off is not None
-            or cached_load is not None
-            or cached_set_temp is not None
-            or cached_floor_temp is not None
-            or cached_air_temp is not None
-        ):
-            self._update_hvac_mode_from_temps()
-            self.async_write_ha_state()
+            restored = old_state.attributes
+            if (extra_data := await self.async_get_last_extra_data()) is not None:
+                restored = extra_data.as_dict()
+            if restored.get("power_off") is not None:
+                self._power_off = int(restored["power_off"])
+            if restored.get("load") is not None:
+                self._load = int(restored["load"])
 
         # Seed state from coordinator cache to avoid stale restore values on startup
         cached_power_off = self.coordinator.get_value("powerOff")
@@ -184,14 +217,23 @@ class TerneoMQTTClimate(RestoreEntity, ClimateEntity):
             f"{DOMAIN}_{self._client_id}_update",
             self._handle_coordinator_update,
         )
+        self._unsub_snapshot = async_dispatcher_connect(
+            self.hass,
+            SIGNAL_SNAPSHOT.format(self._client_id),
+            self._handle_snapshot,
+        )
 
     async def async_will_remove_from_hass(self) -> None:
         """Unsubscribe from dispatcher."""
         if self._unsub_dispatcher:
             self._unsub_dispatcher()
+        if self._unsub_snapshot:
+            self._unsub_snapshot()
         await super().async_will_remove_from_hass()
-        if self._optimistic_task:
-            self._optimistic_task.cancel()
+        self._pending.clear()
+        if self._unsub_optimistic_reset:
+            self._unsub_optimistic_reset()
+            self._unsub_optimistic_reset = None
 
     @callback
     def _handle_coordinator_update(self, key: str, value: Any) -> None:
@@ -199,9 +241,25 @@ class TerneoMQTTClimate(RestoreEntity, ClimateEntity):
         if key in ["floorTemp", "airTemp", "setTemp", "load", "powerOff", "mode"]:
             self._handle_message_update(key, value)
 
+    @callback
+    def _handle_snapshot(self) -> None:
+        """Apply every cached value and write the state once."""
+        changed = False
+        for key in ("floorTemp", "airTemp", "setTemp", "load", "powerOff", "mode"):
+            value = self.coordinator.get_value(key)
+            if value is not None:
+                changed |= self._apply_update(key, value)
+        if changed:
+            self.async_write_ha_state()
+
     @callback
     def _handle_message_update(self, key: str, value: Any) -> None:
         """Handle message update from coordinator."""
+        if self._apply_update(key, value):
+            self.async_write_ha_state()
+
+    def _apply_update(self, key: str, value: Any) -> bool:
+        """Apply a telemetry value and return whether the state changed."""
         handlers = {
             "airTemp": self._handle_air_temp,
             "floorTemp": self._handle_floor_temp,
@@ -211,25 +269,68 @@ class TerneoMQTTClimate(RestoreEntity, ClimateEntity):
             "mode": self._handle_mode,
         }
         handler = handlers.get(key)
-        if handler is None:
-            return
+        if handler is None or not self._pending.accept(key, value):
+            return False
         try:
             handler(value)
-            self.async_write_ha_state()
         except ValueError:
             _LOGGER.error("Invalid value in update: %s", value)
+            return False
+        return True
+
+    @callback
+    def _rollback_pending(self, key: str, value: Any) -> None:
+        """Show the last reported value after a command was not confirmed."""
+        if value is not None:
+            self._handle_message_update(key, value)
+            return
+        self._update_hvac_mode_from_temps()
+        self.async_write_ha_state()
+
+    async def _publish_pending(self, key: str, payload: str) -> None:
+        """Publish a command and wait for telemetry to confirm it."""
+        # Registered first, as the echo can arrive while the publish is queued
+        self._pending.request(key, parse_payload(key, payload))
+        try:
+            await self.coordinator.publish_command(key, payload)
+        except BaseException:
+            self._pending.cancel(key)
+            raise
+
+    def _set_optimistic_mode(self, hvac_mode: str) -> None:
+        """Set optimistic mode and (re)arm its reset deadline."""
+        self._optimistic_mode = hvac_mode
+        if self._scheduler is None:
+            self._scheduler = get_entity_scheduler(self, self.coordinator.clock)
+        self._unsub_optimistic_reset = self._scheduler.schedule(
+            (self._client_id, "optimistic_mode"),
+            PENDING_TIMEOUT,
+            self._reset_optimistic_mode,
+        )
 
     def _clear_optimistic_mode(self) -> None:
         """Clear optimistic mode and any pending reset."""
-        if self._optimistic_task:
-            self._optimistic_task.cancel()
-            self._optimistic_task = None
+        if self._unsub_optimistic_reset:
+            self._unsub_optimistic_reset()
+            self._unsub_optimistic_reset = None
         self._optimistic_mode = None
 
+    @callback
+    def set_supports_air_temp(self, supports_air_temp: bool) -> None:
+        """Apply a changed airTemp option to the current temperature."""
+        self._supports_air_temp = supports_air_temp
+        if supports_air_temp:
+            return
+        self._air_temp = None
+        self._update_hvac_mode_from_temps()
+        self.async_write_ha_state()
+
     def _handle_air_temp(self, value: Any) -> None:
         """Handle air temperature update."""
         self._air_temp = float(value)
-        self._attr_current_temperature = self._air_temp
+        self._attr_current_temperature = (
+            round(self._air_temp, 1) if self._reduced_recording else self._air_temp
+        )
 
     def _handle_floor_temp(self, value: Any) -> None:
         """Handle floor temperature update."""
@@ -285,37 +386,14 @@ class TerneoMQTTClimate(RestoreEntity, ClimateEntity):
             self._attr_current_temperature = self._air_temp
         elif self._floor_temp is not None:
             self._attr_current_temperature = self._floor_temp
+        if self._reduced_recording and self._attr_current_temperature is not None:
+            self._attr_current_temperature = round(self._attr_current_temperature, 1)
 
     def _calculate_hvac_state(self) -> tuple[str, str] | None:
         """Calculate hvac_mode and hvac_action, or None if state is unknown."""
-        power_off = self._power_off
-        load = self._load
-        hvac_state: tuple[str, str] | None = None
-
-        if power_off is None:
-            return None
-
-        if power_off == 1:
-            hvac_state = (climate.HVACMode.OFF, climate.HVACAction.OFF)
-        elif power_off == 0:
-            heating_needed = self._is_heating_needed()
-            if not heating_needed:
-                hvac_state = (climate.HVACMode.AUTO, climate.HVACAction.IDLE)
-            elif load == 1:
-                hvac_state = (climate.HVACMode.HEAT, climate.HVACAction.HEATING)
-            else:
-                hvac_state = (climate.HVACMode.AUTO, climate.HVACAction.IDLE)
-        else:
-            # Unknown power_off state, default to OFF
-            hvac_state = (climate.HVACMode.OFF, climate.HVACAction.OFF)
-
-        return hvac_state
-
-    def _is_heating_needed(self) -> bool:
-        """Check if heating is needed based on target and current temperatures."""
-        if self._attr_target_temperature is None or self._floor_temp is None:
-            return True  # Assume heating needed if temperatures unknown
-        return self._attr_target_temperature > self._floor_temp
+        return calculate_hvac_state(
+            self._power_off, self._load, self._attr_target_temperature, self._floor_temp
+        )
 
     async def async_set_temperature(self, **kwargs) -> None:
         """Set new target temperature."""
@@ -330,24 +408,19 @@ class TerneoMQTTClimate(RestoreEntity, ClimateEntity):
             # If currently OFF, switch to HEAT when setting temperature
             if current_hvac_mode == climate.HVACMode.OFF:
                 _LOGGER.debug("Switching to HEAT mode for temperature setting")
-                await self.coordinator.publish_command("mode", "1")
-                await self.coordinator.publish_command("powerOff", "0")
+                await self._publish_pending("mode", "1")
+                await self._publish_pending("powerOff", "0")
                 self._power_off = 0  # Update local state
                 self._mode = 1  # Update local state
                 self._load = 1  # Optimistically assume heating starts
                 self._attr_hvac_mode = climate.HVACMode.HEAT
-            await self.coordinator.publish_command("setTemp", str(temperature))
+            await self._publish_pending("setTemp", str(temperature))
             # Optimistically update the state
             self._attr_target_temperature = temperature
 
             # If temperature is below floor temp, optimistically set to AUTO
             if floor_temp is not None and temperature < floor_temp and power_off == 0:
-                self._optimistic_mode = climate.HVACMode.AUTO
-                if self._optimistic_task:
-                    self._optimistic_task.cancel()
-                self._optimistic_task = self.hass.loop.create_task(
-                    self._delay_reset_optimistic_mode(60)
-                )
+                self._set_optimistic_mode(climate.HVACMode.AUTO)
             # If currently AUTO and temperature is above floor temp, optimistically set to HEAT
             elif (
                 floor_temp is not None
@@ -355,12 +428,7 @@ class TerneoMQTTClimate(RestoreEntity, ClimateEntity):
                 and power_off == 0
                 and current_hvac_mode == climate.HVACMode.AUTO
             ):
-                self._optimistic_mode = climate.HVACMode.HEAT
-                if self._optimistic_task:
-                    self._optimistic_task.cancel()
-                self._optimistic_task = self.hass.loop.create_task(
-                    self._delay_reset_optimistic_mode(60)
-                )
+                self._set_optimistic_mode(climate.HVACMode.HEAT)
 
             # Update mode based on new temperature
             self._update_hvac_mode_from_temps()
@@ -371,47 +439,43 @@ class TerneoMQTTClimate(RestoreEntity, ClimateEntity):
         _LOGGER.debug("Setting HVAC mode to %s", hvac_mode)
         if hvac_mode == climate.HVACMode.HEAT:
             # Set to manual mode (1) and turn on
-            await self.coordinator.publish_command("mode", "1")
-            await self.coordinator.publish_command("powerOff", "0")
+            await self._publish_pending("mode", "1")
+            await self._publish_pending("powerOff", "0")
+            self._mode = 1
             self._power_off = 0
-            # Set optimistic mode for 60 seconds
-            self._optimistic_mode = climate.HVACMode.HEAT
-            if self._optimistic_task:
-                self._optimistic_task.cancel()
-            self._optimistic_task = self.hass.loop.create_task(
-                self._delay_reset_optimistic_mode(60)
-            )
+            # Set optimistic mode until confirmed or timed out
+            self._set_optimistic_mode(climate.HVACMode.HEAT)
         elif hvac_mode == climate.HVACMode.AUTO:
             # Turn on (leave current mode as is)
-            await self.coordinator.publish_command("powerOff", "0")
+            await self._publish_pending("powerOff", "0")
             self._power_off = 0
             # Reset optimistic mode
-            if self._optimistic_task:
-                self._optimistic_task.cancel()
-                self._optimistic_task = None
-            self._optimistic_mode = None
+            self._clear_optimistic_mode()
         elif hvac_mode == climate.HVACMode.OFF:
-            await self.coordinator.publish_command("powerOff", "1")
+            await self._publish_pending("powerOff", "1")
             self._power_off = 1
             # Reset optimistic mode
-            if self._optimistic_task:
-                self._optimistic_task.cancel()
-                self._optimistic_task = None
-            self._optimistic_mode = None
+            self._clear_optimistic_mode()
         else:
             return
         # Optimistically update the state
         self._attr_hvac_mode = hvac_mode
         self.async_write_ha_state()
 
-    async def _delay_reset_optimistic_mode(self, delay: int) -> None:
-        """Delay resetting optimistic mode."""
-        await asyncio.sleep(delay)
-        self._reset_optimistic_mode()
-
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
-        """Return extra state attributes for restore."""
+        """Return restore attributes unless they are kept out of the recorder."""
+        if self._reduced_recording:
+            return {}
+        return self._restore_attributes()
+
+    @property
+    def extra_restore_state_data(self) -> ExtraStoredData:
+        """Return powerOff and load for restore without recording them."""
+        return RestoredExtraData(self._restore_attributes())
+
+    def _restore_attributes(self) -> dict[str, Any]:
+        """Return the values needed to restore the HVAC state."""
         attrs: dict[str, Any] = {}
         if self._power_off is not None:
             attrs["power_off"] = self._power_off
@@ -0,0 +1,124 @@
+"""Clock abstraction for time-dependent logic in TerneoMQ integration."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+
+from .const import DATA_CLOCK, DOMAIN
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class TerneoClock(ABC):
+    """Time source and timer factory used by coordinators and entities."""
+
+    @abstractmethod
+    def monotonic(self) -> float:
+        """Return the current time in seconds on a monotonic scale."""
+
+    @abstractmethod
+    def call_later(self, delay: float, action: Callable[[], None]) -> CALLBACK_TYPE:
+        """Run action after delay seconds and return a cancel callback."""
+
+    def track_interval(
+        self, action: Callable[[], None], interval: float
+    ) -> CALLBACK_TYPE:
+        """Run action every interval seconds and return a cancel callback."""
+        cancel: CALLBACK_TYPE | None = None
+
+        def _run() -> None:
+            nonlocal cancel
+            cancel = self.call_later(interval, _run)
+            action()
+
+        cancel = self.call_later(interval, _run)
+
+        def _cancel() -> None:
+            if cancel is not None:
+                cancel()
+
+        return _cancel
+
+    async def async_sleep(self, delay: float) -> None:
+        """Wait delay seconds on this clock."""
+        future = asyncio.get_running_loop().create_future()
+
+        def _wake() -> None:
+            if not future.done():
+                future.set_result(None)
+
+        cancel = self.call_later(delay, _wake)
+        try:
+            await future
+        finally:
+            cancel()
+
+
+class MonotonicClock(TerneoClock):
+    """Production clock immune to wall-clock jumps."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the clock."""
+        self.hass = hass
+
+    def monotonic(self) -> float:
+        """Return time.monotonic()."""
+        return time.monotonic()
+
+    def call_later(self, delay: float, action: Callable[[], None]) -> CALLBACK_TYPE:
+        """Schedule action on the event loop."""
+        handle = self.hass.loop.call_later(delay, action)
+        return handle.cancel
+
+
+class VirtualClock(TerneoClock):
+    """Manually advanced clock for tests and simulations."""
+
+    def __init__(self, start: float = 0.0) -> None:
+        """Initialize the clock at the given time."""
+        self._now = start
+        self._timers: list[tuple[float, int, Callable[[], None]]] = []
+        self._cancelled: set[int] = set()
+        self._counter = itertools.count()
+
+    def monotonic(self) -> float:
+        """Return the simulated time."""
+        return self._now
+
+    def call_later(self, delay: float, action: Callable[[], None]) -> CALLBACK_TYPE:
+        """Queue action to run when the clock is advanced past its deadline."""
+        timer_id = next(self._counter)
+        heapq.heappush(self._timers, (self._now + max(delay, 0.0), timer_id, action))
+
+        def _cancel() -> None:
+            self._cancelled.add(timer_id)
+
+        return _cancel
+
+    def advance(self, seconds: float) -> None:
+        """Move the clock forward, firing due timers in deadline order."""
+        target = self._now + seconds
+        while self._timers and self._timers[0][0] <= target:
+            when, timer_id, action = heapq.heappop(self._timers)
+            self._now = max(self._now, when)
+            if timer_id in self._cancelled:
+                self._cancelled.discard(timer_id)
+                continue
+            action()
+        self._now = target
+
+
+def get_clock(hass: HomeAssistant) -> TerneoClock:
+    """Return the clock shared by the integration, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (clock := domain_data.get(DATA_CLOCK)) is None:
+        clock = domain_data[DATA_CLOCK] = MonotonicClock(hass)
+    return clock
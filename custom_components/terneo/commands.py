@@ -0,0 +1,156 @@
+"""Command delivery tracking for TerneoMQ integration."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+
+from .outbound import PRIORITY_INTERACTIVE
+from .scheduler import TerneoScheduler, TerneoSchedulerScope
+
+if TYPE_CHECKING:
+    import asyncio
+    from collections.abc import Awaitable, Callable
+
+    from .clock import TerneoClock
+
+_LOGGER = logging.getLogger(__name__)
+
+# Keys whose commands are echoed back on the telemetry prefix
+CONFIRMED_KEYS = ("setTemp", "powerOff", "mode", "bright")
+
+CONFIRM_TIMEOUT = 5.0  # seconds before the first retry, doubled on each retry
+MAX_ATTEMPTS = 3
+RTT_SMOOTHING = 0.2
+
+
+class _PendingCommand:
+    """A published command that has not been echoed yet."""
+
+    __slots__ = ("attempts", "expected", "payload", "priority", "retain", "sent_at")
+
+    def __init__(
+        self,
+        expected: Any,
+        payload: str,
+        retain: bool,
+        priority: int,
+        sent_at: float,
+    ):
+        self.expected = expected
+        self.payload = payload
+        self.retain = retain
+        self.priority = priority
+        self.attempts = 1
+        self.sent_at = sent_at
+
+
+class TerneoCommandTracker:
+    """Retry commands until their telemetry echo arrives and measure latency."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        clock: TerneoClock,
+        publish: Callable[[str, str, bool, int], Awaitable[None]],
+        on_change: Callable[[], None],
+        scheduler: TerneoSchedulerScope | None = None,
+    ) -> None:
+        """Initialize the tracker."""
+        self.hass = hass
+        self._clock = clock
+        self._publish = publish
+        self._on_change = on_change
+        self._scheduler = (
+            scheduler if scheduler is not None else TerneoScheduler(clock).scope()
+        )
+        self._pending: dict[str, _PendingCommand] = {}
+        self._retries: set[asyncio.Task] = set()
+        self.confirmed = 0
+        self.retries = 0
+        self.failures = 0
+        self.last_rtt: float | None = None
+        self.average_rtt: float | None = None
+
+    @property
+    def pending(self) -> int:
+        """Return the number of commands awaiting their echo."""
+        return len(self._pending)
+
+    def track(
+        self,
+        key: str,
+        expected: Any,
+        payload: str,
+        retain: bool,
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> None:
+        """Start waiting for the echo of a command that was just published."""
+        self._pending[key] = _PendingCommand(
+            expected, payload, retain, priority, self._clock.monotonic()
+        )
+        self._scheduler.schedule(key, CONFIRM_TIMEOUT, lambda: self._expire(key))
+
+    def handle_echo(self, key: str, value: Any) -> None:
+        """Confirm a pending command if telemetry reports the commanded value."""
+        pending = self._pending.get(key)
+        if pending is None or pending.expected != value:
+            return
+        del self._pending[key]
+        self._scheduler.cancel(key)
+        rtt = self._clock.monotonic() - pending.sent_at
+        self.confirmed += 1
+        self.last_rtt = rtt
+        self.average_rtt = (
+            rtt
+            if self.average_rtt is None
+            else self.average_rtt + RTT_SMOOTHING * (rtt - self.average_rtt)
+        )
+        self._on_change()
+
+    def shutdown(self) -> None:
+        """Stop retrying pending commands."""
+        self._scheduler.cancel_all()
+        self._pending.clear()
+        for task in self._retries:
+            task.cancel()
+        self._retries.clear()
+
+    def _expire(self, key: str) -> None:
+        """Retry an unconfirmed command or give up after the last attempt."""
+        pending = self._pending.get(key)
+        if pending is None:
+            return
+        if pending.attempts >= MAX_ATTEMPTS:
+            del self._pending[key]
+            self.failures += 1
+            _LOGGER.warning(
+                "Command %s=%s was not confirmed after %d attempts",
+                key,
+                pending.payload,
+                pending.attempts,
+            )
+            self._on_change()
+            return
+        self._scheduler.schedule(
+            key, CONFIRM_TIMEOUT * 2**pending.attempts, lambda: self._expire(key)
+        )
+        pending.attempts += 1
+        pending.sent_at = self._clock.monotonic()
+        self.retries += 1
+        # Retried in the command's own class, so background work stays behind
+        task = self.hass.async_create_task(
+            self._publish(key, pending.payload, pending.retain, pending.priority),
+            f"terneo retry {key}",
+        )
+        self._retries.add(task)
+        task.add_done_callback(lambda task: self._retry_done(key, task))
+        self._on_change()
+
+    def _retry_done(self, key: str, task: asyncio.Task) -> None:
+        """Forget a finished retry and log why it failed, if it did."""
+        self._retries.discard(task)
+        if not task.cancelled() and (err := task.exception()) is not None:
+            _LOGGER.warning("Could not resend command %s: %s", key, err)
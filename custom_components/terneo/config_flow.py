@@ -4,8 +4,21 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers import config_validation as cv
 
-from .const import DOMAIN
+from . import async_add_device, async_remove_device
+from .const import (
+    DOMAIN,
+    RECORDING_CLIMATE,
+    RECORDING_ENERGY,
+    RECORDING_TEMPERATURE,
+)
+from .filters import (
+    DEFAULT_DEADBAND,
+    DEFAULT_MAX_SILENT_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+)
+from .history import DEFAULT_HISTORY_HOURS
 
 
 class TerneoMQTTConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -13,6 +26,10 @@ class TerneoMQTTConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize the config flow."""
+        self._discovery_info: dict[str, str] = {}
+
     async def async_step_user(self, user_input=None) -> FlowResult:
         """Handle the initial step."""
         if user_input is not None:
@@ -68,6 +85,33 @@ class TerneoMQTTConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             ),
         )
 
+    async def async_step_integration_discovery(self, discovery_info) -> FlowResult:
+        """Handle a device discovered from telemetry."""
+        client_id = discovery_info["client_id"]
+        await self.async_set_unique_id(client_id)
+        self._abort_if_unique_id_configured()
+        self._discovery_info = discovery_info
+        self.context["title_placeholders"] = {"client_id": client_id}
+        return await self.async_step_discovery_confirm()
+
+    async def async_step_discovery_confirm(self, user_input=None) -> FlowResult:
+        """Confirm adding a discovered device to its config entry."""
+        client_id = self._discovery_info["client_id"]
+        entry = self.hass.config_entries.async_get_entry(
+            self._discovery_info["entry_id"]
+        )
+        if entry is None:
+            return self.async_abort(reason="entry_not_found")
+        if user_input is not None:
+            if not await async_add_device(self.hass, entry, client_id):
+                return self.async_abort(reason="already_configured")
+            return self.async_abort(reason="device_added")
+
+        return self.async_show_form(
+            step_id="discovery_confirm",
+            description_placeholders={"client_id": client_id, "title": entry.title},
+        )
+
     @staticmethod
     @callback
     def async_get_options_flow(config_entry):
@@ -75,6 +119,14 @@ class TerneoMQTTConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return TerneoMQTTOptionsFlow(config_entry)
 
 
+AGGREGATE_WINDOW_OPTIONS = {
+    "15": "15 minutes",
+    "60": "1 hour",
+    "360": "6 hours",
+    "1440": "24 hours",
+}
+
+
 class TerneoMQTTOptionsFlow(config_entries.OptionsFlow):
     """Handle options flow for TerneoMQ."""
 
@@ -85,10 +137,21 @@ class TerneoMQTTOptionsFlow(config_entries.OptionsFlow):
     async def async_step_init(self, user_input=None) -> FlowResult:
         """Manage the options."""
         if user_input is not None:
-            # Reload integration to apply new options
-            await self.hass.config_entries.async_reload(self._config_entry.entry_id)
+            # Device changes touch only the affected devices
+            for client_id in user_input.pop("add_client_ids", "").split(","):
+                if client_id.strip():
+                    await async_add_device(
+                        self.hass, self._config_entry, client_id.strip()
+                    )
+            for client_id in user_input.pop("remove_client_ids", []):
+                await async_remove_device(self.hass, self._config_entry, client_id)
+            # Changes are applied in place by the entry's update listener
             return self.async_create_entry(title="", data=user_input)
 
+        client_ids = [
+            device["client_id"] for device in self._config_entry.data.get("devices", [])
+        ]
+
         return self.async_show_form(
             step_id="init",
             data_schema=vol.Schema(
@@ -141,6 +204,97 @@ class TerneoMQTTOptionsFlow(config_entries.OptionsFlow):
                         ),
                         description="Reset status on startup (powerOff=1, setTemp=18)",
                     ): bool,
+                    vol.Optional(
+                        "discovery",
+                        default=self._config_entry.options.get("discovery", False),
+                        description="Offer new devices seen on the telemetry prefix",
+                    ): bool,
+                    vol.Optional(
+                        "deadband",
+                        default=self._config_entry.options.get(
+                            "deadband", DEFAULT_DEADBAND
+                        ),
+                        description="Temperature change below which updates are skipped",
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+                    vol.Optional(
+                        "min_interval",
+                        default=self._config_entry.options.get(
+                            "min_interval", DEFAULT_MIN_INTERVAL
+                        ),
+                        description="Minimum seconds between sensor updates",
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Optional(
+                        "max_silent_interval",
+                        default=self._config_entry.options.get(
+                            "max_silent_interval", DEFAULT_MAX_SILENT_INTERVAL
+                        ),
+                        description="Maximum seconds between sensor updates",
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=240)),
+                    vol.Optional(
+                        "reduced_recording",
+                        default=self._config_entry.options.get("reduced_recording", []),
+                        description="Entities that write fewer recorder rows",
+                    ): cv.multi_select(
+                        {
+                            RECORDING_CLIMATE: "Climate",
+                            RECORDING_TEMPERATURE: "Temperature sensors",
+                            RECORDING_ENERGY: "Energy",
+                        }
+                    ),
+                    vol.Optional(
+                        "aggregate_windows",
+                        default=self._config_entry.options.get("aggregate_windows", []),
+                        description="Rolling min, max and mean temperature sensors",
+                    ): cv.multi_select(AGGREGATE_WINDOW_OPTIONS),
+                    vol.Optional(
+                        "duty_cycle_window",
+                        default=self._config_entry.options.get("duty_cycle_window", 0),
+                        description="Extra duty cycle window in minutes (0 = none)",
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=10080)),
+                    vol.Optional(
+                        "daily_rollups",
+                        default=self._config_entry.options.get("daily_rollups", False),
+                        description="Add sensors with the previous day's totals",
+                    ): bool,
+                    vol.Optional(
+                        "fleet_sensors",
+                        default=self._config_entry.options.get("fleet_sensors", False),
+                        description="Add total power and device count sensors",
+                    ): bool,
+                    vol.Optional(
+                        "energy_statistics",
+                        default=self._config_entry.options.get(
+                            "energy_statistics", False
+                        ),
+                        description="Import hourly energy and heating time statistics",
+                    ): bool,
+                    vol.Optional(
+                        "energy_sensor",
+                        default=self._config_entry.options.get("energy_sensor", True),
+                        description="Energy sensor updated on every load change",
+                    ): bool,
+                    vol.Optional(
+                        "history_hours",
+                        default=self._config_entry.options.get(
+                            "history_hours", DEFAULT_HISTORY_HOURS
+                        ),
+                        description="Hours of raw telemetry kept in memory",
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=48)),
+                    vol.Optional(
+                        "archive_days",
+                        default=self._config_entry.options.get("archive_days", 0),
+                        description="Days of raw telemetry archived on disk (0 = off)",
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3660)),
+                    vol.Optional(
+                        "add_client_ids",
+                        default="",
+                        description="Comma-separated Client IDs to add",
+                    ): str,
+                    vol.Optional(
+                        "remove_client_ids",
+                        default=[],
+                        description="Devices to remove",
+                    ): cv.multi_select({cid: cid for cid in client_ids}),
                 }
             ),
         )
@@ -1,3 +1,42 @@
 """Constants for TerneoMQ integration."""
 
 DOMAIN = "terneo"
+
+DATA_CLOCK = "clock"
+DATA_HUB = "hub"
+DATA_INGEST = "ingest"
+DATA_OUTBOUND = "outbound"
+DATA_RUNTIME = "runtime"
+DATA_SCHEDULER = "scheduler"
+
+SIGNAL_DEVICE_ADDED = DOMAIN + "_{}_device_added"
+SIGNAL_DEVICE_REMOVED = DOMAIN + "_{}_device_removed"
+SIGNAL_COMMAND_STATS = DOMAIN + "_{}_command_stats"
+SIGNAL_INGEST_STATS = DOMAIN + "_{}_ingest_stats"
+SIGNAL_OPTIONS_UPDATED = DOMAIN + "_{}_options_updated"
+SIGNAL_SNAPSHOT = DOMAIN + "_{}_snapshot"
+SIGNAL_AGGREGATES = DOMAIN + "_{}_aggregates"
+SIGNAL_THERMAL = DOMAIN + "_{}_thermal"
+SIGNAL_DUTY_CYCLE = DOMAIN + "_{}_duty_cycle"
+SIGNAL_ROLLUP = DOMAIN + "_{}_rollup"
+SIGNAL_FLEET = DOMAIN + "_{}_fleet"
+SIGNAL_OUTBOUND_STATS = DOMAIN + "_outbound_stats"
+SIGNAL_COORDINATOR_ADDED = DOMAIN + "_coordinator_added"
+SIGNAL_COORDINATOR_REMOVED = DOMAIN + "_coordinator_removed"
+
+EVENT_ANOMALY = DOMAIN + "_anomaly"
+
+# Entity kinds whose recorder footprint can be reduced
+RECORDING_CLIMATE = "climate"
+RECORDING_TEMPERATURE = "temperature"
+RECORDING_ENERGY = "energy"
+
+SERVICE_ADD_DEVICE = "add_device"
+SERVICE_REMOVE_DEVICE = "remove_device"
+SERVICE_GET_DAILY_ROLLUPS = "get_daily_rollups"
+SERVICE_EXPORT = "export"
+SERVICE_GET_SNAPSHOT = "get_snapshot"
+SERVICE_BULK_COMMAND = "bulk_command"
+
+# Mode select options and the payloads the devices use for them
+MODE_PAYLOADS = {"schedule": "0", "manual": "1", "away": "4", "temporary": "5"}
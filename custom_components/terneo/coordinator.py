@@ -1,13 +1,63 @@
 """Coordinator for Terneo MQTT integration."""
 
+from collections.abc import Callable
 from typing import Any
 
 from homeassistant.components import mqtt
 from homeassistant.components.mqtt import ReceiveMessage
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 
-from .const import DOMAIN
+from .aggregates import (
+    AGGREGATE_KEYS,
+    AGGREGATE_STEPS,
+    DUTY_CYCLE_MAX_PUBLISH_INTERVAL,
+    TerneoDutyCycle,
+    TerneoRollingWindow,
+)
+from .archive import TerneoArchive
+from .clock import MonotonicClock, TerneoClock
+from .commands import CONFIRMED_KEYS, TerneoCommandTracker
+from .const import (
+    DOMAIN,
+    SIGNAL_AGGREGATES,
+    SIGNAL_COMMAND_STATS,
+    SIGNAL_DUTY_CYCLE,
+    SIGNAL_INGEST_STATS,
+    SIGNAL_SNAPSHOT,
+)
+from .filters import (
+    DEFAULT_DEADBAND,
+    DEFAULT_MAX_SILENT_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    TerneoChangeFilter,
+    build_filter_rules,
+)
+from .history import (
+    DEFAULT_HISTORY_HOURS,
+    HISTORY_KEYS,
+    HISTORY_RESOLUTION,
+    TRANSITION_KEYS,
+    TerneoRingBuffer,
+    history_capacity,
+)
+from .ingest import TerneoIngestBudget, TerneoIngestLimiter
+from .outbound import PRIORITY_INTERACTIVE, TerneoPublishGovernor
+from .rollups import TerneoRollup
+from .scheduler import TerneoScheduler
+from .thermal import TerneoThermalEstimate
+
+BOOTSTRAP_QUIET = 0.5  # seconds without telemetry that end a retained burst
+BOOTSTRAP_DEADLINE = 5.0  # seconds after which bootstrap ends regardless
+
+
+def parse_payload(key: str, payload_str: str) -> Any:
+    """Convert a raw MQTT payload into the value type used for key."""
+    if key in ["load", "powerOff", "mode", "bright"]:
+        return int(payload_str)
+    if key in ["floorTemp", "airTemp", "protTemp", "setTemp"]:
+        return float(payload_str)
+    return payload_str
 
 
 class TerneoCoordinator:
@@ -20,18 +70,80 @@ class TerneoCoordinator:
         telemetry_prefix: str,
         command_prefix: str,
         supports_air_temp: bool = True,
+        clock: TerneoClock | None = None,
+        ingest_budget: TerneoIngestBudget | None = None,
+        publish_governor: TerneoPublishGovernor | None = None,
+        scheduler: TerneoScheduler | None = None,
     ) -> None:
         """Initialize the coordinator."""
         self.hass = hass
+        self.clock = clock if clock is not None else MonotonicClock(hass)
         self.client_id = client_id
         self.telemetry_prefix = telemetry_prefix
         self.command_prefix = command_prefix
         self.supports_air_temp = supports_air_temp
+        self.publish_governor = publish_governor
         self._data: dict[str, Any] = {}
         self._subscriptions: list[Any] = []
+        self._air_temp_unsub: Any = None
+        self._connection_unsub: Any = None
+        self.scheduler = (
+            scheduler if scheduler is not None else TerneoScheduler(self.clock)
+        )
+        self._scheduler = self.scheduler.scope()
+        self._bootstrap_deadline: float | None = None
+        # key -> window length in seconds -> rolling window
+        self.windows: dict[str, dict[int, TerneoRollingWindow]] = {
+            key: {} for key in AGGREGATE_KEYS
+        }
+        # window length in seconds -> load duty cycle
+        self.duty_cycles: dict[int, TerneoDutyCycle] = {}
+        capacity = history_capacity(DEFAULT_HISTORY_HOURS)
+        self.history: dict[str, TerneoRingBuffer] = {
+            key: TerneoRingBuffer(
+                capacity, HISTORY_RESOLUTION, keep_transitions=key in TRANSITION_KEYS
+            )
+            for key in HISTORY_KEYS
+        }
+        self.thermal: TerneoThermalEstimate | None = None
+        self.rollup = TerneoRollup()
+        # Archives of the entries using the device, each written independently
+        self.archives: list[TerneoArchive] = []
+        self.last_seen: float | None = None
+        self._telemetry_listeners: list[Callable[[str, Any], None]] = []
+        self.commands = TerneoCommandTracker(
+            hass,
+            self.clock,
+            self._async_publish,
+            self._command_stats_changed,
+            self.scheduler.scope(),
+        )
+        self.ingest = TerneoIngestLimiter(
+            self.clock,
+            self._deliver,
+            self._ingest_stats_changed,
+            ingest_budget,
+            self._ingest_shed,
+            scheduler=self.scheduler.scope(),
+        )
+        self.changes = TerneoChangeFilter(
+            self.clock, self.ingest.submit, self.scheduler.scope()
+        )
+        self.set_change_filter(
+            DEFAULT_DEADBAND, DEFAULT_MIN_INTERVAL, DEFAULT_MAX_SILENT_INTERVAL
+        )
+
+    @property
+    def bootstrapping(self) -> bool:
+        """Return whether the coordinator is absorbing a retained burst."""
+        return self._bootstrap_deadline is not None
 
     async def async_setup(self) -> None:
         """Set up MQTT subscriptions."""
+        self._start_bootstrap()
+        self._connection_unsub = mqtt.async_subscribe_connection_status(
+            self.hass, self._handle_connection_status
+        )
         topics = [
             (
                 "floorTemp",
@@ -47,10 +159,6 @@ class TerneoCoordinator:
             ("mode", f"{self.telemetry_prefix}/{self.client_id}/mode"),
             ("bright", f"{self.telemetry_prefix}/{self.client_id}/bright"),
         ]
-        if self.supports_air_temp:
-            topics.append(
-                ("airTemp", f"{self.telemetry_prefix}/{self.client_id}/airTemp")
-            )
         if self.command_prefix != self.telemetry_prefix:
             topics.append(
                 ("powerOff", f"{self.command_prefix}/{self.client_id}/powerOff")
@@ -61,12 +169,109 @@ class TerneoCoordinator:
                 self.hass, topic, self._handle_message, qos=0
             )
             self._subscriptions.append(unsub)
+        if self.supports_air_temp:
+            await self._async_subscribe_air_temp()
+
+    async def _async_subscribe_air_temp(self) -> None:
+        """Subscribe to the airTemp topic."""
+        self._air_temp_unsub = await mqtt.async_subscribe(
+            self.hass,
+            f"{self.telemetry_prefix}/{self.client_id}/airTemp",
+            self._handle_message,
+            qos=0,
+        )
+
+    async def async_set_supports_air_temp(self, supports_air_temp: bool) -> None:
+        """Subscribe to or drop the airTemp topic without touching the others."""
+        if supports_air_temp == self.supports_air_temp:
+            return
+        self.supports_air_temp = supports_air_temp
+        if supports_air_temp:
+            await self._async_subscribe_air_temp()
+            return
+        if self._air_temp_unsub:
+            self._air_temp_unsub()
+            self._air_temp_unsub = None
+        self._data.pop("airTemp", None)
 
     async def async_teardown(self) -> None:
         """Unsubscribe from MQTT topics."""
         for unsub in self._subscriptions:
             unsub()
         self._subscriptions.clear()
+        if self._air_temp_unsub:
+            self._air_temp_unsub()
+            self._air_temp_unsub = None
+        if self._connection_unsub:
+            self._connection_unsub()
+            self._connection_unsub = None
+        self._scheduler.cancel_all()
+        self._bootstrap_deadline = None
+        self.commands.shutdown()
+        self.changes.shutdown()
+        self.ingest.shutdown()
+
+    def set_change_filter(
+        self, deadband: float, min_interval: float, max_silent_interval: float
+    ) -> None:
+        """Set how much non-control telemetry must change to reach entities."""
+        self.changes.configure(
+            build_filter_rules(deadband, min_interval, max_silent_interval)
+        )
+
+    def set_history_horizon(self, hours: float) -> None:
+        """Keep about hours of raw samples per key in memory."""
+        capacity = history_capacity(hours)
+        for key, buffer in self.history.items():
+            if buffer.capacity != capacity:
+                self.history[key] = buffer.resized(capacity)
+
+    def add_aggregate_window(self, length: int) -> None:
+        """Track rolling aggregates over length seconds and publish them."""
+        if length in self.windows[AGGREGATE_KEYS[0]]:
+            return
+        for windows in self.windows.values():
+            windows[length] = TerneoRollingWindow(length)
+        self._scheduler.schedule_interval(
+            ("aggregates", length),
+            length / AGGREGATE_STEPS,
+            lambda: async_dispatcher_send(
+                self.hass, SIGNAL_AGGREGATES.format(self.client_id), length
+            ),
+        )
+
+    def add_duty_cycle_window(self, length: int) -> None:
+        """Track the load duty cycle over length seconds and publish it."""
+        if length in self.duty_cycles:
+            return
+        duty_cycle = self.duty_cycles[length] = TerneoDutyCycle(length)
+        if (load := self._data.get("load")) is not None:
+            duty_cycle.add(self.clock.monotonic(), bool(load))
+        self._scheduler.schedule_interval(
+            ("duty_cycle", length),
+            min(length / AGGREGATE_STEPS, DUTY_CYCLE_MAX_PUBLISH_INTERVAL),
+            lambda: async_dispatcher_send(
+                self.hass, SIGNAL_DUTY_CYCLE.format(self.client_id), length
+            ),
+        )
+
+    @callback
+    def _handle_connection_status(self, connected: bool) -> None:
+        """Absorb the retained burst that follows a broker reconnect."""
+        if connected:
+            self._start_bootstrap()
+
+    def _start_bootstrap(self) -> None:
+        """Fill the cache without notifying entities until telemetry settles."""
+        self._bootstrap_deadline = self.clock.monotonic() + BOOTSTRAP_DEADLINE
+        self._scheduler.schedule("bootstrap", BOOTSTRAP_QUIET, self._end_bootstrap)
+
+    @callback
+    def _end_bootstrap(self) -> None:
+        """Let every entity write the cached state once."""
+        self._bootstrap_deadline = None
+        self.changes.reset(self._data)
+        async_dispatcher_send(self.hass, SIGNAL_SNAPSHOT.format(self.client_id))
 
     @callback
     def _handle_message(self, msg: ReceiveMessage) -> None:
@@ -80,34 +285,112 @@ class TerneoCoordinator:
                     if isinstance(msg.payload, bytes)
                     else str(msg.payload)
                 )
-                if key in ["load", "powerOff", "mode", "bright"]:
-                    value = int(payload_str)
-                elif key in ["floorTemp", "airTemp", "protTemp", "setTemp"]:
-                    value = float(payload_str)
-                else:
-                    value = payload_str
+                value = parse_payload(key, payload_str)
                 self._data[key] = value
-                # Send update signal
-                async_dispatcher_send(
-                    self.hass,
-                    f"{DOMAIN}_{self.client_id}_update",
-                    key,
-                    value,
-                )
+                now = self.last_seen = self.clock.monotonic()
+                if (buffer := self.history.get(key)) is not None:
+                    buffer.append(now, value)
+                if windows := self.windows.get(key):
+                    for window in windows.values():
+                        window.add(now, value)
+                if key == "load":
+                    for duty_cycle in self.duty_cycles.values():
+                        duty_cycle.add(now, bool(value))
+                self.rollup.add(now, key, value)
+                for archive in self.archives:
+                    archive.append(self.client_id, key, value)
+                for listener in self._telemetry_listeners:
+                    listener(key, value)
+                if msg.topic == f"{self.telemetry_prefix}/{self.client_id}/{key}":
+                    self.commands.handle_echo(key, value)
+                if self._bootstrap_deadline is not None:
+                    self._scheduler.schedule(
+                        "bootstrap",
+                        min(
+                            BOOTSTRAP_QUIET,
+                            self._bootstrap_deadline - self.clock.monotonic(),
+                        ),
+                        self._end_bootstrap,
+                    )
+                    return
+                self.changes.submit(key, value)
             except (ValueError, AttributeError):
                 pass
 
+    @callback
+    def _deliver(self, key: str, value: Any) -> None:
+        """Send an update signal for a value that passed the ingest limiter."""
+        async_dispatcher_send(
+            self.hass,
+            f"{DOMAIN}_{self.client_id}_update",
+            key,
+            value,
+        )
+
+    @callback
+    def _ingest_shed(self, key: str) -> None:
+        """Keep a shed value from counting as seen by the change filter."""
+        self.changes.forget(key)
+
+    @callback
+    def async_add_telemetry_listener(
+        self, listener: Callable[[str, Any], None]
+    ) -> CALLBACK_TYPE:
+        """Call listener with every parsed value before any filtering."""
+        self._telemetry_listeners.append(listener)
+        return lambda: self._telemetry_listeners.remove(listener)
+
     def get_value(self, key: str) -> Any:
         """Get current value for a key."""
         return self._data.get(key)
 
+    def get_values(self) -> dict[str, Any]:
+        """Get a copy of all current values."""
+        return dict(self._data)
+
     def set_cached_value(self, key: str, value: Any) -> None:
         """Cache a value locally without waiting for telemetry."""
         self._data[key] = value
 
     async def publish_command(
-        self, topic_suffix: str, payload: str, retain: bool = False
+        self,
+        topic_suffix: str,
+        payload: str,
+        retain: bool = False,
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> None:
+        """Publish a command to MQTT and track it until telemetry echoes it."""
+        await self._async_publish(topic_suffix, payload, retain, priority)
+        # With a shared prefix our own publish would look like the echo
+        if (
+            topic_suffix in CONFIRMED_KEYS
+            and self.command_prefix != self.telemetry_prefix
+        ):
+            try:
+                expected = parse_payload(topic_suffix, payload)
+            except ValueError:
+                return
+            self.commands.track(topic_suffix, expected, payload, retain, priority)
+
+    async def _async_publish(
+        self,
+        topic_suffix: str,
+        payload: str,
+        retain: bool = False,
+        priority: int = PRIORITY_INTERACTIVE,
     ) -> None:
-        """Publish a command to MQTT."""
+        """Publish a payload on the command topic once the governor allows it."""
+        if self.publish_governor is not None:
+            await self.publish_governor.async_acquire(self.client_id, priority)
         topic = f"{self.command_prefix}/{self.client_id}/{topic_suffix}"
         await mqtt.async_publish(self.hass, topic, payload, retain=retain)
+
+    @callback
+    def _command_stats_changed(self) -> None:
+        """Notify listeners that command delivery metrics changed."""
+        async_dispatcher_send(self.hass, SIGNAL_COMMAND_STATS.format(self.client_id))
+
+    @callback
+    def _ingest_stats_changed(self) -> None:
+        """Notify listeners that inbound rate limiting metrics changed."""
+        async_dispatcher_send(self.hass, SIGNAL_INGEST_STATS.format(self.client_id))
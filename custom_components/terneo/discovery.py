@@ -0,0 +1,69 @@
+"""Discovery of unconfigured devices from TerneoMQ telemetry."""
+
+import logging
+
+from homeassistant.components import mqtt
+from homeassistant.components.mqtt import ReceiveMessage
+from homeassistant.config_entries import SOURCE_INTEGRATION_DISCOVERY, ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import discovery_flow
+
+from .const import DOMAIN
+from .hub import get_hub
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TerneoDiscovery:
+    """Watch floorTemp telemetry and offer devices not yet configured."""
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, telemetry_prefix: str
+    ) -> None:
+        """Initialize the discovery listener."""
+        self.hass = hass
+        self.entry = entry
+        self.telemetry_prefix = telemetry_prefix
+        self._seen: set[str] = set()
+        self._unsubscribe: CALLBACK_TYPE | None = None
+
+    async def async_start(self) -> None:
+        """Subscribe to the floorTemp wildcard topic."""
+        self._unsubscribe = await mqtt.async_subscribe(
+            self.hass,
+            f"{self.telemetry_prefix}/+/floorTemp",
+            self._handle_message,
+            qos=0,
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Unsubscribe from the wildcard topic."""
+        if self._unsubscribe:
+            self._unsubscribe()
+            self._unsubscribe = None
+
+    @callback
+    def forget(self, client_id: str) -> None:
+        """Offer a device again the next time it reports."""
+        self._seen.discard(client_id)
+
+    @callback
+    def _handle_message(self, msg: ReceiveMessage) -> None:
+        """Start a discovery flow the first time an unknown device reports."""
+        topic_parts = msg.topic.split("/")
+        if len(topic_parts) < 3:
+            return
+        client_id = topic_parts[-2]
+        if client_id in self._seen:
+            return
+        if get_hub(self.hass).has_device(self.telemetry_prefix, client_id):
+            return
+        self._seen.add(client_id)
+        _LOGGER.debug("Discovered unconfigured Terneo device %s", client_id)
+        discovery_flow.async_create_flow(
+            self.hass,
+            DOMAIN,
+            context={"source": SOURCE_INTEGRATION_DISCOVERY},
+            data={"entry_id": self.entry.entry_id, "client_id": client_id},
+        )
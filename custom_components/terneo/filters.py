@@ -0,0 +1,123 @@
+"""Significant-change filtering of telemetry for TerneoMQ integration."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from .scheduler import TerneoScheduler, TerneoSchedulerScope
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .clock import TerneoClock
+
+DEFAULT_DEADBAND = 0.2  # °C
+DEFAULT_MIN_INTERVAL = 0  # seconds
+DEFAULT_MAX_SILENT_INTERVAL = 120  # seconds, below the availability timeout
+
+TEMPERATURE_KEYS = ("floorTemp", "airTemp", "protTemp")
+
+
+class TerneoFilterRule(NamedTuple):
+    """How much and how often a key has to change to reach entities."""
+
+    deadband: float
+    min_interval: float
+    max_silent_interval: float
+
+
+def build_filter_rules(
+    deadband: float, min_interval: float, max_silent_interval: float
+) -> dict[str, TerneoFilterRule]:
+    """Return filter rules for every key that is not a control key."""
+    rules = {
+        key: TerneoFilterRule(deadband, min_interval, max_silent_interval)
+        for key in TEMPERATURE_KEYS
+    }
+    rules["bright"] = TerneoFilterRule(0.0, min_interval, max_silent_interval)
+    return rules
+
+
+class TerneoChangeFilter:
+    """Hold back telemetry that entities do not need to see.
+
+    Keys without a rule, such as powerOff, load, setTemp and mode, always
+    pass. Other keys pass when they moved by at least the deadband since
+    the value last passed, at most once per minimum interval, and at least
+    once per maximum silent interval. A significant change held back by
+    the minimum interval is delivered when the interval ends.
+    """
+
+    def __init__(
+        self,
+        clock: TerneoClock,
+        deliver: Callable[[str, Any], None],
+        scheduler: TerneoSchedulerScope | None = None,
+    ):
+        """Initialize the filter."""
+        self._clock = clock
+        self._deliver = deliver
+        self._scheduler = (
+            scheduler if scheduler is not None else TerneoScheduler(clock).scope()
+        )
+        self.rules: dict[str, TerneoFilterRule] = {}
+        self._passed: dict[str, tuple[Any, float]] = {}
+        self._held: dict[str, Any] = {}
+        self.suppressed = 0
+
+    def configure(self, rules: dict[str, TerneoFilterRule]) -> None:
+        """Replace the filter rules."""
+        self.rules = rules
+
+    def reset(self, values: dict[str, Any]) -> None:
+        """Treat values as just seen by entities, e.g. after a snapshot."""
+        now = self._clock.monotonic()
+        self._scheduler.cancel_all()
+        self._held.clear()
+        self._passed = {key: (value, now) for key, value in values.items()}
+
+    def submit(self, key: str, value: Any) -> None:
+        """Deliver value if it is significant for key."""
+        rule = self.rules.get(key)
+        now = self._clock.monotonic()
+        passed = self._passed.get(key)
+        if rule is not None and passed is not None:
+            elapsed = now - passed[1]
+            if elapsed < rule.max_silent_interval:
+                if round(abs(value - passed[0]), 3) < rule.deadband:
+                    self._release(key)
+                    self.suppressed += 1
+                    return
+                if elapsed < rule.min_interval:
+                    if key not in self._held:
+                        self._scheduler.schedule(
+                            key,
+                            rule.min_interval - elapsed,
+                            lambda: self._flush(key),
+                        )
+                    self._held[key] = value
+                    self.suppressed += 1
+                    return
+        self._release(key)
+        self._passed[key] = (value, now)
+        self._deliver(key, value)
+
+    def forget(self, key: str) -> None:
+        """Let the next value of key pass, as the last one never arrived."""
+        self._passed.pop(key, None)
+
+    def shutdown(self) -> None:
+        """Drop held values."""
+        self._scheduler.cancel_all()
+        self._held.clear()
+
+    def _release(self, key: str) -> None:
+        """Forget a held value that was superseded."""
+        if self._held.pop(key, None) is not None:
+            self._scheduler.cancel(key)
+
+    def _flush(self, key: str) -> None:
+        """Deliver a held significant change once its interval ended."""
+        value = self._held.pop(key)
+        self._passed[key] = (value, self._clock.monotonic())
+        self._deliver(key, value)
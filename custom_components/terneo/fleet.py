@@ -0,0 +1,193 @@
+"""Fleet-wide aggregates of a config entry for TerneoMQ integration."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
+
+from .base_entity import AVAILABILITY_TIMEOUT
+from .const import DOMAIN, SIGNAL_FLEET, SIGNAL_SNAPSHOT
+from .scheduler import TerneoSchedulerScope
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .coordinator import TerneoCoordinator
+
+FLEET_WRITE_INTERVAL = 10  # seconds, fleet sensors are written at most this often
+FLEET_CHECK_INTERVAL = 60  # seconds between checks for silent devices
+
+
+class TerneoFleetContribution(NamedTuple):
+    """What one device adds to the fleet totals."""
+
+    heating: int
+    off: int
+    unavailable: int
+    floor_temp: float | None
+
+
+UNAVAILABLE = TerneoFleetContribution(0, 0, 1, None)
+
+
+class TerneoFleetAggregate:
+    """Totals over the devices of an entry, kept up to date from deltas.
+
+    Every update replaces one device's contribution, so the totals are
+    adjusted in O(1) instead of being recomputed over the fleet. Devices
+    that stayed silent for AVAILABILITY_TIMEOUT count as unavailable.
+    Listeners are notified at most once per FLEET_WRITE_INTERVAL.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, rated_power_w: int = 0
+    ) -> None:
+        """Initialize an empty fleet."""
+        self.hass = hass
+        self.entry_id = entry_id
+        self.rated_power_w = rated_power_w
+        self._scheduler: TerneoSchedulerScope | None = None
+        self._coordinators: dict[str, TerneoCoordinator] = {}
+        self._contributions: dict[str, TerneoFleetContribution] = {}
+        self._last_seen: dict[str, float] = {}
+        self._unsubs: dict[str, list[Callable[[], None]]] = {}
+        self.heating = 0
+        self.off = 0
+        self.unavailable = 0
+        self._floor_sum = 0.0
+        self._floor_count = 0
+
+    @property
+    def total_power(self) -> int | None:
+        """Return the power drawn by the heating devices in watts."""
+        return self.heating * self.rated_power_w if self.rated_power_w > 0 else None
+
+    @property
+    def average_floor_temp(self) -> float | None:
+        """Return the mean floor temperature of the available devices."""
+        if not self._floor_count:
+            return None
+        return round(self._floor_sum / self._floor_count, 2)
+
+    @callback
+    def async_options_updated(self, changes: dict[str, Any]) -> None:
+        """Report total power at a new rated power."""
+        if "rated_power_w" in changes:
+            self.rated_power_w = changes["rated_power_w"]
+            self.async_schedule_write()
+
+    def add_device(self, coordinator: TerneoCoordinator) -> None:
+        """Start following a device, counting it unavailable until it reports."""
+        client_id = coordinator.client_id
+        if client_id in self._contributions:
+            return
+        if self._scheduler is None:
+            self._scheduler = coordinator.scheduler.scope()
+            self._scheduler.schedule_interval(
+                "availability", FLEET_CHECK_INTERVAL, self._check_availability
+            )
+        self._coordinators[client_id] = coordinator
+        self._contributions[client_id] = TerneoFleetContribution(0, 0, 0, None)
+        self._apply(client_id, UNAVAILABLE)
+        self._unsubs[client_id] = [
+            async_dispatcher_connect(
+                self.hass,
+                f"{DOMAIN}_{client_id}_update",
+                lambda _key, _value: self._refresh(client_id),
+            ),
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_SNAPSHOT.format(client_id),
+                lambda: self._refresh(client_id),
+            ),
+        ]
+        if coordinator.get_value("load") is not None:
+            self._refresh(client_id)
+
+    def remove_device(self, client_id: str) -> None:
+        """Stop following a device and take it out of the totals."""
+        if client_id not in self._contributions:
+            return
+        for unsub in self._unsubs.pop(client_id):
+            unsub()
+        self._apply(client_id, TerneoFleetContribution(0, 0, 0, None))
+        del self._contributions[client_id]
+        del self._coordinators[client_id]
+        self._last_seen.pop(client_id, None)
+
+    def shutdown(self) -> None:
+        """Stop following all devices."""
+        for client_id in list(self._contributions):
+            self.remove_device(client_id)
+        if self._scheduler is not None:
+            self._scheduler.cancel_all()
+
+    @callback
+    def _refresh(self, client_id: str) -> None:
+        """Recompute one device's contribution after it reported."""
+        coordinator = self._coordinators[client_id]
+        self._last_seen[client_id] = coordinator.clock.monotonic()
+        self._apply(
+            client_id,
+            TerneoFleetContribution(
+                heating=int(coordinator.get_value("load") == 1),
+                off=int(coordinator.get_value("powerOff") == 1),
+                unavailable=0,
+                floor_temp=coordinator.get_value("floorTemp"),
+            ),
+        )
+
+    @callback
+    def _check_availability(self) -> None:
+        """Count devices that stopped reporting as unavailable."""
+        for client_id, last_seen in list(self._last_seen.items()):
+            coordinator = self._coordinators[client_id]
+            if coordinator.clock.monotonic() - last_seen > AVAILABILITY_TIMEOUT:
+                del self._last_seen[client_id]
+                self._apply(client_id, UNAVAILABLE)
+
+    def _apply(self, client_id: str, new: TerneoFleetContribution) -> None:
+        """Replace a device's contribution by adjusting the totals."""
+        old = self._contributions[client_id]
+        if new == old:
+            return
+        self._contributions[client_id] = new
+        self.heating += new.heating - old.heating
+        self.off += new.off - old.off
+        self.unavailable += new.unavailable - old.unavailable
+        if old.floor_temp is not None:
+            self._floor_sum -= old.floor_temp
+            self._floor_count -= 1
+        if new.floor_temp is not None:
+            self._floor_sum += new.floor_temp
+            self._floor_count += 1
+        if not self._floor_count:
+            # Start again from an exact zero instead of accumulated rounding
+            self._floor_sum = 0.0
+        self.async_schedule_write()
+
+    @callback
+    def async_schedule_write(self) -> None:
+        """Notify the fleet sensors unless a write is already due."""
+        if self._scheduler is not None and "write" not in self._scheduler:
+            self._scheduler.schedule("write", FLEET_WRITE_INTERVAL, self._write)
+
+    @callback
+    def _write(self) -> None:
+        """Notify the fleet sensors of the current totals."""
+        async_dispatcher_send(self.hass, SIGNAL_FLEET.format(self.entry_id))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the current totals."""
+        return {
+            "total_power": self.total_power,
+            "heating": self.heating,
+            "off": self.off,
+            "unavailable": self.unavailable,
+            "average_floor_temp": self.average_floor_temp,
+        }
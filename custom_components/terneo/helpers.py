@@ -1,6 +1,23 @@
 """Helper utilities for TerneoMQ integration."""
 
+from collections.abc import Callable, Iterable
+from typing import Any
+
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .aggregates import DUTY_CYCLE_WINDOWS
+from .const import DOMAIN, SIGNAL_DEVICE_ADDED, SIGNAL_DEVICE_REMOVED
+from .coordinator import TerneoCoordinator
+from .filters import (
+    DEFAULT_DEADBAND,
+    DEFAULT_MAX_SILENT_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+)
+from .history import DEFAULT_HISTORY_HOURS
 
 
 def get_mqtt_prefixes(config_entry: ConfigEntry) -> tuple[str, str]:
@@ -18,3 +35,94 @@ def get_mqtt_prefixes(config_entry: ConfigEntry) -> tuple[str, str]:
         or publish_prefix
     )
     return publish_prefix, command_prefix
+
+
+def get_supports_air_temp(config_entry: ConfigEntry) -> bool:
+    """Return whether devices of the entry report air temperature."""
+    return config_entry.options.get(
+        "supports_air_temp", config_entry.data.get("supports_air_temp", True)
+    )
+
+
+def get_entry_settings(config_entry: ConfigEntry) -> dict[str, Any]:
+    """Return the effective settings of an entry, options taking precedence."""
+    publish_prefix, command_prefix = get_mqtt_prefixes(config_entry)
+    return {
+        "publish_prefix": publish_prefix,
+        "command_prefix": command_prefix,
+        "supports_air_temp": get_supports_air_temp(config_entry),
+        "model": config_entry.options.get(
+            "model", config_entry.data.get("model", "AX")
+        ),
+        "rated_power_w": config_entry.options.get(
+            "rated_power_w", config_entry.data.get("rated_power_w", 0)
+        ),
+        "discovery": config_entry.options.get("discovery", False),
+        "deadband": config_entry.options.get("deadband", DEFAULT_DEADBAND),
+        "min_interval": config_entry.options.get("min_interval", DEFAULT_MIN_INTERVAL),
+        "max_silent_interval": config_entry.options.get(
+            "max_silent_interval", DEFAULT_MAX_SILENT_INTERVAL
+        ),
+        "reduced_recording": config_entry.options.get("reduced_recording", []),
+        # Window lengths in minutes, stored as strings by the options form
+        "aggregate_windows": sorted(
+            int(minutes)
+            for minutes in config_entry.options.get("aggregate_windows", [])
+        ),
+        # Window lengths in minutes, the default ones plus an optional custom one
+        "duty_cycle_windows": sorted(
+            {*DUTY_CYCLE_WINDOWS, config_entry.options.get("duty_cycle_window", 0)}
+            - {0}
+        ),
+        "daily_rollups": config_entry.options.get("daily_rollups", False),
+        "fleet_sensors": config_entry.options.get("fleet_sensors", False),
+        "energy_statistics": config_entry.options.get("energy_statistics", False),
+        "energy_sensor": config_entry.options.get("energy_sensor", True),
+        "history_hours": config_entry.options.get(
+            "history_hours", DEFAULT_HISTORY_HOURS
+        ),
+        "archive_days": config_entry.options.get("archive_days", 0),
+    }
+
+
+def async_setup_device_entities(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+    create_entities: Callable[[TerneoCoordinator], Iterable[Entity]],
+    device_removed: Callable[[str], None] | None = None,
+) -> None:
+    """Add entities for configured devices and for devices added later.
+
+    Entities of removed devices are dropped through the device registry;
+    device_removed lets a platform forget its own per-device references.
+    """
+    coordinators = hass.data[DOMAIN][config_entry.entry_id]
+    entities: list[Entity] = []
+    for device in config_entry.data.get("devices", []):
+        # Devices shown by another entry are added when they are handed over
+        if (coordinator := coordinators.get(device["client_id"])) is not None:
+            entities.extend(create_entities(coordinator))
+    if entities:
+        async_add_entities(entities)
+
+    @callback
+    def _async_device_added(client_id: str) -> None:
+        """Add entities for a device added without reloading the entry."""
+        async_add_entities(list(create_entities(coordinators[client_id])))
+
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_DEVICE_ADDED.format(config_entry.entry_id),
+            _async_device_added,
+        )
+    )
+    if device_removed is not None:
+        config_entry.async_on_unload(
+            async_dispatcher_connect(
+                hass,
+                SIGNAL_DEVICE_REMOVED.format(config_entry.entry_id),
+                callback(device_removed),
+            )
+        )
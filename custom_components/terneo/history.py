@@ -0,0 +1,119 @@
+"""In-memory telemetry history for TerneoMQ integration."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+HISTORY_KEYS = ("floorTemp", "airTemp", "protTemp", "setTemp", "load", "powerOff")
+# Keys whose every change matters, e.g. load transitions for flapping checks
+TRANSITION_KEYS = ("setTemp", "load", "powerOff")
+DEFAULT_HISTORY_HOURS = 6
+HISTORY_RESOLUTION = 30  # seconds per history slot, one sample kept per slot
+
+# Oldest-first (timestamps, values) segments; at most two when the ring wraps
+SampleViews = list[tuple[memoryview, memoryview]]
+
+
+def history_capacity(hours: float) -> int:
+    """Return the number of samples that covers hours at HISTORY_RESOLUTION."""
+    return max(1, int(hours * 3600 / HISTORY_RESOLUTION))
+
+
+class TerneoRingBuffer:
+    """Fixed-size buffer of timestamped samples backed by two float arrays.
+
+    Appending overwrites the oldest sample once the buffer is full. With a
+    resolution, a sample in the same resolution-second slot as the newest
+    one replaces it, so a full buffer spans capacity slots however fast
+    samples arrive. Buffers that keep transitions instead only drop
+    repeats of the newest value within its slot. Views returned by views()
+    share memory with the buffer and are only valid until the next append.
+    """
+
+    def __init__(
+        self, capacity: int, resolution: float = 0.0, keep_transitions: bool = False
+    ) -> None:
+        """Initialize an empty buffer holding up to capacity samples."""
+        self.capacity = capacity
+        self.resolution = resolution
+        self.keep_transitions = keep_transitions
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return self._size
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Add a sample, dropping the oldest one when full."""
+        if self.resolution and self._size:
+            newest = (self._start + self._size - 1) % self.capacity
+            if timestamp // self.resolution == self._times[newest] // self.resolution:
+                if not self.keep_transitions:
+                    self._times[newest] = timestamp
+                    self._values[newest] = value
+                    return
+                if value == self._values[newest]:
+                    return
+        end = (self._start + self._size) % self.capacity
+        self._times[end] = timestamp
+        self._values[end] = value
+        if self._size < self.capacity:
+            self._size += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+
+    def views(self, since: float | None = None) -> SampleViews:
+        """Return samples newer than since as zero-copy array views."""
+        times = memoryview(self._times)
+        values = memoryview(self._values)
+        end = self._start + self._size
+        if end <= self.capacity:
+            bounds = [(self._start, end)]
+        else:
+            bounds = [(self._start, self.capacity), (0, end - self.capacity)]
+        segments: SampleViews = []
+        for first, hi in bounds:
+            lo = first if since is None else bisect_right(self._times, since, first, hi)
+            if lo < hi:
+                segments.append((times[lo:hi], values[lo:hi]))
+        return segments
+
+    def copy(self, since: float | None = None) -> tuple[array, array]:
+        """Return samples newer than since as arrays owned by the caller."""
+        times = array("d")
+        values = array("d")
+        for time_view, value_view in self.views(since):
+            times.frombytes(time_view.cast("B"))
+            values.frombytes(value_view.cast("B"))
+        return times, values
+
+    def resized(self, capacity: int) -> TerneoRingBuffer:
+        """Return a buffer of another capacity holding the newest samples."""
+        buffer = TerneoRingBuffer(capacity, self.resolution, self.keep_transitions)
+        for times, values in self.views():
+            for timestamp, value in zip(times, values, strict=True):
+                buffer.append(timestamp, value)
+        return buffer
+
+
+def get_recent_samples(
+    hass: HomeAssistant, client_id: str, key: str, seconds: float
+) -> SampleViews:
+    """Return the samples of a device key received in the last seconds.
+
+    Timestamps are on the coordinator clock's monotonic scale.
+    """
+    from .hub import get_hub  # noqa: PLC0415
+
+    coordinator = get_hub(hass).find(client_id)
+    if coordinator is None or (buffer := coordinator.history.get(key)) is None:
+        return []
+    return buffer.views(coordinator.clock.monotonic() - seconds)
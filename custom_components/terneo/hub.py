@@ -0,0 +1,145 @@
+"""Domain-level registry of shared coordinators for TerneoMQ integration."""
+
+import logging
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .anomalies import TerneoAnomalyDetector
+from .clock import get_clock
+from .const import (
+    DATA_HUB,
+    DOMAIN,
+    SIGNAL_COORDINATOR_ADDED,
+    SIGNAL_COORDINATOR_REMOVED,
+)
+from .coordinator import TerneoCoordinator
+from .ingest import get_ingest_budget
+from .outbound import get_publish_governor
+from .rollups import TerneoRollupEngine
+from .scheduler import get_scheduler
+from .thermal import TerneoThermalEstimator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TerneoHub:
+    """Share one coordinator per (telemetry_prefix, client_id) across entries."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the hub."""
+        self.hass = hass
+        self._coordinators: dict[tuple[str, str], TerneoCoordinator] = {}
+        # Entries using each device, in the order they acquired it
+        self._owners: dict[tuple[str, str], list[str]] = {}
+        self.thermal = TerneoThermalEstimator(hass, self._coordinators.values)
+        self.rollups = TerneoRollupEngine(hass, self._coordinators.values)
+        self.anomalies = TerneoAnomalyDetector(hass, self._coordinators.values)
+
+    async def async_acquire(
+        self,
+        entry_id: str,
+        client_id: str,
+        telemetry_prefix: str,
+        command_prefix: str,
+        supports_air_temp: bool = True,
+    ) -> TerneoCoordinator:
+        """Return the coordinator for a device, creating it on first use."""
+        key = (telemetry_prefix, client_id)
+        coordinator = self._coordinators.get(key)
+        if coordinator is not None:
+            if (
+                coordinator.command_prefix != command_prefix
+                or coordinator.supports_air_temp != supports_air_temp
+            ):
+                _LOGGER.warning(
+                    "Device %s on %s is shared with another entry; "
+                    "keeping its existing command prefix and airTemp settings",
+                    client_id,
+                    telemetry_prefix,
+                )
+            if entry_id not in self._owners[key]:
+                self._owners[key].append(entry_id)
+            return coordinator
+
+        coordinator = TerneoCoordinator(
+            self.hass,
+            client_id,
+            telemetry_prefix,
+            command_prefix,
+            supports_air_temp,
+            clock=get_clock(self.hass),
+            ingest_budget=get_ingest_budget(self.hass),
+            publish_governor=get_publish_governor(self.hass),
+            scheduler=get_scheduler(self.hass),
+        )
+        self._coordinators[key] = coordinator
+        self._owners[key] = [entry_id]
+        self.thermal.start(coordinator.clock)
+        self.rollups.start()
+        self.anomalies.start(coordinator.clock)
+        await coordinator.async_setup()
+        async_dispatcher_send(self.hass, SIGNAL_COORDINATOR_ADDED, coordinator)
+        return coordinator
+
+    async def async_release(
+        self, entry_id: str, coordinator: TerneoCoordinator
+    ) -> None:
+        """Drop an entry's reference and tear down unused coordinators."""
+        key = (coordinator.telemetry_prefix, coordinator.client_id)
+        owners = self._owners.get(key)
+        if owners is None:
+            return
+        if owners[0] == entry_id:
+            # The entry showing the device queued its publishes; drop them too
+            get_publish_governor(self.hass).discard(coordinator.client_id)
+        if entry_id in owners:
+            owners.remove(entry_id)
+        if owners:
+            return
+        del self._owners[key]
+        del self._coordinators[key]
+        async_dispatcher_send(self.hass, SIGNAL_COORDINATOR_REMOVED, coordinator)
+        if not self._coordinators:
+            self.thermal.stop()
+            self.rollups.stop()
+            self.anomalies.stop()
+            get_publish_governor(self.hass).shutdown()
+        await coordinator.async_teardown()
+
+    def has_device(self, telemetry_prefix: str, client_id: str) -> bool:
+        """Return whether any entry already uses a device."""
+        return (telemetry_prefix, client_id) in self._coordinators
+
+    def entity_owner(self, telemetry_prefix: str, client_id: str) -> str | None:
+        """Return the entry that creates a device's entities.
+
+        Entities are keyed by client id, so only the first entry using a
+        device creates them; the next one takes over when it is released.
+        """
+        owners = self._owners.get((telemetry_prefix, client_id))
+        return owners[0] if owners else None
+
+    def coordinators(self) -> list[TerneoCoordinator]:
+        """Return the coordinators of all devices in use."""
+        return list(self._coordinators.values())
+
+    def find(self, client_id: str) -> TerneoCoordinator | None:
+        """Return a coordinator of a device on any telemetry prefix."""
+        for (_, device_id), coordinator in self._coordinators.items():
+            if device_id == client_id:
+                return coordinator
+        return None
+
+    def owners(self, coordinator: TerneoCoordinator) -> set[str]:
+        """Return the entry ids currently using a coordinator."""
+        key = (coordinator.telemetry_prefix, coordinator.client_id)
+        return set(self._owners.get(key, ()))
+
+
+def get_hub(hass: HomeAssistant) -> TerneoHub:
+    """Return the hub shared by all config entries, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (hub := domain_data.get(DATA_HUB)) is None:
+        hub = domain_data[DATA_HUB] = TerneoHub(hass)
+    return hub
@@ -0,0 +1,182 @@
+"""Inbound telemetry rate limiting for TerneoMQ integration."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+
+from .clock import get_clock
+from .const import DATA_INGEST, DOMAIN
+from .scheduler import TerneoScheduler, TerneoSchedulerScope
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .clock import TerneoClock
+
+_LOGGER = logging.getLogger(__name__)
+
+# Lower numbers are delivered first and shed last
+PRIORITY_CONTROL = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+KEY_PRIORITIES = {
+    "powerOff": PRIORITY_CONTROL,
+    "load": PRIORITY_CONTROL,
+    "setTemp": PRIORITY_CONTROL,
+    "mode": PRIORITY_CONTROL,
+    "floorTemp": PRIORITY_NORMAL,
+    "airTemp": PRIORITY_NORMAL,
+    "bright": PRIORITY_LOW,
+    "protTemp": PRIORITY_LOW,
+}
+
+DEVICE_RATE = 5.0  # messages per second delivered per device
+DEVICE_BURST = 20.0
+GLOBAL_RATE = 100.0  # messages per second delivered across all devices
+GLOBAL_BURST = 200.0
+LOW_PRIORITY_RESERVE = 0.5  # share of the global burst kept for other keys
+STATS_INTERVAL = 10.0  # seconds between metric notifications
+
+
+class TerneoTokenBucket:
+    """Token bucket refilled from a clock."""
+
+    def __init__(self, clock: TerneoClock, rate: float, burst: float) -> None:
+        """Initialize a full bucket."""
+        self._clock = clock
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = clock.monotonic()
+
+    @property
+    def tokens(self) -> float:
+        """Return the tokens currently available."""
+        now = self._clock.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        return self._tokens
+
+    def take(self, reserve: float = 0.0) -> bool:
+        """Take a token if more than reserve tokens would remain available."""
+        if self.tokens < reserve + 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def delay(self) -> float:
+        """Return seconds until a token is available."""
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+
+class TerneoIngestBudget:
+    """Delivery budget shared by every device, shedding low priority keys first."""
+
+    def __init__(self, clock: TerneoClock) -> None:
+        """Initialize the budget."""
+        self._bucket = TerneoTokenBucket(clock, GLOBAL_RATE, GLOBAL_BURST)
+
+    def admit(self, priority: int) -> bool:
+        """Return whether a message of the given priority may be delivered."""
+        if priority == PRIORITY_CONTROL:
+            self._bucket.take()
+            return True
+        if priority == PRIORITY_LOW:
+            return self._bucket.take(GLOBAL_BURST * LOW_PRIORITY_RESERVE)
+        return self._bucket.take()
+
+
+class TerneoIngestLimiter:
+    """Per-device token bucket that coalesces telemetry while over its rate.
+
+    While the device is within its rate, messages are delivered immediately.
+    Once it runs out of tokens only the latest value per key is kept and the
+    backlog is flushed at the device rate, control keys first. Messages
+    that the shared budget refuses are shed and reported to on_shed.
+    """
+
+    def __init__(
+        self,
+        clock: TerneoClock,
+        deliver: Callable[[str, Any], None],
+        on_change: Callable[[], None],
+        budget: TerneoIngestBudget | None = None,
+        on_shed: Callable[[str], None] | None = None,
+        *,
+        scheduler: TerneoSchedulerScope | None = None,
+    ) -> None:
+        """Initialize the limiter."""
+        self._clock = clock
+        self._deliver = deliver
+        self._on_change = on_change
+        self._on_shed = on_shed
+        self._budget = budget if budget is not None else TerneoIngestBudget(clock)
+        self._bucket = TerneoTokenBucket(clock, DEVICE_RATE, DEVICE_BURST)
+        self._scheduler = (
+            scheduler if scheduler is not None else TerneoScheduler(clock).scope()
+        )
+        self._backlog: dict[str, Any] = {}
+        self.received = 0
+        self.coalesced = 0
+        self.shed = 0
+
+    @property
+    def backlog(self) -> int:
+        """Return the number of keys waiting to be flushed."""
+        return len(self._backlog)
+
+    def submit(self, key: str, value: Any) -> None:
+        """Deliver a telemetry value now, later or not at all."""
+        self.received += 1
+        if key in self._backlog or not self._bucket.take():
+            if key in self._backlog:
+                self.coalesced += 1
+            self._backlog[key] = value
+            if "flush" not in self._scheduler:
+                self._scheduler.schedule("flush", self._bucket.delay(), self._flush)
+            self._stats_changed()
+            return
+        self._offer(key, value)
+
+    def shutdown(self) -> None:
+        """Drop the backlog and stop flushing."""
+        self._scheduler.cancel_all()
+        self._backlog.clear()
+
+    def _offer(self, key: str, value: Any) -> None:
+        """Deliver a value unless the shared budget sheds it."""
+        if self._budget.admit(KEY_PRIORITIES.get(key, PRIORITY_NORMAL)):
+            self._deliver(key, value)
+            return
+        self.shed += 1
+        _LOGGER.debug("Shedding %s=%s under inbound overload", key, value)
+        if self._on_shed is not None:
+            self._on_shed(key)
+        self._stats_changed()
+
+    def _flush(self) -> None:
+        """Deliver backlogged values, most important first, while tokens last."""
+        for key in sorted(
+            self._backlog, key=lambda k: KEY_PRIORITIES.get(k, PRIORITY_NORMAL)
+        ):
+            if not self._bucket.take():
+                break
+            self._offer(key, self._backlog.pop(key))
+        if self._backlog:
+            self._scheduler.schedule("flush", self._bucket.delay(), self._flush)
+
+    def _stats_changed(self) -> None:
+        """Notify listeners of changed metrics at most every STATS_INTERVAL."""
+        if "stats" not in self._scheduler:
+            self._scheduler.schedule("stats", STATS_INTERVAL, self._on_change)
+
+
+def get_ingest_budget(hass: HomeAssistant) -> TerneoIngestBudget:
+    """Return the budget shared by all coordinators, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (budget := domain_data.get(DATA_INGEST)) is None:
+        budget = domain_data[DATA_INGEST] = TerneoIngestBudget(get_clock(hass))
+    return budget
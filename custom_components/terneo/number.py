@@ -11,6 +11,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from .base_entity import TerneoMQTTEntity
 from .const import DOMAIN
 from .coordinator import TerneoCoordinator
+from .helpers import async_setup_device_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,20 +22,16 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the TerneoMQ number entities."""
-    devices = config_entry.data.get("devices", [])
     model = config_entry.options.get("model", config_entry.data.get("model", "AX"))
 
-    entities = []
-    for device in devices:
-        client_id = device["client_id"]
-        coordinator = hass.data[DOMAIN][config_entry.entry_id][client_id]
-        entities.append(
+    def create_entities(coordinator: TerneoCoordinator) -> list[TerneoNumber]:
+        return [
             TerneoNumber(
                 hass, coordinator, "brightness", "Brightness", 0, 9, 1, "bright", model
             )
-        )
+        ]
 
-    async_add_entities(entities)
+    async_setup_device_entities(hass, config_entry, async_add_entities, create_entities)
 
 
 class TerneoNumber(TerneoMQTTEntity, NumberEntity):
@@ -106,10 +103,7 @@ class TerneoNumber(TerneoMQTTEntity, NumberEntity):
 
     async def async_set_native_value(self, value: float) -> None:
         """Set the value of the entity."""
-        payload = str(int(value))
-        await self.publish_command(self._topic_suffix, payload)
-        self._attr_native_value = value
-        self.async_write_ha_state()
+        await self.publish_optimistic(str(int(value)))
 
     def parse_value(self, payload: str) -> int:
         """Parse MQTT payload for number."""
@@ -0,0 +1,215 @@
+"""Outbound command rate limiting for TerneoMQ integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .clock import get_clock
+from .const import DATA_OUTBOUND, DOMAIN, SIGNAL_OUTBOUND_STATS
+from .ingest import TerneoTokenBucket
+from .scheduler import TerneoScheduler, TerneoSchedulerScope, get_scheduler
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .clock import TerneoClock
+
+_LOGGER = logging.getLogger(__name__)
+
+# Lower numbers are published first
+PRIORITY_INTERACTIVE = 0  # user actions on entities
+PRIORITY_AUTOMATION = 1  # service calls such as bulk commands
+PRIORITY_BACKGROUND = 2  # housekeeping such as resetting devices on start
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_AUTOMATION, PRIORITY_BACKGROUND)
+
+PUBLISH_RATE = 20.0  # publishes per second across all devices
+PUBLISH_BURST = 40.0
+MIN_RELEASE_DELAY = 0.001  # seconds, so rounding never spins the release timer
+WAIT_SMOOTHING = 0.2
+STATS_INTERVAL = 10.0  # seconds between metric notifications
+
+
+class TerneoPublishStats:
+    """Outbound metrics of one device."""
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.queued = 0
+        self.published = 0
+        self.delayed = 0
+        self.average_wait: float | None = None
+        self.max_wait = 0.0
+
+    def record(self, wait: float) -> None:
+        """Account for a publish that waited wait seconds for its turn."""
+        self.published += 1
+        if wait > 0:
+            self.delayed += 1
+        self.max_wait = max(self.max_wait, wait)
+        self.average_wait = (
+            wait
+            if self.average_wait is None
+            else self.average_wait + WAIT_SMOOTHING * (wait - self.average_wait)
+        )
+
+
+class TerneoPublishGovernor:
+    """Publish budget shared by every device, by priority and then by device.
+
+    Publishes go out immediately while the token bucket has tokens and
+    nothing of the same or a higher priority is waiting. Otherwise they
+    queue per priority class and per device; queued publishes are released
+    at the bucket rate, highest class first and round-robin over the
+    devices within a class, so one device's backlog cannot hold up others.
+    """
+
+    def __init__(
+        self,
+        clock: TerneoClock,
+        on_change: Callable[[], None] | None = None,
+        scheduler: TerneoSchedulerScope | None = None,
+    ) -> None:
+        """Initialize the governor."""
+        self._clock = clock
+        self._on_change = on_change
+        self._bucket = TerneoTokenBucket(clock, PUBLISH_RATE, PUBLISH_BURST)
+        self._scheduler = (
+            scheduler if scheduler is not None else TerneoScheduler(clock).scope()
+        )
+        # priority -> client id in round-robin order -> (enqueued at, waiter)
+        self._queues: dict[int, dict[str, deque[tuple[float, asyncio.Future]]]] = {
+            priority: {} for priority in PRIORITIES
+        }
+        self.stats: dict[str, TerneoPublishStats] = {}
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of publishes waiting across all devices."""
+        return sum(self.depth(priority) for priority in PRIORITIES)
+
+    def depth(self, priority: int) -> int:
+        """Return the number of publishes waiting in a priority class."""
+        return sum(len(waiters) for waiters in self._queues[priority].values())
+
+    def device_stats(self, client_id: str) -> TerneoPublishStats:
+        """Return the outbound metrics of a device."""
+        if (stats := self.stats.get(client_id)) is None:
+            stats = self.stats[client_id] = TerneoPublishStats()
+        return stats
+
+    async def async_acquire(self, client_id: str, priority: int) -> None:
+        """Wait until a device may publish at the given priority."""
+        stats = self.device_stats(client_id)
+        if (
+            not any(self._queues[ahead] for ahead in PRIORITIES[: priority + 1])
+            and self._bucket.take()
+        ):
+            stats.record(0.0)
+            return
+        waiter: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._queues[priority].setdefault(client_id, deque()).append(
+            (self._clock.monotonic(), waiter)
+        )
+        stats.queued += 1
+        self._schedule_release()
+        self._stats_changed()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # Cancelled while queued, so it no longer holds a place
+            self._discard(priority, client_id, waiter)
+            raise
+        finally:
+            stats.queued -= 1
+
+    def discard(self, client_id: str) -> None:
+        """Drop the queued publishes of a device that is being released."""
+        for queue in self._queues.values():
+            for _, waiter in queue.pop(client_id, ()):
+                _drop(waiter, client_id)
+        self._stats_changed()
+
+    def shutdown(self) -> None:
+        """Drop every queued publish and stop releasing."""
+        self._scheduler.cancel_all()
+        for queue in self._queues.values():
+            for client_id, waiters in queue.items():
+                for _, waiter in waiters:
+                    _drop(waiter, client_id)
+            queue.clear()
+
+    def _discard(self, priority: int, client_id: str, waiter: asyncio.Future) -> None:
+        """Remove a cancelled publish from its queue."""
+        waiters = self._queues[priority].get(client_id)
+        if waiters is None:
+            return
+        for entry in waiters:
+            if entry[1] is waiter:
+                waiters.remove(entry)
+                break
+        if not waiters:
+            del self._queues[priority][client_id]
+
+    def _schedule_release(self) -> None:
+        """Release queued publishes once the bucket has a token."""
+        if "release" not in self._scheduler:
+            self._scheduler.schedule(
+                "release",
+                max(self._bucket.delay(), MIN_RELEASE_DELAY),
+                self._release,
+            )
+
+    def _release(self) -> None:
+        """Release queued publishes in priority and round-robin order."""
+        for priority in PRIORITIES:
+            queue = self._queues[priority]
+            while queue and self._bucket.take():
+                client_id = next(iter(queue))
+                waiters = queue.pop(client_id)
+                enqueued, waiter = waiters.popleft()
+                if waiters:
+                    # Back of the line, after the other devices of the class
+                    queue[client_id] = waiters
+                if waiter.done():
+                    continue
+                self.device_stats(client_id).record(self._clock.monotonic() - enqueued)
+                waiter.set_result(None)
+            if queue:
+                break
+        if self.queue_depth:
+            self._schedule_release()
+        else:
+            _LOGGER.debug("Outbound queue drained")
+        self._stats_changed()
+
+    def _stats_changed(self) -> None:
+        """Notify listeners of changed metrics at most every STATS_INTERVAL."""
+        if self._on_change is not None and "stats" not in self._scheduler:
+            self._scheduler.schedule("stats", STATS_INTERVAL, self._on_change)
+
+
+def _drop(waiter: asyncio.Future, client_id: str) -> None:
+    """Fail a queued publish so its caller does not send it."""
+    if not waiter.done():
+        waiter.set_exception(
+            HomeAssistantError(f"Publish to {client_id} dropped, device released")
+        )
+
+
+def get_publish_governor(hass: HomeAssistant) -> TerneoPublishGovernor:
+    """Return the governor shared by all coordinators, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (governor := domain_data.get(DATA_OUTBOUND)) is None:
+        governor = domain_data[DATA_OUTBOUND] = TerneoPublishGovernor(
+            get_clock(hass),
+            lambda: async_dispatcher_send(hass, SIGNAL_OUTBOUND_STATS),
+            get_scheduler(hass).scope(),
+        )
+    return governor
@@ -0,0 +1,127 @@
+"""Daily rollups of telemetry for TerneoMQ integration."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_change
+
+from .const import SIGNAL_ROLLUP
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from datetime import datetime
+
+    from .coordinator import TerneoCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TerneoRollupTotals(NamedTuple):
+    """Heating time and floor temperature range of one period."""
+
+    heating_hours: float
+    floor_min: float | None
+    floor_max: float | None
+
+    def as_dict(self, rated_power_w: int = 0) -> dict[str, Any]:
+        """Return the totals with the energy used at the given rated power."""
+        return {
+            "heating_hours": round(self.heating_hours, 3),
+            "energy_kwh": (
+                round(self.heating_hours * rated_power_w / 1000, 3)
+                if rated_power_w > 0
+                else None
+            ),
+            "floor_min": self.floor_min,
+            "floor_max": self.floor_max,
+        }
+
+
+class TerneoRollup:
+    """Accumulators of one device over a period such as a day or an hour."""
+
+    def __init__(self) -> None:
+        """Initialize empty accumulators."""
+        self._heating_seconds = 0.0
+        self._on_since: float | None = None
+        self._floor_min: float | None = None
+        self._floor_max: float | None = None
+        self.yesterday: TerneoRollupTotals | None = None
+
+    def add(self, now: float, key: str, value: Any) -> None:
+        """Account for a telemetry value received at now."""
+        if key == "load":
+            if value and self._on_since is None:
+                self._on_since = now
+            elif not value and self._on_since is not None:
+                self._heating_seconds += now - self._on_since
+                self._on_since = None
+        elif key == "floorTemp":
+            if self._floor_min is None or value < self._floor_min:
+                self._floor_min = value
+            if self._floor_max is None or value > self._floor_max:
+                self._floor_max = value
+
+    def today(self, now: float) -> TerneoRollupTotals:
+        """Return the totals of the current period so far."""
+        heating_seconds = self._heating_seconds
+        if self._on_since is not None:
+            heating_seconds += now - self._on_since
+        return TerneoRollupTotals(
+            heating_seconds / 3600, self._floor_min, self._floor_max
+        )
+
+    def roll_over(
+        self, now: float, floor_temp: float | None = None
+    ) -> TerneoRollupTotals:
+        """Close the current period and start the next one at floor_temp."""
+        self.yesterday = self.today(now)
+        self._heating_seconds = 0.0
+        if self._on_since is not None:
+            self._on_since = now
+        self._floor_min = self._floor_max = floor_temp
+        return self.yesterday
+
+
+class TerneoRollupEngine:
+    """Roll every device over at local midnight from a single callback."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinators: Callable[[], Iterable[TerneoCoordinator]],
+    ) -> None:
+        """Initialize the engine."""
+        self.hass = hass
+        self._coordinators = coordinators
+        self._cancel: CALLBACK_TYPE | None = None
+
+    def start(self) -> None:
+        """Roll over every day at local midnight."""
+        if self._cancel is None:
+            self._cancel = async_track_time_change(
+                self.hass, self._roll_over, hour=0, minute=0, second=0
+            )
+
+    def stop(self) -> None:
+        """Stop rolling over."""
+        if self._cancel is not None:
+            self._cancel()
+            self._cancel = None
+
+    @callback
+    def _roll_over(self, _now: datetime) -> None:
+        """Close the day of every device and notify its sensors."""
+        coordinators = list(self._coordinators())
+        for coordinator in coordinators:
+            coordinator.rollup.roll_over(
+                coordinator.clock.monotonic(), coordinator.get_value("floorTemp")
+            )
+            async_dispatcher_send(
+                self.hass, SIGNAL_ROLLUP.format(coordinator.client_id)
+            )
+        _LOGGER.debug("Rolled over daily totals of %d devices", len(coordinators))
@@ -0,0 +1,54 @@
+"""Per-entry runtime state for TerneoMQ integration."""
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity import Entity
+
+from .archive import TerneoArchive
+from .clock import TerneoClock
+from .const import DATA_RUNTIME, DOMAIN
+from .coordinator import TerneoCoordinator
+from .discovery import TerneoDiscovery
+from .scheduler import TerneoScheduler, TerneoSchedulerScope
+from .statistics import TerneoStatisticsImporter
+
+
+class TerneoEntryRuntime:
+    """State of a loaded config entry that is not tied to a single device."""
+
+    def __init__(
+        self, settings: dict[str, Any], scheduler: TerneoSchedulerScope
+    ) -> None:
+        """Initialize the runtime state."""
+        self.settings = settings
+        self.scheduler = scheduler
+        self.discovery: TerneoDiscovery | None = None
+        self.statistics: TerneoStatisticsImporter | None = None
+        self.archive: TerneoArchive | None = None
+        # Devices this entry uses whose entities belong to another entry
+        self.standby: dict[str, TerneoCoordinator] = {}
+
+
+def get_entry_runtime(hass: HomeAssistant, entry_id: str) -> TerneoEntryRuntime:
+    """Return the runtime state of a loaded config entry."""
+    return hass.data[DOMAIN][DATA_RUNTIME][entry_id]
+
+
+def get_entity_scheduler(entity: Entity, clock: TerneoClock) -> TerneoSchedulerScope:
+    """Return the scheduler of the entry that owns an entity.
+
+    Entities that are not attached to a loaded entry, as in tests and
+    simulations, have no entry to cancel their deadlines on unload and get
+    a private scheduler on the given clock.
+    """
+    platform = entity.platform
+    if platform is not None and platform.config_entry is not None:
+        runtime = (
+            entity.hass.data.get(DOMAIN, {})
+            .get(DATA_RUNTIME, {})
+            .get(platform.config_entry.entry_id)
+        )
+        if runtime is not None:
+            return runtime.scheduler
+    return TerneoScheduler(clock).scope()
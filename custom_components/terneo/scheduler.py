@@ -0,0 +1,191 @@
+"""Deadline scheduler for delayed work in TerneoMQ integration."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+
+from .clock import get_clock
+from .const import DATA_SCHEDULER, DOMAIN
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+    from .clock import TerneoClock
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TerneoScheduler:
+    """Keyed deadlines multiplexed onto a single clock timer.
+
+    Scheduling a key again replaces its deadline. Moving a deadline later
+    does not touch the underlying timer, so repeated rescheduling (for
+    example while a slider is dragged) costs a heap push and nothing else.
+    """
+
+    def __init__(self, clock: TerneoClock) -> None:
+        """Initialize the scheduler."""
+        self._clock = clock
+        self._deadlines: dict[Hashable, tuple[float, int, Callable[[], None]]] = {}
+        self._heap: list[tuple[float, int, Hashable]] = []
+        self._tokens = itertools.count()
+        self._cancel_wakeup: CALLBACK_TYPE | None = None
+        self._wakeup_at: float | None = None
+
+    def __len__(self) -> int:
+        """Return the number of pending deadlines."""
+        return len(self._deadlines)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Return whether key has a pending deadline."""
+        return key in self._deadlines
+
+    def schedule(
+        self, key: Hashable, delay: float, action: Callable[[], None]
+    ) -> CALLBACK_TYPE:
+        """Run action after delay seconds, replacing any deadline for key."""
+        when = self._clock.monotonic() + delay
+        token = next(self._tokens)
+        self._deadlines[key] = (when, token, action)
+        heapq.heappush(self._heap, (when, token, key))
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._compact()
+        self._arm()
+
+        def _cancel() -> None:
+            entry = self._deadlines.get(key)
+            if entry is not None and entry[1] == token:
+                del self._deadlines[key]
+
+        return _cancel
+
+    def schedule_interval(
+        self, key: Hashable, interval: float, action: Callable[[], None]
+    ) -> CALLBACK_TYPE:
+        """Run action every interval seconds until key is cancelled."""
+
+        def _run() -> None:
+            self.schedule(key, interval, _run)
+            action()
+
+        self.schedule(key, interval, _run)
+        return lambda: self.cancel(key)
+
+    def cancel(self, key: Hashable) -> None:
+        """Drop the deadline for key, if any."""
+        self._deadlines.pop(key, None)
+
+    def scope(self) -> TerneoSchedulerScope:
+        """Return a view for one owner that shares this scheduler's timer."""
+        return TerneoSchedulerScope(self)
+
+    def cancel_all(self) -> None:
+        """Drop every deadline and the pending timer."""
+        self._deadlines.clear()
+        self._heap.clear()
+        if self._cancel_wakeup is not None:
+            self._cancel_wakeup()
+        self._cancel_wakeup = None
+        self._wakeup_at = None
+
+    def _compact(self) -> None:
+        """Rebuild the heap without superseded entries."""
+        self._heap = [
+            (when, token, key) for key, (when, token, _) in self._deadlines.items()
+        ]
+        heapq.heapify(self._heap)
+
+    def _arm(self) -> None:
+        """Make sure the clock timer fires at the earliest deadline."""
+        if not self._heap:
+            return
+        earliest = self._heap[0][0]
+        if self._wakeup_at is not None and self._wakeup_at <= earliest:
+            return
+        if self._cancel_wakeup is not None:
+            self._cancel_wakeup()
+        self._wakeup_at = earliest
+        self._cancel_wakeup = self._clock.call_later(
+            max(earliest - self._clock.monotonic(), 0.0), self._run_due
+        )
+
+    def _run_due(self) -> None:
+        """Run every action whose deadline has passed."""
+        self._cancel_wakeup = None
+        self._wakeup_at = None
+        now = self._clock.monotonic()
+        due: list[Callable[[], None]] = []
+        while self._heap and self._heap[0][0] <= now:
+            _, token, key = heapq.heappop(self._heap)
+            entry = self._deadlines.get(key)
+            if entry is None or entry[1] != token:
+                continue
+            del self._deadlines[key]
+            due.append(entry[2])
+        # Skip superseded entries so the next wakeup is not premature
+        while self._heap and (
+            (entry := self._deadlines.get(self._heap[0][2])) is None
+            or entry[1] != self._heap[0][1]
+        ):
+            heapq.heappop(self._heap)
+        self._arm()
+        for action in due:
+            try:
+                action()
+            except Exception:
+                _LOGGER.exception("Error running scheduled action %s", action)
+
+
+class TerneoSchedulerScope:
+    """Deadlines of one owner on a shared scheduler.
+
+    Keys are private to the scope, so owners cannot replace each other's
+    deadlines, and cancel_all drops only the deadlines of this scope.
+    """
+
+    def __init__(self, scheduler: TerneoScheduler) -> None:
+        """Initialize the scope."""
+        self._scheduler = scheduler
+        self._keys: set[Hashable] = set()
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Return whether key has a pending deadline."""
+        return (self, key) in self._scheduler
+
+    def schedule(
+        self, key: Hashable, delay: float, action: Callable[[], None]
+    ) -> CALLBACK_TYPE:
+        """Run action after delay seconds, replacing any deadline for key."""
+        self._keys.add(key)
+        return self._scheduler.schedule((self, key), delay, action)
+
+    def schedule_interval(
+        self, key: Hashable, interval: float, action: Callable[[], None]
+    ) -> CALLBACK_TYPE:
+        """Run action every interval seconds until key is cancelled."""
+        self._keys.add(key)
+        return self._scheduler.schedule_interval((self, key), interval, action)
+
+    def cancel(self, key: Hashable) -> None:
+        """Drop the deadline for key, if any."""
+        self._keys.discard(key)
+        self._scheduler.cancel((self, key))
+
+    def cancel_all(self) -> None:
+        """Drop every deadline of this scope."""
+        for key in self._keys:
+            self._scheduler.cancel((self, key))
+        self._keys.clear()
+
+
+def get_scheduler(hass: HomeAssistant) -> TerneoScheduler:
+    """Return the scheduler shared by the integration, creating it on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (scheduler := domain_data.get(DATA_SCHEDULER)) is None:
+        scheduler = domain_data[DATA_SCHEDULER] = TerneoScheduler(get_clock(hass))
+    return scheduler
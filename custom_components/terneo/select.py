@@ -9,8 +9,9 @@ from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .base_entity import TerneoMQTTEntity
-from .const import DOMAIN
+from .const import DOMAIN, MODE_PAYLOADS
 from .coordinator import TerneoCoordinator
+from .helpers import async_setup_device_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,14 +22,10 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the TerneoMQ select entities."""
-    devices = config_entry.data.get("devices", [])
     model = config_entry.options.get("model", config_entry.data.get("model", "AX"))
 
-    entities = []
-    for device in devices:
-        client_id = device["client_id"]
-        coordinator = hass.data[DOMAIN][config_entry.entry_id][client_id]
-        entities.append(
+    def create_entities(coordinator: TerneoCoordinator) -> list[TerneoSelect]:
+        return [
             TerneoSelect(
                 hass,
                 coordinator,
@@ -38,9 +35,9 @@ async def async_setup_entry(
                 "mode",
                 model,
             )
-        )
+        ]
 
-    async_add_entities(entities)
+    async_setup_device_entities(hass, config_entry, async_add_entities, create_entities)
 
 
 class TerneoSelect(TerneoMQTTEntity, SelectEntity):
@@ -86,12 +83,8 @@ class TerneoSelect(TerneoMQTTEntity, SelectEntity):
 
     async def async_select_option(self, option: str) -> None:
         """Set the option of the entity."""
-        # Map option to payload: schedule -> 0, manual -> 1, away -> 4, temporary -> 5
-        payload_map = {"schedule": "0", "manual": "1", "away": "4", "temporary": "5"}
-        payload = payload_map.get(option, "0")
-        await self.publish_command(self._topic_suffix, payload, retain=False)
-        self._attr_current_option = option
-        self.async_write_ha_state()
+        payload = MODE_PAYLOADS.get(option, "0")
+        await self.publish_optimistic(payload)
 
     def parse_value(self, payload: str) -> str:
         """Parse MQTT payload for select."""
@@ -1,6 +1,5 @@
 """Sensor platform for TerneoMQ integration."""
 
-import time
 from typing import Any
 
 from homeassistant.components.sensor import (
@@ -9,16 +8,46 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.const import (
+    PERCENTAGE,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+    EntityCategory,
+    UnitOfEnergy,
+    UnitOfPower,
+    UnitOfTime,
+)
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.restore_state import RestoreEntity
 
 from .base_entity import TerneoMQTTEntity
-from .const import DOMAIN
+from .const import (
+    DOMAIN,
+    RECORDING_ENERGY,
+    RECORDING_TEMPERATURE,
+    SIGNAL_AGGREGATES,
+    SIGNAL_COMMAND_STATS,
+    SIGNAL_DUTY_CYCLE,
+    SIGNAL_FLEET,
+    SIGNAL_INGEST_STATS,
+    SIGNAL_OPTIONS_UPDATED,
+    SIGNAL_OUTBOUND_STATS,
+    SIGNAL_ROLLUP,
+    SIGNAL_SNAPSHOT,
+    SIGNAL_THERMAL,
+)
 from .coordinator import TerneoCoordinator
+from .fleet import TerneoFleetAggregate
+from .helpers import async_setup_device_entities, get_entry_settings
+from .outbound import (
+    PRIORITY_AUTOMATION,
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+)
 
 
 async def async_setup_entry(
@@ -27,64 +56,216 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the TerneoMQ sensor platform."""
-    devices = config_entry.data.get("devices", [])
     rated_power_w = config_entry.options.get(
         "rated_power_w", config_entry.data.get("rated_power_w", 0)
     )
     model = config_entry.options.get("model", config_entry.data.get("model", "AX"))
-    entities = []
-    for device in devices:
-        client_id = device["client_id"]
-        coordinator = hass.data[DOMAIN][config_entry.entry_id][client_id]
-        entities.extend(
-            [
-                TerneoSensor(
-                    hass=hass,
-                    coordinator=coordinator,
-                    sensor_type="floorTemp",
-                    name="Floor Temperature",
-                    device_class=SensorDeviceClass.TEMPERATURE,
-                    state_class=SensorStateClass.MEASUREMENT,
-                    unit_of_measurement="°C",
-                    model=model,
-                ),
-                TerneoSensor(
-                    hass=hass,
-                    coordinator=coordinator,
-                    sensor_type="protTemp",
-                    name="Protection Temperature",
-                    device_class=SensorDeviceClass.TEMPERATURE,
-                    state_class=SensorStateClass.MEASUREMENT,
-                    unit_of_measurement="°C",
-                    model=model,
-                ),
-                TerneoStateSensor(
+    settings = get_entry_settings(config_entry)
+    reduced_recording = settings["reduced_recording"]
+    # Rounded temperatures change less often and so write fewer recorder rows
+    temperature_precision = 1 if RECORDING_TEMPERATURE in reduced_recording else None
+    energy_precision = 3 if RECORDING_ENERGY in reduced_recording else 6
+    coordinators = hass.data[DOMAIN][config_entry.entry_id]
+    energy_entities: dict[str, list[EnergyEntity]] = {}
+    air_window_entities: dict[str, list[TerneoWindowSensor]] = {}
+    fleet = (
+        TerneoFleetAggregate(hass, config_entry.entry_id, rated_power_w)
+        if settings["fleet_sensors"]
+        else None
+    )
+
+    def create_energy_entities(coordinator: TerneoCoordinator) -> list[EnergyEntity]:
+        entities: list[EnergyEntity] = [
+            TerneoPowerSensor(
+                hass=hass,
+                coordinator=coordinator,
+                rated_power_w=rated_power_w,
+                model=model,
+            ),
+        ]
+        if settings["energy_sensor"]:
+            entities.append(
+                TerneoEnergySensor(
                     hass=hass,
                     coordinator=coordinator,
+                    rated_power_w=rated_power_w,
                     model=model,
-                ),
-            ]
+                    precision=energy_precision,
+                )
+            )
+        if settings["daily_rollups"]:
+            entities.append(
+                TerneoRollupSensor(
+                    hass, coordinator, "energy_kwh", rated_power_w, model=model
+                )
+            )
+        energy_entities[coordinator.client_id] = entities
+        return entities
+
+    def create_window_entities(
+        coordinator: TerneoCoordinator, key: str
+    ) -> list[TerneoWindowSensor]:
+        entities = [
+            TerneoWindowSensor(
+                hass, coordinator, key, minutes * 60, statistic, model=model
+            )
+            for minutes in settings["aggregate_windows"]
+            for statistic in WINDOW_STATISTICS
+        ]
+        if key == "airTemp":
+            air_window_entities[coordinator.client_id] = entities
+        return entities
+
+    def create_entities(coordinator: TerneoCoordinator) -> list[SensorEntity]:
+        entities: list[SensorEntity] = [
+            TerneoSensor(
+                hass=hass,
+                coordinator=coordinator,
+                sensor_type="floorTemp",
+                name="Floor Temperature",
+                device_class=SensorDeviceClass.TEMPERATURE,
+                state_class=SensorStateClass.MEASUREMENT,
+                unit_of_measurement="°C",
+                model=model,
+                precision=temperature_precision,
+            ),
+            TerneoSensor(
+                hass=hass,
+                coordinator=coordinator,
+                sensor_type="protTemp",
+                name="Protection Temperature",
+                device_class=SensorDeviceClass.TEMPERATURE,
+                state_class=SensorStateClass.MEASUREMENT,
+                unit_of_measurement="°C",
+                model=model,
+                precision=temperature_precision,
+            ),
+            TerneoStateSensor(
+                hass=hass,
+                coordinator=coordinator,
+                model=model,
+            ),
+            TerneoCommandLatencySensor(
+                hass=hass,
+                coordinator=coordinator,
+                model=model,
+            ),
+            TerneoIngestSensor(
+                hass=hass,
+                coordinator=coordinator,
+                model=model,
+            ),
+            TerneoOutboundSensor(
+                hass=hass,
+                coordinator=coordinator,
+                model=model,
+            ),
+        ]
+        entities.extend(create_window_entities(coordinator, "floorTemp"))
+        if coordinator.supports_air_temp:
+            entities.extend(create_window_entities(coordinator, "airTemp"))
+        entities.extend(
+            TerneoDutyCycleSensor(hass, coordinator, minutes * 60, model=model)
+            for minutes in settings["duty_cycle_windows"]
         )
+        entities.extend(
+            TerneoThermalSensor(hass, coordinator, field, model=model)
+            for field in THERMAL_SENSORS
+        )
+        if settings["daily_rollups"]:
+            entities.extend(
+                TerneoRollupSensor(hass, coordinator, field, model=model)
+                for field in ROLLUP_SENSORS
+                if field != "energy_kwh"
+            )
         # Add energy sensors if rated power is configured
         if rated_power_w > 0:
-            entities.extend(
-                [
-                    TerneoPowerSensor(
-                        hass=hass,
-                        coordinator=coordinator,
-                        rated_power_w=rated_power_w,
-                        model=model,
-                    ),
-                    TerneoEnergySensor(
-                        hass=hass,
-                        coordinator=coordinator,
-                        rated_power_w=rated_power_w,
-                        model=model,
-                    ),
-                ]
+            entities.extend(create_energy_entities(coordinator))
+        if fleet is not None:
+            fleet.add_device(coordinator)
+        return entities
+
+    def device_removed(client_id: str) -> None:
+        energy_entities.pop(client_id, None)
+        air_window_entities.pop(client_id, None)
+        if fleet is not None:
+            fleet.remove_device(client_id)
+
+    async_setup_device_entities(
+        hass, config_entry, async_add_entities, create_entities, device_removed
+    )
+    if fleet is not None:
+        config_entry.async_on_unload(fleet.shutdown)
+        config_entry.async_on_unload(
+            async_dispatcher_connect(
+                hass,
+                SIGNAL_OPTIONS_UPDATED.format(config_entry.entry_id),
+                fleet.async_options_updated,
             )
-    if entities:
-        async_add_entities(entities)
+        )
+        async_add_entities(
+            [TerneoFleetSensor(hass, fleet, field) for field in FLEET_SENSORS]
+        )
+
+    @callback
+    def _async_remove_entities(entities: list[SensorEntity]) -> None:
+        """Remove entities along with their registry entries."""
+        entity_registry = er.async_get(hass)
+        for entity in entities:
+            if entity.entity_id and entity_registry.async_get(entity.entity_id):
+                entity_registry.async_remove(entity.entity_id)
+            else:
+                hass.async_create_task(entity.async_remove())
+
+    @callback
+    def _async_options_updated(changes: dict[str, Any]) -> None:
+        """Add, remove or retune sensors that depend on changed options."""
+        if "rated_power_w" in changes:
+            _async_rated_power_updated(changes["rated_power_w"])
+        if "supports_air_temp" in changes:
+            _async_air_temp_updated()
+
+    @callback
+    def _async_air_temp_updated() -> None:
+        """Add or remove airTemp window sensors to match the devices."""
+        new_entities: list[SensorEntity] = []
+        for client_id, coordinator in coordinators.items():
+            # A device shared with another entry keeps that entry's setting
+            if coordinator.supports_air_temp and client_id not in air_window_entities:
+                new_entities.extend(create_window_entities(coordinator, "airTemp"))
+            elif not coordinator.supports_air_temp and client_id in air_window_entities:
+                _async_remove_entities(air_window_entities.pop(client_id))
+        if new_entities:
+            async_add_entities(new_entities)
+
+    @callback
+    def _async_rated_power_updated(new_rated_power_w: int) -> None:
+        """Add, remove or retune energy sensors when rated power changes."""
+        nonlocal rated_power_w
+        old_rated_power_w = rated_power_w
+        rated_power_w = new_rated_power_w
+        if rated_power_w > 0 and old_rated_power_w > 0:
+            for entities in energy_entities.values():
+                for entity in entities:
+                    entity.set_rated_power(rated_power_w)
+        elif rated_power_w > 0:
+            new_entities: list[SensorEntity] = []
+            for coordinator in coordinators.values():
+                new_entities.extend(create_energy_entities(coordinator))
+            if new_entities:
+                async_add_entities(new_entities)
+        else:
+            for entities in energy_entities.values():
+                _async_remove_entities(entities)
+            energy_entities.clear()
+
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_OPTIONS_UPDATED.format(config_entry.entry_id),
+            _async_options_updated,
+        )
+    )
 
 
 class TerneoSensor(TerneoMQTTEntity, SensorEntity):
@@ -100,6 +281,7 @@ class TerneoSensor(TerneoMQTTEntity, SensorEntity):
         state_class: SensorStateClass | None,
         unit_of_measurement: str | None,
         model: str = "AX",
+        precision: int | None = None,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(hass, coordinator, sensor_type, name, sensor_type, model)
@@ -108,6 +290,8 @@ class TerneoSensor(TerneoMQTTEntity, SensorEntity):
         self._attr_device_class = device_class
         self._attr_state_class = state_class
         self._attr_native_unit_of_measurement = unit_of_measurement
+        self._attr_suggested_display_precision = precision
+        self._precision = precision
         self._attr_native_value = coordinator.get_value(sensor_type)
 
         self._attr_device_info = DeviceInfo(
@@ -135,6 +319,8 @@ class TerneoSensor(TerneoMQTTEntity, SensorEntity):
 
     def update_value(self, value: float) -> None:
         """Update sensor value."""
+        if self._precision is not None:
+            value = round(value, self._precision)
         self._attr_native_value = value
 
 
@@ -167,11 +353,18 @@ class TerneoStateSensor(SensorEntity):
             f"{DOMAIN}_{self._client_id}_update",
             self._handle_coordinator_update,
         )
+        self._unsub_snapshot = async_dispatcher_connect(
+            self.hass,
+            SIGNAL_SNAPSHOT.format(self._client_id),
+            self._handle_snapshot,
+        )
 
     async def async_will_remove_from_hass(self) -> None:
         """Unsubscribe from dispatcher when entity is removed."""
         if self._unsub_dispatcher:
             self._unsub_dispatcher()
+        if self._unsub_snapshot:
+            self._unsub_snapshot()
 
     @callback
     def _handle_coordinator_update(self, key: str, value: Any) -> None:
@@ -180,6 +373,12 @@ class TerneoStateSensor(SensorEntity):
             self._update_mode()
             self.async_write_ha_state()
 
+    @callback
+    def _handle_snapshot(self) -> None:
+        """Write the state derived from the cache once after a retained burst."""
+        self._update_mode()
+        self.async_write_ha_state()
+
     def _update_mode(self) -> None:
         """Update mode value based on powerOff, load and mode."""
         power_off = self.coordinator.get_value("powerOff")
@@ -192,6 +391,565 @@ class TerneoStateSensor(SensorEntity):
             self._attr_native_value = "Idle"
 
 
+class TerneoCommandLatencySensor(SensorEntity):
+    """Diagnostic sensor for command round-trip time and retries."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: TerneoCoordinator, model: str = "AX"
+    ) -> None:
+        """Initialize the command latency sensor."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self._client_id = coordinator.client_id
+        self._model = model
+        self._attr_unique_id = f"{coordinator.client_id}_command_latency"
+        self._attr_name = f"Terneo {coordinator.client_id} Command Latency"
+        self._attr_native_value = None
+
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, self._client_id)},
+            manufacturer="Terneo",
+            model=self._model,
+            name=f"Terneo {self._client_id}",
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Listen to command delivery updates."""
+        self._unsub_dispatcher = async_dispatcher_connect(
+            self.hass,
+            SIGNAL_COMMAND_STATS.format(self._client_id),
+            self._handle_stats_update,
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Unsubscribe from dispatcher when entity is removed."""
+        if self._unsub_dispatcher:
+            self._unsub_dispatcher()
+
+    @callback
+    def _handle_stats_update(self) -> None:
+        """Handle changed command delivery metrics."""
+        last_rtt = self.coordinator.commands.last_rtt
+        self._attr_native_value = (
+            round(last_rtt * 1000) if last_rtt is not None else None
+        )
+        self.async_write_ha_state()
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return retry counters and the smoothed round-trip time."""
+        commands = self.coordinator.commands
+        return {
+            "average_rtt_ms": (
+                round(commands.average_rtt * 1000)
+                if commands.average_rtt is not None
+                else None
+            ),
+            "confirmed": commands.confirmed,
+            "retries": commands.retries,
+            "failures": commands.failures,
+            "pending": commands.pending,
+        }
+
+
+class TerneoIngestSensor(SensorEntity):
+    """Diagnostic sensor for telemetry shed under inbound overload."""
+
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: TerneoCoordinator, model: str = "AX"
+    ) -> None:
+        """Initialize the ingest sensor."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self._client_id = coordinator.client_id
+        self._model = model
+        self._attr_unique_id = f"{coordinator.client_id}_shed_messages"
+        self._attr_name = f"Terneo {coordinator.client_id} Shed Messages"
+        self._attr_native_value = coordinator.ingest.shed
+
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, self._client_id)},
+            manufacturer="Terneo",
+            model=self._model,
+            name=f"Terneo {self._client_id}",
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Listen to ingest metric updates."""
+        self._unsub_dispatcher = async_dispatcher_connect(
+            self.hass,
+            SIGNAL_INGEST_STATS.format(self._client_id),
+            self._handle_stats_update,
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Unsubscribe from dispatcher when entity is removed."""
+        if self._unsub_dispatcher:
+            self._unsub_dispatcher()
+
+    @callback
+    def _handle_stats_update(self) -> None:
+        """Handle changed ingest metrics."""
+        self._attr_native_value = self.coordinator.ingest.shed
+        self.async_write_ha_state()
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return message counters of the ingest limiter."""
+        ingest = self.coordinator.ingest
+        return {
+            "received": ingest.received,
+            "coalesced": ingest.coalesced,
+            "backlog": ingest.backlog,
+        }
+
+
+class TerneoOutboundSensor(SensorEntity):
+    """Diagnostic sensor for the time commands wait for the publish governor."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: TerneoCoordinator, model: str = "AX"
+    ) -> None:
+        """Initialize the outbound wait sensor."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self._client_id = coordinator.client_id
+        self._model = model
+        self._attr_unique_id = f"{coordinator.client_id}_command_wait"
+        self._attr_name = f"Terneo {coordinator.client_id} Command Wait"
+        self._attr_native_value = None
+
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, self._client_id)},
+            manufacturer="Terneo",
+            model=self._model,
+            name=f"Terneo {self._client_id}",
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Listen to outbound metric updates."""
+        self._unsub_dispatcher = async_dispatcher_connect(
+            self.hass, SIGNAL_OUTBOUND_STATS, self._handle_stats_update
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Unsubscribe from dispatcher when entity is removed."""
+        if self._unsub_dispatcher:
+            self._unsub_dispatcher()
+
+    @callback
+    def _handle_stats_update(self) -> None:
+        """Handle changed outbound metrics."""
+        governor = self.coordinator.publish_governor
+        average_wait = (
+            governor.device_stats(self._client_id).average_wait
+            if governor is not None
+            else None
+        )
+        self._attr_native_value = (
+            round(average_wait * 1000) if average_wait is not None else None
+        )
+        self.async_write_ha_state()
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the device's publish counters and the shared queue depths."""
+        governor = self.coordinator.publish_governor
+        if governor is None:
+            return {}
+        stats = governor.device_stats(self._client_id)
+        return {
+            "queued": stats.queued,
+            "published": stats.published,
+            "delayed": stats.delayed,
+            "max_wait_ms": round(stats.max_wait * 1000),
+            "queue_depth": governor.queue_depth,
+            "queue_depth_interactive": governor.depth(PRIORITY_INTERACTIVE),
+            "queue_depth_automation": governor.depth(PRIORITY_AUTOMATION),
+            "queue_depth_background": governor.depth(PRIORITY_BACKGROUND),
+        }
+
+
+WINDOW_STATISTICS = ("min", "max", "mean")
+WINDOW_KEY_NAMES = {"floorTemp": "Floor Temperature", "airTemp": "Air Temperature"}
+
+
+class TerneoWindowSensor(SensorEntity):
+    """Rolling min, max or mean of a temperature over a time window."""
+
+    _attr_device_class = SensorDeviceClass.TEMPERATURE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = "°C"
+    _attr_suggested_display_precision = 1
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: TerneoCoordinator,
+        key: str,
+        length: int,
+        statistic: str,
+        *,
+        model: str = "AX",
+    ) -> None:
+        """Initialize the window sensor."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self._client_id = coordinator.client_id
+        self._key = key
+        self._length = length
+        self._index = WINDOW_STATISTICS.index(statistic)
+        self._model = model
+        minutes = length // 60
+        self._attr_unique_id = f"{self._client_id}_{key}_{statistic}_{minutes}m"
+        self._attr_name = (
+            f"Terneo {self._client_id} {WINDOW_KEY_NAMES[key]} "
+            f"{statistic.capitalize()} {minutes} min"
+        )
+        self._attr_native_value = None
+
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, self._client_id)},
+            manufacturer="Terneo",
+            model=self._model,
+            name=f"Terneo {self._client_id}",
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Listen to aggregate updates of the coordinator."""
+        self._unsub_dispatcher = async_dispatcher_connect(
+            self.hass,
+            SIGNAL_AGGREGATES.format(self._client_id),
+            self._handle_aggregates,
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Unsubscribe from dispatcher when entity is removed."""
+        if self._unsub_dispatcher:
+            self._unsub_dispatcher()
+
+    @callback
+    def _handle_aggregates(self, length: int) -> None:
+        """Publish the aggregate when its window is due."""
+        if length != self._length:
+            return
+        window = self.coordinator.windows[self._key].get(length)
+        stats = (
+            window.stats(self.coordinator.clock.monotonic())
+            if window is not None
+            else None
+        )
+        self._attr_native_value = (
+            round(stats[self._index], 2) if stats is not None else None
+        )
+        self.async_write_ha_state()
+
+
+class TerneoDutyCycleSensor(SensorEntity):
+    """Share of a time window during which the heating load was on."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_suggested_display_precision = 1
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: TerneoCoordinator,
+        length: int,
+        *,
+        model: str = "AX",
+    ) -> None:
+        """Initialize the duty cycle sensor."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self._client_id = coordinator.client_id
+        self._length = length
+        self._model = model
+        minutes = length // 60
+        self._attr_unique_id = f"{self._client_id}_duty_cycle_{minutes}m"
+        self._attr_name = f"Terneo {self._client_id} Duty Cycle {minutes} min"
+        self._attr_native_value = None
+
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, self._client_id)},
+            manufacturer="Terneo",
+            model=self._model,
+            name=f"Terneo {self._client_id}",
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Listen to duty cycle updates of the coordinator."""
+        self._unsub_dispatcher = async_dispatcher_connect(
+            self.hass,
+            SIGNAL_DUTY_CYCLE.format(self._client_id),
+            self._handle_duty_cycle,
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Unsubscribe from dispatcher when entity is removed."""
+        if self._unsub_dispatcher:
+            self._unsub_dispatcher()
+
+    @callback
+    def _handle_duty_cycle(self, length: int) -> None:
+        """Publish the duty cycle when its window is due."""
+        if length != self._length:
+            return
+        duty_cycle = self.coordinator.duty_cycles.get(length)
+        ratio = (
+            duty_cycle.ratio(self.coordinator.clock.monotonic())
+            if duty_cycle is not None
+            else None
+        )
+        self._attr_native_value = round(ratio * 100, 1) if ratio is not None else None
+        self.async_write_ha_state()
+
+
+# Estimate field -> name, unit and the factor from the estimate's unit
+THERMAL_SENSORS = {
+    "heating_rate": ("Heating Rate", "°C/h", 1),
+    "cooling_rate": ("Cooling Rate", "°C/h", 1),
+    "lag": ("Thermal Lag", UnitOfTime.MINUTES, 1 / 60),
+}
+
+
+class TerneoThermalSensor(SensorEntity):
+    """Diagnostic sensor for an estimated thermal response of the floor."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_suggested_display_precision = 2
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: TerneoCoordinator,
+        field: str,
+        *,
+        model: str = "AX",
+    ) -> None:
+        """Initialize the thermal sensor."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self._client_id = coordinator.client_id
+        self._field = field
+        self._model = model
+        name, unit, self._factor = THERMAL_SENSORS[field]
+        self._attr_unique_id = f"{self._client_id}_{field}"
+        self._attr_name = f"Terneo {self._client_id} {name}"
+        self._attr_native_unit_of_measurement = unit
+        if unit == UnitOfTime.MINUTES:
+            self._attr_device_class = SensorDeviceClass.DURATION
+        self._attr_native_value = None
+
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, self._client_id)},
+            manufacturer="Terneo",
+            model=self._model,
+            name=f"Terneo {self._client_id}",
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Listen to new thermal estimates."""
+        self._unsub_dispatcher = async_dispatcher_connect(
+            self.hass,
+            SIGNAL_THERMAL.format(self._client_id),
+            self._handle_estimate,
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Unsubscribe from dispatcher when entity is removed."""
+        if self._unsub_dispatcher:
+            self._unsub_dispatcher()
+
+    @callback
+    def _handle_estimate(self) -> None:
+        """Publish the latest estimate."""
+        estimate = self.coordinator.thermal
+        value = getattr(estimate, self._field) if estimate is not None else None
+        self._attr_native_value = (
+            round(value * self._factor, 3) if value is not None else None
+        )
+        self.async_write_ha_state()
+
+
+# Day totals field -> name, unit, device class and state class
+ROLLUP_SENSORS = {
+    "heating_hours": (
+        "Heating Time Yesterday",
+        UnitOfTime.HOURS,
+        SensorDeviceClass.DURATION,
+        SensorStateClass.MEASUREMENT,
+    ),
+    "energy_kwh": (
+        "Energy Yesterday",
+        UnitOfEnergy.KILO_WATT_HOUR,
+        SensorDeviceClass.ENERGY,
+        None,
+    ),
+    "floor_min": (
+        "Floor Temperature Min Yesterday",
+        "°C",
+        SensorDeviceClass.TEMPERATURE,
+        SensorStateClass.MEASUREMENT,
+    ),
+    "floor_max": (
+        "Floor Temperature Max Yesterday",
+        "°C",
+        SensorDeviceClass.TEMPERATURE,
+        SensorStateClass.MEASUREMENT,
+    ),
+}
+
+
+class TerneoRollupSensor(RestoreEntity, SensorEntity):
+    """A total of the previous day, updated once at local midnight."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: TerneoCoordinator,
+        field: str,
+        rated_power_w: int = 0,
+        *,
+        model: str = "AX",
+    ) -> None:
+        """Initialize the rollup sensor."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self._client_id = coordinator.client_id
+        self._field = field
+        self._rated_power_w = rated_power_w
+        self._model = model
+        name, unit, device_class, state_class = ROLLUP_SENSORS[field]
+        self._attr_unique_id = f"{self._client_id}_{field}_yesterday"
+        self._attr_name = f"Terneo {self._client_id} {name}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        self._attr_state_class = state_class
+        self._attr_native_value = None
+
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, self._client_id)},
+            manufacturer="Terneo",
+            model=self._model,
+            name=f"Terneo {self._client_id}",
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the last day's value and listen to rollovers."""
+        await super().async_added_to_hass()
+        last_state = await self.async_get_last_state()
+        if last_state and last_state.state not in (STATE_UNKNOWN, STATE_UNAVAILABLE):
+            try:
+                self._attr_native_value = float(last_state.state)
+            except ValueError:
+                self._attr_native_value = None
+        self._unsub_dispatcher = async_dispatcher_connect(
+            self.hass,
+            SIGNAL_ROLLUP.format(self._client_id),
+            self._handle_rollup,
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Unsubscribe from dispatcher when entity is removed."""
+        if self._unsub_dispatcher:
+            self._unsub_dispatcher()
+
+    @callback
+    def _handle_rollup(self) -> None:
+        """Publish the totals of the day that just ended."""
+        yesterday = self.coordinator.rollup.yesterday
+        if yesterday is None:
+            return
+        self._attr_native_value = yesterday.as_dict(self._rated_power_w)[self._field]
+        self.async_write_ha_state()
+
+    def set_rated_power(self, rated_power_w: int) -> None:
+        """Recompute the last day's energy at a new rated power."""
+        self._rated_power_w = rated_power_w
+        self._handle_rollup()
+
+
+# Fleet total -> name, unit, device class
+FLEET_SENSORS = {
+    "total_power": ("Total Power", UnitOfPower.WATT, SensorDeviceClass.POWER),
+    "heating": ("Heating Devices", None, None),
+    "off": ("Off Devices", None, None),
+    "unavailable": ("Unavailable Devices", None, None),
+    "average_floor_temp": (
+        "Average Floor Temperature",
+        "°C",
+        SensorDeviceClass.TEMPERATURE,
+    ),
+}
+
+
+class TerneoFleetSensor(SensorEntity):
+    """A total over all devices of a config entry."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self, hass: HomeAssistant, fleet: TerneoFleetAggregate, field: str
+    ) -> None:
+        """Initialize the fleet sensor."""
+        self.hass = hass
+        self.fleet = fleet
+        self._field = field
+        name, unit, device_class = FLEET_SENSORS[field]
+        self._attr_unique_id = f"{fleet.entry_id}_fleet_{field}"
+        self._attr_name = f"Terneo Fleet {name}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        self._attr_native_value = fleet.as_dict()[field]
+
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, fleet.entry_id)},
+            manufacturer="Terneo",
+            name="Terneo Fleet",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Listen to throttled fleet updates."""
+        self._unsub_dispatcher = async_dispatcher_connect(
+            self.hass,
+            SIGNAL_FLEET.format(self.fleet.entry_id),
+            self._handle_fleet_update,
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Unsubscribe from dispatcher when entity is removed."""
+        if self._unsub_dispatcher:
+            self._unsub_dispatcher()
+
+    @callback
+    def _handle_fleet_update(self) -> None:
+        """Write the current total if it changed."""
+        value = self.fleet.as_dict()[self._field]
+        if value != self._attr_native_value:
+            self._attr_native_value = value
+            self.async_write_ha_state()
+
+
 class TerneoPowerSensor(SensorEntity):
     """Representation of a Terneo power sensor."""
 
@@ -232,11 +990,18 @@ class TerneoPowerSensor(SensorEntity):
             f"{DOMAIN}_{self._client_id}_update",
             self._handle_coordinator_update,
         )
+        self._unsub_snapshot = async_dispatcher_connect(
+            self.hass,
+            SIGNAL_SNAPSHOT.format(self._client_id),
+            self._handle_snapshot,
+        )
 
     async def async_will_remove_from_hass(self) -> None:
         """Unsubscribe from dispatcher when entity is removed."""
         if self._unsub_dispatcher:
             self._unsub_dispatcher()
+        if self._unsub_snapshot:
+            self._unsub_snapshot()
 
     @callback
     def _handle_coordinator_update(self, key: str, value: Any) -> None:
@@ -245,6 +1010,22 @@ class TerneoPowerSensor(SensorEntity):
             self._attr_native_value = value * self._rated_power_w
             self.async_write_ha_state()
 
+    @callback
+    def _handle_snapshot(self) -> None:
+        """Write the cached load once after a retained burst."""
+        load = self.coordinator.get_value("load")
+        if load is not None:
+            self._handle_coordinator_update("load", load)
+
+    @callback
+    def set_rated_power(self, rated_power_w: int) -> None:
+        """Apply a new rated power to the current load."""
+        self._rated_power_w = rated_power_w
+        load = self.coordinator.get_value("load")
+        if load is not None:
+            self._attr_native_value = load * rated_power_w
+            self.async_write_ha_state()
+
 
 class TerneoEnergySensor(RestoreEntity, SensorEntity):
     """Representation of a Terneo energy sensor."""
@@ -259,6 +1040,7 @@ class TerneoEnergySensor(RestoreEntity, SensorEntity):
         coordinator: TerneoCoordinator,
         rated_power_w: int,
         model: str = "AX",
+        precision: int = 6,
     ) -> None:
         """Initialize the energy sensor."""
         super().__init__()
@@ -268,8 +1050,9 @@ class TerneoEnergySensor(RestoreEntity, SensorEntity):
         self._rated_power_w = rated_power_w
         self._model = model
         self._load = None
-        self._last_update = time.time()
+        self._last_update = coordinator.clock.monotonic()
         self._energy_kwh = 0.0
+        self._precision = precision
 
         self._attr_unique_id = f"{self._client_id}_energy"
         self._attr_name = f"Terneo {self._client_id} Energy"
@@ -297,11 +1080,18 @@ class TerneoEnergySensor(RestoreEntity, SensorEntity):
             f"{DOMAIN}_{self._client_id}_update",
             self._handle_load_update,
         )
+        self._unsub_snapshot = async_dispatcher_connect(
+            self.hass,
+            SIGNAL_SNAPSHOT.format(self._client_id),
+            self._handle_snapshot,
+        )
 
     async def async_will_remove_from_hass(self) -> None:
         """Unsubscribe from dispatcher when entity is removed."""
         if self._unsub_load_dispatcher:
             self._unsub_load_dispatcher()
+        if self._unsub_snapshot:
+            self._unsub_snapshot()
         await super().async_will_remove_from_hass()
 
     @callback
@@ -310,14 +1100,31 @@ class TerneoEnergySensor(RestoreEntity, SensorEntity):
         if key == "load":
             self._handle_load_change(value)
 
+    @callback
+    def _handle_snapshot(self) -> None:
+        """Apply the cached load once after a retained burst."""
+        load = self.coordinator.get_value("load")
+        if load is not None:
+            self._handle_load_change(load)
+
     def _handle_load_change(self, new_load: int) -> None:
         """Handle load change."""
-        current_time = time.time()
+        current_time = self.coordinator.clock.monotonic()
         if self._load is not None:
             time_diff_hours = (current_time - self._last_update) / 3600.0
             power_kw = (self._load * self._rated_power_w) / 1000.0
             self._energy_kwh += power_kw * time_diff_hours
         self._load = new_load
         self._last_update = current_time
-        self._attr_native_value = round(self._energy_kwh, 6)
+        self._attr_native_value = round(self._energy_kwh, self._precision)
         self.async_write_ha_state()
+
+    @callback
+    def set_rated_power(self, rated_power_w: int) -> None:
+        """Close the running interval at the old rate and switch to the new one."""
+        if self._load is not None:
+            self._handle_load_change(self._load)
+        self._rated_power_w = rated_power_w
+
+
+EnergyEntity = TerneoPowerSensor | TerneoEnergySensor | TerneoRollupSensor
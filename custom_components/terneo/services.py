@@ -0,0 +1,285 @@
+"""Services for TerneoMQ integration."""
+
+from collections.abc import Container, Iterator
+from pathlib import Path
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.util import dt as dt_util
+
+from .base_entity import AVAILABILITY_TIMEOUT
+from .bulk import DEFAULT_MAX_CONCURRENCY, async_bulk_command
+from .climate import calculate_hvac_state
+from .const import (
+    DATA_RUNTIME,
+    DOMAIN,
+    MODE_PAYLOADS,
+    SERVICE_ADD_DEVICE,
+    SERVICE_BULK_COMMAND,
+    SERVICE_EXPORT,
+    SERVICE_GET_DAILY_ROLLUPS,
+    SERVICE_GET_SNAPSHOT,
+    SERVICE_REMOVE_DEVICE,
+)
+from .coordinator import TerneoCoordinator
+from .runtime import TerneoEntryRuntime
+
+DEVICE_SERVICE_SCHEMA = vol.Schema(
+    {
+        vol.Required("config_entry_id"): cv.string,
+        vol.Required("client_id"): vol.All(cv.string, vol.Strip, vol.Length(min=1)),
+    }
+)
+
+ROLLUP_SERVICE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("config_entry_id"): cv.string,
+        vol.Optional("client_id"): vol.All(cv.string, vol.Strip, vol.Length(min=1)),
+    }
+)
+
+EXPORT_SERVICE_SCHEMA = vol.Schema(
+    {
+        vol.Required("config_entry_id"): cv.string,
+        vol.Required("start"): cv.datetime,
+        vol.Optional("end"): cv.datetime,
+        vol.Optional("client_id"): vol.All(cv.string, vol.Strip, vol.Length(min=1)),
+        vol.Required("filename"): vol.All(cv.string, vol.Strip, vol.Length(min=1)),
+    }
+)
+
+SNAPSHOT_SERVICE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("config_entry_id"): cv.string,
+        vol.Optional("client_id"): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+BULK_COMMAND_SERVICE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("config_entry_id"): cv.string,
+        vol.Optional("client_id"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("area_id"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required("fields"): vol.All(
+            vol.Schema(
+                {
+                    vol.Optional("setTemp"): vol.All(
+                        vol.Coerce(float), vol.Range(min=5, max=35)
+                    ),
+                    vol.Optional("powerOff"): cv.boolean,
+                    vol.Optional("mode"): vol.In(list(MODE_PAYLOADS)),
+                    vol.Optional("bright"): vol.All(
+                        vol.Coerce(int), vol.Range(min=0, max=9)
+                    ),
+                }
+            ),
+            vol.Length(min=1),
+        ),
+        vol.Optional("max_concurrency", default=DEFAULT_MAX_CONCURRENCY): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=50)
+        ),
+        vol.Optional("jitter", default=0.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=30)
+        ),
+    }
+)
+
+
+def _matching_coordinators(
+    hass: HomeAssistant, entry_id: str | None, client_ids: Container[str] | None
+) -> Iterator[tuple[TerneoEntryRuntime, str, TerneoCoordinator]]:
+    """Yield the loaded devices of an entry, or of all entries, once each."""
+    seen: set[str] = set()
+    runtimes = hass.data.get(DOMAIN, {}).get(DATA_RUNTIME, {})
+    for runtime_entry_id, runtime in runtimes.items():
+        if entry_id not in (None, runtime_entry_id):
+            continue
+        for client_id, coordinator in hass.data[DOMAIN][runtime_entry_id].items():
+            if client_id in seen or (
+                client_ids is not None and client_id not in client_ids
+            ):
+                continue
+            seen.add(client_id)
+            yield runtime, client_id, coordinator
+
+
+def _get_entry(hass: HomeAssistant, call: ServiceCall) -> ConfigEntry:
+    """Return the config entry targeted by a service call."""
+    entry = hass.config_entries.async_get_entry(call.data["config_entry_id"])
+    if entry is None or entry.domain != DOMAIN:
+        raise ServiceValidationError(
+            f"Config entry {call.data['config_entry_id']} is not a TerneoMQ entry"
+        )
+    return entry
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register TerneoMQ services."""
+    # Imported here because the package imports this module during setup
+    from . import async_add_device, async_remove_device  # noqa: PLC0415
+
+    async def _async_add_device(call: ServiceCall) -> None:
+        """Add one device to a config entry."""
+        entry = _get_entry(hass, call)
+        if not await async_add_device(hass, entry, call.data["client_id"]):
+            raise ServiceValidationError(
+                f"Device {call.data['client_id']} is already configured"
+            )
+
+    async def _async_remove_device(call: ServiceCall) -> None:
+        """Remove one device from a config entry."""
+        entry = _get_entry(hass, call)
+        if not await async_remove_device(hass, entry, call.data["client_id"]):
+            raise ServiceValidationError(
+                f"Device {call.data['client_id']} is not configured"
+            )
+
+    @callback
+    def _get_daily_rollups(call: ServiceCall) -> ServiceResponse:
+        """Return today's and yesterday's totals of the matching devices."""
+        devices: dict[str, dict] = {}
+        client_ids = {call.data["client_id"]} if "client_id" in call.data else None
+        for runtime, client_id, coordinator in _matching_coordinators(
+            hass, call.data.get("config_entry_id"), client_ids
+        ):
+            rated_power_w = runtime.settings["rated_power_w"]
+            rollup = coordinator.rollup
+            yesterday = rollup.yesterday
+            devices[client_id] = {
+                "today": rollup.today(coordinator.clock.monotonic()).as_dict(
+                    rated_power_w
+                ),
+                "yesterday": (
+                    yesterday.as_dict(rated_power_w) if yesterday is not None else None
+                ),
+            }
+        return {"devices": devices}
+
+    @callback
+    def _get_snapshot(call: ServiceCall) -> ServiceResponse:
+        """Return cached values and derived state of the matching devices."""
+        devices: dict[str, dict] = {}
+        for _, client_id, coordinator in _matching_coordinators(
+            hass, call.data.get("config_entry_id"), call.data.get("client_id")
+        ):
+            values = coordinator.get_values()
+            hvac_state = calculate_hvac_state(
+                values.get("powerOff"),
+                values.get("load"),
+                values.get("setTemp"),
+                values.get("floorTemp"),
+            )
+            age = (
+                round(coordinator.clock.monotonic() - coordinator.last_seen, 1)
+                if coordinator.last_seen is not None
+                else None
+            )
+            devices[client_id] = {
+                "values": values,
+                "hvac_mode": hvac_state[0] if hvac_state else None,
+                "hvac_action": hvac_state[1] if hvac_state else None,
+                "last_seen_age": age,
+                "available": age is not None and age <= AVAILABILITY_TIMEOUT,
+            }
+        return {"devices": devices}
+
+    async def _async_export(call: ServiceCall) -> ServiceResponse:
+        """Stream archived telemetry of a time range into a CSV file."""
+        entry = _get_entry(hass, call)
+        runtime = hass.data.get(DOMAIN, {}).get(DATA_RUNTIME, {}).get(entry.entry_id)
+        if runtime is None or runtime.archive is None:
+            raise ServiceValidationError(
+                f"Config entry {entry.entry_id} does not archive telemetry"
+            )
+        path = Path(hass.config.path(call.data["filename"]))
+        if not hass.config.is_allowed_path(str(path)):
+            raise ServiceValidationError(f"Writing to {path} is not allowed")
+        start = dt_util.as_utc(call.data["start"])
+        end = dt_util.as_utc(call.data.get("end") or dt_util.utcnow())
+        client_ids = {call.data["client_id"]} if "client_id" in call.data else None
+        rows = await hass.async_add_executor_job(
+            runtime.archive.export_csv, path, start, end, client_ids
+        )
+        return {"path": str(path), "rows": rows}
+
+    async def _async_bulk_command(call: ServiceCall) -> ServiceResponse:
+        """Send the same commands to every targeted device."""
+        coordinators = {
+            client_id: coordinator
+            for _, client_id, coordinator in _matching_coordinators(
+                hass, call.data.get("config_entry_id"), call.data.get("client_id")
+            )
+        }
+        if "area_id" in call.data:
+            device_registry = dr.async_get(hass)
+            coordinators = {
+                client_id: coordinator
+                for client_id, coordinator in coordinators.items()
+                if (
+                    device := device_registry.async_get_device(
+                        identifiers={(DOMAIN, client_id)}
+                    )
+                )
+                is not None
+                and device.area_id in call.data["area_id"]
+            }
+        if not coordinators:
+            raise ServiceValidationError(
+                f"No TerneoMQ devices match the {call.service} target"
+            )
+        devices = await async_bulk_command(
+            coordinators.values(),
+            call.data["fields"],
+            call.data["max_concurrency"],
+            call.data["jitter"],
+        )
+        return {"devices": devices}
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_ADD_DEVICE, _async_add_device, schema=DEVICE_SERVICE_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REMOVE_DEVICE,
+        _async_remove_device,
+        schema=DEVICE_SERVICE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_DAILY_ROLLUPS,
+        _get_daily_rollups,
+        schema=ROLLUP_SERVICE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT,
+        _async_export,
+        schema=EXPORT_SERVICE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_SNAPSHOT,
+        _get_snapshot,
+        schema=SNAPSHOT_SERVICE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BULK_COMMAND,
+        _async_bulk_command,
+        schema=BULK_COMMAND_SERVICE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
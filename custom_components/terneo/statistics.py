@@ -0,0 +1,227 @@
+"""Long-term statistics import for TerneoMQ integration."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import UnitOfEnergy, UnitOfTime
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from .const import DOMAIN, SIGNAL_OPTIONS_UPDATED, SIGNAL_SNAPSHOT
+from .rollups import TerneoRollup
+
+if TYPE_CHECKING:
+    from .coordinator import TerneoCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+STATISTIC_ENERGY = "energy"
+STATISTIC_HEATING_TIME = "heating_time"
+
+
+def statistic_id(client_id: str, kind: str) -> str:
+    """Return the external statistic id of a device."""
+    return f"{DOMAIN}:{slugify(client_id)}_{kind}"
+
+
+async def _async_get_last_sum(hass: HomeAssistant, statistic: str) -> float:
+    """Return the last imported sum of a statistic, or 0 for a new one."""
+    # The recorder is optional, so it is only imported when statistics are used
+    from homeassistant.components.recorder import get_instance  # noqa: PLC0415
+    from homeassistant.components.recorder.statistics import (  # noqa: PLC0415
+        get_last_statistics,
+    )
+
+    last = await get_instance(hass).async_add_executor_job(
+        get_last_statistics, hass, 1, statistic, True, {"sum"}
+    )
+    rows = last.get(statistic)
+    return (rows[0]["sum"] or 0.0) if rows else 0.0
+
+
+def _add_statistics(
+    hass: HomeAssistant, metadata: dict[str, Any], rows: list[dict[str, Any]]
+) -> None:
+    """Queue hourly rows of a statistic in the recorder."""
+    from homeassistant.components.recorder.statistics import (  # noqa: PLC0415
+        async_add_external_statistics,
+    )
+
+    async_add_external_statistics(hass, metadata, rows)
+
+
+class TerneoStatisticsImporter:
+    """Import hourly energy and heating time of an entry's devices.
+
+    Heating time is accumulated per device from load updates, closed for
+    the whole fleet by one callback at the top of every hour, and handed
+    to the recorder as one batch of rows per statistic.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, rated_power_w: int = 0
+    ) -> None:
+        """Initialize the importer."""
+        self.hass = hass
+        self.entry_id = entry_id
+        self.rated_power_w = rated_power_w
+        self._coordinators: dict[str, TerneoCoordinator] = {}
+        self._rollups: dict[str, TerneoRollup] = {}
+        self._unsubs: dict[str, list[CALLBACK_TYPE]] = {}
+        # statistic id -> running sum, once loaded from the recorder
+        self._sums: dict[str, float] = {}
+        self._names: dict[str, str] = {}
+        # statistic id -> (hour start, amount) not yet imported
+        self._pending: dict[str, list[tuple[datetime, float]]] = {}
+        self._cancels: list[CALLBACK_TYPE] = []
+        self._loads: set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        """Close an hour at the top of every hour."""
+        if not self._cancels:
+            self._cancels = [
+                async_track_time_change(
+                    self.hass, self._close_hour, minute=0, second=0
+                ),
+                async_dispatcher_connect(
+                    self.hass,
+                    SIGNAL_OPTIONS_UPDATED.format(self.entry_id),
+                    self.async_options_updated,
+                ),
+            ]
+
+    def stop(self) -> None:
+        """Stop importing and following devices."""
+        for cancel in self._cancels:
+            cancel()
+        self._cancels = []
+        for client_id in list(self._coordinators):
+            self.remove_device(client_id)
+        for task in self._loads:
+            task.cancel()
+        self._loads.clear()
+
+    @callback
+    def async_options_updated(self, changes: dict[str, Any]) -> None:
+        """Import energy at a new rated power from the next hour on."""
+        if "rated_power_w" in changes:
+            self.rated_power_w = changes["rated_power_w"]
+
+    @callback
+    def add_device(self, coordinator: TerneoCoordinator) -> None:
+        """Start accumulating a device and load its running sums."""
+        client_id = coordinator.client_id
+        if client_id in self._coordinators:
+            return
+        self._coordinators[client_id] = coordinator
+        rollup = self._rollups[client_id] = TerneoRollup()
+        if (load := coordinator.get_value("load")) is not None:
+            rollup.add(coordinator.clock.monotonic(), "load", load)
+        self._unsubs[client_id] = [
+            async_dispatcher_connect(
+                self.hass,
+                f"{DOMAIN}_{client_id}_update",
+                lambda key, value: self._handle_update(client_id, key, value),
+            ),
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_SNAPSHOT.format(client_id),
+                lambda: self._handle_update(
+                    client_id, "load", coordinator.get_value("load")
+                ),
+            ),
+        ]
+        missing = []
+        for kind, name in (
+            (STATISTIC_ENERGY, "Energy"),
+            (STATISTIC_HEATING_TIME, "Heating Time"),
+        ):
+            statistic = statistic_id(client_id, kind)
+            self._names[statistic] = f"Terneo {client_id} {name}"
+            if statistic not in self._sums:
+                missing.append(statistic)
+        if missing:
+            # Hours closed meanwhile stay pending until their sums are known
+            task = self.hass.async_create_background_task(
+                self._async_load_sums(missing), f"terneo statistics {client_id}"
+            )
+            self._loads.add(task)
+            task.add_done_callback(self._loads.discard)
+
+    async def _async_load_sums(self, statistics: list[str]) -> None:
+        """Load the last imported sums of statistics and import pending hours."""
+        sums = await asyncio.gather(
+            *(_async_get_last_sum(self.hass, statistic) for statistic in statistics)
+        )
+        for statistic, total in zip(statistics, sums, strict=True):
+            self._sums.setdefault(statistic, total)
+        self.flush()
+
+    def remove_device(self, client_id: str) -> None:
+        """Stop accumulating a device."""
+        if self._coordinators.pop(client_id, None) is None:
+            return
+        for unsub in self._unsubs.pop(client_id):
+            unsub()
+        del self._rollups[client_id]
+
+    @callback
+    def _handle_update(self, client_id: str, key: str, value: Any) -> None:
+        """Account for a load change of a device."""
+        if key == "load" and value is not None:
+            coordinator = self._coordinators[client_id]
+            self._rollups[client_id].add(coordinator.clock.monotonic(), key, value)
+
+    @callback
+    def _close_hour(self, now: datetime) -> None:
+        """Close the hour that just ended for every device and import it."""
+        start = dt_util.as_utc(now).replace(
+            minute=0, second=0, microsecond=0
+        ) - timedelta(hours=1)
+        for client_id, coordinator in self._coordinators.items():
+            totals = self._rollups[client_id].roll_over(coordinator.clock.monotonic())
+            self._pending.setdefault(
+                statistic_id(client_id, STATISTIC_HEATING_TIME), []
+            ).append((start, totals.heating_hours))
+            if self.rated_power_w > 0:
+                self._pending.setdefault(
+                    statistic_id(client_id, STATISTIC_ENERGY), []
+                ).append((start, totals.heating_hours * self.rated_power_w / 1000))
+        self.flush()
+
+    @callback
+    def flush(self) -> None:
+        """Import every pending hour whose running sum is known."""
+        for statistic, hours in list(self._pending.items()):
+            if statistic not in self._sums:
+                continue
+            total = self._sums[statistic]
+            rows = []
+            for start, amount in hours:
+                total += amount
+                rows.append({"start": start, "state": total, "sum": total})
+            self._sums[statistic] = total
+            del self._pending[statistic]
+            energy = statistic.endswith(STATISTIC_ENERGY)
+            _add_statistics(
+                self.hass,
+                {
+                    "has_mean": False,
+                    "has_sum": True,
+                    "name": self._names[statistic],
+                    "source": DOMAIN,
+                    "statistic_id": statistic,
+                    "unit_of_measurement": (
+                        UnitOfEnergy.KILO_WATT_HOUR if energy else UnitOfTime.HOURS
+                    ),
+                },
+                rows,
+            )
+        _LOGGER.debug("Imported statistics, %d pending", len(self._pending))
@@ -0,0 +1,179 @@
+"""Thermal response estimation for TerneoMQ integration."""
+
+from __future__ import annotations
+
+import logging
+from array import array
+from bisect import bisect_left
+from typing import TYPE_CHECKING, NamedTuple
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .const import SIGNAL_THERMAL
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+    from .clock import TerneoClock
+    from .coordinator import TerneoCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+THERMAL_INTERVAL = 900  # seconds between estimation runs
+MIN_RUN_SAMPLES = 4  # floor temperature samples a load run needs to be fitted
+MIN_RUN_SPAN = 300  # seconds a fitted part of a run has to cover
+
+Samples = tuple[array, array]
+
+
+class TerneoThermalEstimate(NamedTuple):
+    """Estimated thermal response of a heated floor."""
+
+    heating_rate: float | None  # °C per hour while the load is on
+    cooling_rate: float | None  # °C per hour lost while the load is off
+    lag: float | None  # seconds from load on until the floor starts warming
+
+
+def load_runs(load: Samples) -> list[tuple[float, int, bool]]:
+    """Return (start, state, start is a seen transition) for each load run."""
+    runs: list[tuple[float, int, bool]] = []
+    for timestamp, value in zip(*load, strict=True):
+        state = int(value)
+        if not runs:
+            # The state may have started before the history does
+            runs.append((timestamp, state, False))
+        elif state != runs[-1][1]:
+            runs.append((timestamp, state, True))
+    return runs
+
+
+def _centered_sums(
+    times: array, values: array, lo: int, hi: int
+) -> tuple[float, float]:
+    """Return Sxx and Sxy of samples lo..hi around their own means."""
+    count = hi - lo
+    mean_t = sum(times[lo:hi]) / count
+    mean_v = sum(values[lo:hi]) / count
+    sxx = sxy = 0.0
+    for timestamp, value in zip(times[lo:hi], values[lo:hi], strict=True):
+        sxx += (timestamp - mean_t) ** 2
+        sxy += (timestamp - mean_t) * (value - mean_v)
+    return sxx, sxy
+
+
+def estimate_thermal_response(floor: Samples, load: Samples) -> TerneoThermalEstimate:
+    """Fit heating and cooling rates and the heating lag of one device.
+
+    The floor temperature samples are split into runs of constant load.
+    Each run is fitted from its turning point on (the lowest temperature
+    of a heating run, the highest of a cooling run), since the floor keeps
+    drifting the old way for a while after the load switches. Rates are
+    the least-squares slope pooled over all runs of the same load, each
+    run having its own intercept. The lag is the mean time from a seen
+    load-on transition to the turning point.
+    """
+    times, values = floor
+    sums = {0: [0.0, 0.0], 1: [0.0, 0.0]}
+    lags: list[float] = []
+    runs = load_runs(load)
+    for index, (start, state, seen) in enumerate(runs):
+        lo = bisect_left(times, start)
+        hi = (
+            bisect_left(times, runs[index + 1][0])
+            if index + 1 < len(runs)
+            else len(times)
+        )
+        if hi - lo < MIN_RUN_SAMPLES:
+            continue
+        run = values[lo:hi]
+        turn = lo + run.index(min(run) if state else max(run))
+        if state and seen and turn < hi - 1:
+            lags.append(times[turn] - start)
+        if hi - turn < MIN_RUN_SAMPLES or times[hi - 1] - times[turn] < MIN_RUN_SPAN:
+            continue
+        sxx, sxy = _centered_sums(times, values, turn, hi)
+        sums[state][0] += sxx
+        sums[state][1] += sxy
+
+    def _rate(state: int, sign: float) -> float | None:
+        sxx, sxy = sums[state]
+        return sign * sxy / sxx * 3600 if sxx > 0 else None
+
+    return TerneoThermalEstimate(
+        heating_rate=_rate(1, 1.0),
+        cooling_rate=_rate(0, -1.0),
+        lag=sum(lags) / len(lags) if lags else None,
+    )
+
+
+def estimate_fleet(
+    inputs: dict[str, tuple[Samples, Samples]],
+) -> dict[str, TerneoThermalEstimate]:
+    """Estimate the thermal response of every device; runs in the executor."""
+    return {
+        client_id: estimate_thermal_response(floor, load)
+        for client_id, (floor, load) in inputs.items()
+    }
+
+
+class TerneoThermalEstimator:
+    """Periodically estimate the thermal response of all devices.
+
+    Samples are copied out of the coordinators' history on the event loop,
+    fitted in the executor, and the finished estimates are handed back to
+    the coordinators, which notify their sensors.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinators: Callable[[], Iterable[TerneoCoordinator]],
+    ) -> None:
+        """Initialize the estimator."""
+        self.hass = hass
+        self._coordinators = coordinators
+        self._cancel: CALLBACK_TYPE | None = None
+        self._running = False
+
+    def start(self, clock: TerneoClock) -> None:
+        """Run an estimation every THERMAL_INTERVAL seconds."""
+        if self._cancel is None:
+            self._cancel = clock.track_interval(self._run, THERMAL_INTERVAL)
+
+    def stop(self) -> None:
+        """Stop periodic estimation."""
+        if self._cancel is not None:
+            self._cancel()
+            self._cancel = None
+
+    @callback
+    def _run(self) -> None:
+        """Start an estimation unless the previous one is still running."""
+        if self._running:
+            return
+        self._running = True
+        self.hass.async_create_background_task(
+            self.async_update(), "terneo thermal estimation"
+        )
+
+    async def async_update(self) -> None:
+        """Estimate all devices and publish the results."""
+        inputs = {
+            coordinator.client_id: (
+                coordinator.history["floorTemp"].copy(),
+                coordinator.history["load"].copy(),
+            )
+            for coordinator in self._coordinators()
+        }
+        try:
+            results = await self.hass.async_add_executor_job(estimate_fleet, inputs)
+        finally:
+            self._running = False
+        _LOGGER.debug("Estimated thermal response of %d devices", len(results))
+        for coordinator in self._coordinators():
+            if (estimate := results.get(coordinator.client_id)) is not None:
+                coordinator.thermal = estimate
+                async_dispatcher_send(
+                    self.hass, SIGNAL_THERMAL.format(coordinator.client_id)
+                )
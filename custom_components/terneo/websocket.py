@@ -0,0 +1,169 @@
+"""Websocket API for raw device telemetry of TerneoMQ integration."""
+
+from __future__ import annotations
+
+import logging
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import SIGNAL_COORDINATOR_ADDED, SIGNAL_COORDINATOR_REMOVED
+from .hub import get_hub
+from .scheduler import get_scheduler
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .coordinator import TerneoCoordinator
+    from .scheduler import TerneoSchedulerScope
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_TELEMETRY_KEYS = ("floorTemp", "setTemp", "load")
+DEFAULT_COALESCE_INTERVAL = 1.0  # seconds
+
+
+class TerneoTelemetrySubscription:
+    """Coalesce raw telemetry of some devices into batched deltas.
+
+    Values are taken from the coordinators as they are parsed, before the
+    change filter, and only the latest value of each key is kept until the
+    next flush. Keys whose value did not change since the previous batch
+    are left out of it.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[dict[str, dict[str, Any]]], None],
+        keys: set[str],
+        scheduler: TerneoSchedulerScope,
+        interval: float,
+    ) -> None:
+        """Initialize the subscription."""
+        self._send = send
+        self._keys = keys
+        self._interval = interval
+        self._scheduler = scheduler
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._sent: dict[str, dict[str, Any]] = {}
+        self._unsubs: dict[TerneoCoordinator, CALLBACK_TYPE] = {}
+
+    def follow(self, coordinator: TerneoCoordinator) -> None:
+        """Start forwarding a device, beginning with its current values."""
+        if coordinator in self._unsubs:
+            return
+        self._unsubs[coordinator] = coordinator.async_add_telemetry_listener(
+            partial(self._handle_telemetry, coordinator.client_id)
+        )
+        for key in self._keys:
+            if (value := coordinator.get_value(key)) is not None:
+                self._handle_telemetry(coordinator.client_id, key, value)
+
+    @callback
+    def unfollow(self, coordinator: TerneoCoordinator) -> None:
+        """Stop forwarding a device whose coordinator was torn down."""
+        if (unsub := self._unsubs.pop(coordinator, None)) is not None:
+            unsub()
+
+    @callback
+    def _handle_telemetry(self, client_id: str, key: str, value: Any) -> None:
+        """Keep the latest value of a key until the next flush."""
+        if key not in self._keys:
+            return
+        self._pending.setdefault(client_id, {})[key] = value
+        if "flush" not in self._scheduler:
+            self._scheduler.schedule("flush", self._interval, self.flush)
+
+    @callback
+    def flush(self) -> None:
+        """Send the values that changed since the previous batch."""
+        deltas: dict[str, dict[str, Any]] = {}
+        for client_id, values in self._pending.items():
+            sent = self._sent.setdefault(client_id, {})
+            changed = {
+                key: value
+                for key, value in values.items()
+                if key not in sent or sent[key] != value
+            }
+            if changed:
+                sent.update(changed)
+                deltas[client_id] = changed
+        self._pending = {}
+        if deltas:
+            self._send(deltas)
+
+    @callback
+    def close(self) -> None:
+        """Stop forwarding telemetry."""
+        for unsub in self._unsubs.values():
+            unsub()
+        self._unsubs.clear()
+        self._scheduler.cancel_all()
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "terneo/subscribe_telemetry",
+        vol.Optional("client_ids"): [cv.string],
+        vol.Optional("keys", default=list(DEFAULT_TELEMETRY_KEYS)): vol.All(
+            [cv.string], vol.Length(min=1)
+        ),
+        vol.Optional("interval", default=DEFAULT_COALESCE_INTERVAL): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1, max=60)
+        ),
+    }
+)
+@callback
+def ws_subscribe_telemetry(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream batched raw telemetry deltas of the requested devices."""
+    msg_id = msg["id"]
+    client_ids = msg.get("client_ids")
+    subscription = TerneoTelemetrySubscription(
+        lambda devices: connection.send_message(
+            websocket_api.event_message(msg_id, {"devices": devices})
+        ),
+        set(msg["keys"]),
+        get_scheduler(hass).scope(),
+        msg["interval"],
+    )
+
+    @callback
+    def coordinator_added(coordinator: TerneoCoordinator) -> None:
+        if client_ids is None or coordinator.client_id in client_ids:
+            subscription.follow(coordinator)
+
+    # Reloads and added devices replace coordinators, which are followed too
+    unsubs = [
+        async_dispatcher_connect(hass, SIGNAL_COORDINATOR_ADDED, coordinator_added),
+        async_dispatcher_connect(
+            hass, SIGNAL_COORDINATOR_REMOVED, subscription.unfollow
+        ),
+    ]
+
+    @callback
+    def close() -> None:
+        for unsub in unsubs:
+            unsub()
+        subscription.close()
+
+    for coordinator in get_hub(hass).coordinators():
+        coordinator_added(coordinator)
+    connection.subscriptions[msg_id] = close
+    connection.send_result(msg_id)
+    # The first batch holds the current values of every device
+    subscription.flush()
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Register the TerneoMQ websocket commands."""
+    websocket_api.async_register_command(hass, ws_subscribe_telemetry)
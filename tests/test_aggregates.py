@@ -0,0 +1,122 @@
+"""Test TerneoMQ rolling window aggregates."""
+
+import random
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from custom_components.terneo.aggregates import TerneoDutyCycle, TerneoRollingWindow
+from custom_components.terneo.clock import VirtualClock
+from custom_components.terneo.coordinator import TerneoCoordinator
+from custom_components.terneo.sensor import TerneoDutyCycleSensor
+
+
+def test_rolling_window_matches_brute_force() -> None:
+    """Test min, max and mean agree with recomputing over the window."""
+    rng = random.Random(7)  # noqa: S311
+    window = TerneoRollingWindow(600)
+    samples: list[tuple[float, float]] = []
+    now = 0.0
+    for _ in range(2000):
+        now += rng.uniform(1, 60)
+        value = round(rng.uniform(15, 30), 2)
+        window.add(now, value)
+        samples.append((now, value))
+        inside = [v for t, v in samples if t > now - 600]
+        low, high, mean = window.stats(now)
+        assert low == min(inside)
+        assert high == max(inside)
+        assert mean == pytest.approx(sum(inside) / len(inside))
+
+    assert window.stats(now + 600) is None
+
+
+@pytest.mark.asyncio
+async def test_coordinator_publishes_aggregates_at_window_cadence() -> None:
+    """Test samples feed every window and sensors are notified per step."""
+    clock = VirtualClock()
+    coordinator = TerneoCoordinator(MagicMock(), "dev", "terneo", "terneo", clock=clock)
+    coordinator.add_aggregate_window(3600)
+    coordinator.add_aggregate_window(3600)
+
+    with patch(
+        "custom_components.terneo.coordinator.async_dispatcher_send"
+    ) as mock_send:
+        for value in ("20.0", "22.0", "21.0"):
+            msg = MagicMock()
+            msg.topic = "terneo/dev/floorTemp"
+            msg.payload = value
+            coordinator._handle_message(msg)
+            clock.advance(60)
+        mock_send.reset_mock()
+        clock.advance(120)
+        mock_send.assert_called_once_with(
+            coordinator.hass, "terneo_dev_aggregates", 3600
+        )
+
+    assert coordinator.windows["floorTemp"][3600].stats(clock.monotonic()) == (
+        20.0,
+        22.0,
+        21.0,
+    )
+    assert coordinator.windows["airTemp"][3600].stats(clock.monotonic()) is None
+
+
+def _on_time(transitions: list[tuple[float, bool]], start: float, end: float) -> float:
+    """Integrate the load state over start..end by brute force."""
+    total = 0.0
+    for (time, on), (next_time, _) in zip(
+        transitions, [*transitions[1:], (end, False)], strict=True
+    ):
+        if on:
+            total += max(0.0, min(next_time, end) - max(time, start))
+    return total
+
+
+def test_duty_cycle_matches_brute_force() -> None:
+    """Test the incremental duty cycle agrees with integrating the history."""
+    rng = random.Random(3)  # noqa: S311
+    duty_cycle = TerneoDutyCycle(3600)
+    assert duty_cycle.ratio(0) is None
+    transitions: list[tuple[float, bool]] = []
+    now = 100.0
+    for _ in range(500):
+        on = rng.random() < 0.5
+        duty_cycle.add(now, on)
+        transitions.append((now, on))
+        query = now + rng.uniform(0, 600)
+        observed = min(3600, query - transitions[0][0])
+        expected = _on_time(transitions, query - 3600, query) / observed
+        assert duty_cycle.ratio(query) == pytest.approx(expected)
+        now = query + rng.uniform(0, 600)
+
+
+@pytest.mark.asyncio
+async def test_coordinator_publishes_duty_cycle() -> None:
+    """Test load telemetry feeds the duty cycle sensor."""
+    clock = VirtualClock()
+    coordinator = TerneoCoordinator(MagicMock(), "dev", "terneo", "terneo", clock=clock)
+    coordinator.add_duty_cycle_window(3600)
+    sensor = TerneoDutyCycleSensor(coordinator.hass, coordinator, 3600)
+    sensor.async_write_ha_state = MagicMock()
+
+    with patch(
+        "custom_components.terneo.coordinator.async_dispatcher_send"
+    ) as mock_send:
+        for payload in ("1", "1", "0", "1"):
+            msg = MagicMock()
+            msg.topic = "terneo/dev/load"
+            msg.payload = payload
+            coordinator._handle_message(msg)
+            clock.advance(600)
+        # Published every 5 minutes for the 1 hour window
+        assert mock_send.call_args_list[-1].args == (
+            coordinator.hass,
+            "terneo_dev_duty_cycle",
+            3600,
+        )
+
+    sensor._handle_duty_cycle(3600)
+    assert sensor.native_value == 75.0
+    sensor._handle_duty_cycle(86400)
+    assert sensor.async_write_ha_state.call_count == 1
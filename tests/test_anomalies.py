@@ -0,0 +1,94 @@
+"""Test TerneoMQ fleet anomaly detection."""
+
+import random
+from unittest.mock import MagicMock, patch
+
+from custom_components.terneo.anomalies import (
+    ANOMALY_FLAPPING,
+    ANOMALY_NO_RISE,
+    ANOMALY_PROT_CREEP,
+    ANOMALY_STUCK_SENSOR,
+    TerneoAnomalyDetector,
+    detect_fleet_anomalies,
+)
+from custom_components.terneo.history import TerneoRingBuffer
+
+HOURS = 3
+NOW = HOURS * 3600.0 - 30  # time of the last sample
+
+
+def _device(rng: random.Random, kind: str) -> tuple:
+    """Return floor, load and protTemp history of a simulated device."""
+    floor = TerneoRingBuffer(1000)
+    load = TerneoRingBuffer(1000)
+    prot = TerneoRingBuffer(1000)
+    temperature = 21.0 + rng.uniform(-0.5, 0.5)
+    state = 0
+    for step in range(HOURS * 120):
+        now = step * 30.0
+        if kind in {"stuck", "no_rise"}:
+            if step == 0:
+                load.append(now, 1)
+            reading = 21.0 if kind == "stuck" else 21.0 + rng.gauss(0, 0.05)
+        else:
+            if kind == "flapping" and now > NOW - 600:
+                state = 1 - state
+                load.append(now, state)
+            elif not state and temperature < 21.0:
+                state = 1
+                load.append(now, 1)
+            elif state and temperature > 22.0:
+                state = 0
+                load.append(now, 0)
+            temperature += (1.5 if state else -0.6) / 120
+            reading = temperature + rng.gauss(0, 0.02)
+        floor.append(now, reading)
+        creep = 2.5 if kind == "creep" else rng.uniform(-0.2, 0.3)
+        prot.append(now, 25.0 + creep * now / 3600 + rng.gauss(0, 0.05))
+    return floor.copy(), load.copy(), prot.copy()
+
+
+def test_detects_only_outliers() -> None:
+    """Test each misbehaving device trips its own indicators only."""
+    rng = random.Random(5)  # noqa: S311
+    kinds = ["stuck", "no_rise", "flapping", "creep"] + ["normal"] * 20
+    inputs = {f"dev{i}": _device(rng, kind) for i, kind in enumerate(kinds)}
+
+    results = detect_fleet_anomalies(inputs, NOW)
+
+    assert set(results["dev0"]) == {ANOMALY_STUCK_SENSOR, ANOMALY_NO_RISE}
+    assert set(results["dev1"]) == {ANOMALY_NO_RISE}
+    assert set(results["dev2"]) == {ANOMALY_FLAPPING}
+    assert set(results["dev3"]) == {ANOMALY_PROT_CREEP}
+    assert results["dev3"][ANOMALY_PROT_CREEP] > 2
+    assert all(not results[f"dev{i}"] for i in range(4, len(kinds)))
+
+
+def test_fleet_wide_prot_rise_is_not_an_outlier() -> None:
+    """Test protTemp rising everywhere alike raises nothing."""
+    rng = random.Random(6)  # noqa: S311
+    inputs = {f"dev{i}": _device(rng, "creep") for i in range(5)}
+    results = detect_fleet_anomalies(inputs, NOW)
+    assert all(not anomalies for anomalies in results.values())
+
+
+def test_detector_raises_and_clears_issues() -> None:
+    """Test issues and events follow the anomalies reported by a pass."""
+    hass = MagicMock()
+    detector = TerneoAnomalyDetector(hass, list)
+
+    with patch("custom_components.terneo.anomalies.ir") as mock_ir:
+        detector._report({"dev1": {ANOMALY_FLAPPING: 12}, "dev2": {}})
+        detector._report({"dev1": {ANOMALY_FLAPPING: 14}})
+        mock_ir.async_create_issue.assert_called_once()
+        assert mock_ir.async_create_issue.call_args.args[2] == "load_flapping_dev1"
+        hass.bus.async_fire.assert_called_once_with(
+            "terneo_anomaly",
+            {"client_id": "dev1", "anomaly": ANOMALY_FLAPPING, "value": 12},
+        )
+
+        detector._report({"dev1": {}})
+        mock_ir.async_delete_issue.assert_called_once_with(
+            hass, "terneo", "load_flapping_dev1"
+        )
+        assert detector.active == set()
@@ -0,0 +1,116 @@
+"""Test TerneoMQ telemetry archive."""
+
+import csv
+from datetime import UTC, date, datetime
+from unittest.mock import patch
+
+from custom_components.terneo.archive import RECORD, TerneoArchive
+
+DAY = 86400
+START = datetime(2024, 3, 1, tzinfo=UTC).timestamp()
+
+
+def test_archive_appends_rotates_and_reopens(tmp_path) -> None:
+    """Test records survive growth, daily rotation and reopening."""
+    now = START
+    archive = TerneoArchive(tmp_path, retention_days=2, wall_clock=lambda: now)
+    with patch("custom_components.terneo.archive.SEGMENT_GROWTH", 4):
+        archive.load()
+        for minute in range(10):
+            now = START + minute * 60
+            archive.append("dev1", "floorTemp", 20 + minute / 10)
+            archive.append("dev2", "load", minute % 2)
+            archive.maintain()
+        # Text payloads and unknown keys are not archived
+        archive.append("dev1", "version", "1.2")
+        archive.append("dev1", "unknown", 1)
+        assert archive.dropped == 0
+        # The next segment is opened ahead of midnight and used after it
+        now = START + DAY - 60
+        archive.maintain()
+        now = START + DAY + 30
+        archive.append("dev2", "setTemp", 24.5)
+    archive.close()
+
+    segment = tmp_path / "2024-03-01.bin"
+    assert segment.stat().st_size >= 20 * RECORD.size
+    assert sorted(archive.segments) == [
+        date(2024, 3, 1),
+        date(2024, 3, 2),
+    ]
+
+    reopened = TerneoArchive(tmp_path, retention_days=2, wall_clock=lambda: now)
+    reopened.load()
+    records = list(
+        reopened.iter_records(
+            datetime(2024, 3, 1, tzinfo=UTC), datetime(2024, 3, 3, tzinfo=UTC)
+        )
+    )
+    assert len(records) == 21
+    assert records[0] == (datetime(2024, 3, 1, tzinfo=UTC), "dev1", "floorTemp", 20.0)
+    assert records[-1][1:] == ("dev2", "setTemp", 24.5)
+    assert [value for _, _, key, value in records if key == "load"][:4] == [
+        0,
+        1,
+        0,
+        1,
+    ]
+
+    # Until the third day's segment is ready its records join the second day
+    now = START + 2 * DAY
+    reopened.append("dev3", "floorTemp", 21.0)
+    assert (tmp_path / "devices.json").read_text() == '["dev1", "dev2"]'
+    reopened.maintain()
+    assert not segment.exists()
+    assert sorted(reopened.segments) == [date(2024, 3, 2), date(2024, 3, 3)]
+    assert (tmp_path / "devices.json").read_text() == '["dev1", "dev2", "dev3"]'
+    now += 60
+    reopened.append("dev3", "floorTemp", 21.5)
+    reopened.close()
+    records = list(
+        reopened.iter_records(
+            datetime(2024, 3, 3, tzinfo=UTC), datetime(2024, 3, 4, tzinfo=UTC)
+        )
+    )
+    assert [value for _, _, _, value in records] == [21.0, 21.5]
+
+
+def test_archive_drops_records_when_segment_is_full(tmp_path) -> None:
+    """Test appending never grows the file itself."""
+    archive = TerneoArchive(tmp_path, retention_days=1, wall_clock=lambda: START)
+    with patch("custom_components.terneo.archive.SEGMENT_GROWTH", 2):
+        archive.load()
+        for _ in range(3):
+            archive.append("dev1", "floorTemp", 21.0)
+        assert archive.dropped == 1
+        archive.maintain()
+        archive.append("dev1", "floorTemp", 21.0)
+    archive.close()
+    assert archive.dropped == 1
+
+
+def test_export_streams_time_range_to_csv(tmp_path) -> None:
+    """Test the CSV export is limited to the range and devices asked for."""
+    now = START
+    archive = TerneoArchive(tmp_path / "archive", 30, wall_clock=lambda: now)
+    archive.load()
+    for minute in range(60):
+        now = START + minute * 60
+        archive.append("dev1", "floorTemp", 20.0 + minute)
+        archive.append("dev2", "floorTemp", 30.0 + minute)
+
+    path = tmp_path / "export.csv"
+    rows = archive.export_csv(
+        path,
+        datetime(2024, 3, 1, 0, 10, tzinfo=UTC),
+        datetime(2024, 3, 1, 0, 20, tzinfo=UTC),
+        {"dev2"},
+    )
+    archive.close()
+
+    assert rows == 10
+    with path.open(newline="") as file:
+        lines = list(csv.reader(file))
+    assert lines[0] == ["time", "client_id", "key", "value"]
+    assert lines[1] == ["2024-03-01T00:10:00+00:00", "dev2", "floorTemp", "40.0"]
+    assert len(lines) == 11
@@ -0,0 +1,121 @@
+"""Test TerneoMQ bulk commands."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.terneo.bulk import async_bulk_command, bulk_payloads
+from custom_components.terneo.clock import MonotonicClock, VirtualClock
+from custom_components.terneo.outbound import PRIORITY_AUTOMATION
+
+
+def test_bulk_payloads() -> None:
+    """Test fields are converted to payloads in publish order."""
+    assert bulk_payloads(
+        {"bright": 7, "setTemp": 18.0, "powerOff": False, "mode": "away"}
+    ) == [("mode", "4"), ("powerOff", "0"), ("setTemp", "18.0"), ("bright", "7")]
+
+
+@pytest.mark.asyncio
+async def test_bulk_command_bounds_concurrency_and_reports_each_device() -> None:
+    """Test devices are commanded concurrently up to the limit."""
+    running = 0
+    peak = 0
+    published: dict[str, list] = {}
+    clock = MonotonicClock(MagicMock(loop=asyncio.get_running_loop()))
+
+    def _coordinator(client_id: str, fail: bool = False) -> MagicMock:
+        async def _publish(key: str, payload: str, priority: int) -> None:
+            assert priority == PRIORITY_AUTOMATION
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0)
+            running -= 1
+            if fail and key == "setTemp":
+                message = "broker gone"
+                raise HomeAssistantError(message)
+            published.setdefault(client_id, []).append((key, payload))
+
+        coordinator = MagicMock()
+        coordinator.client_id = client_id
+        coordinator.clock = clock
+        coordinator.publish_command = _publish
+        return coordinator
+
+    coordinators = [_coordinator(f"dev{i}") for i in range(7)]
+    coordinators.append(_coordinator("broken", fail=True))
+
+    with patch(
+        "custom_components.terneo.bulk.random.uniform", return_value=0.001
+    ) as mock_uniform:
+        results = await async_bulk_command(
+            coordinators, {"setTemp": 18, "powerOff": False}, 3, jitter=0.001
+        )
+
+    assert peak == 3
+    assert len(results) == 8
+    assert results["dev0"] == {"success": True, "published": ["powerOff", "setTemp"]}
+    assert published["dev6"] == [("powerOff", "0"), ("setTemp", "18")]
+    assert results["broken"] == {
+        "success": False,
+        "published": ["powerOff"],
+        "error": "broker gone",
+    }
+    assert mock_uniform.call_count == 8
+    mock_uniform.assert_called_with(0, 0.001)
+
+
+@pytest.mark.asyncio
+async def test_bulk_command_jitter_does_not_hold_a_slot() -> None:
+    """Test devices wait out their jitter concurrently."""
+    clock = MonotonicClock(MagicMock(loop=asyncio.get_running_loop()))
+    coordinators = []
+    for i in range(10):
+        coordinator = MagicMock()
+        coordinator.client_id = f"dev{i}"
+        coordinator.clock = clock
+        coordinator.publish_command = AsyncMock()
+        coordinators.append(coordinator)
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    with patch("custom_components.terneo.bulk.random.uniform", return_value=0.02):
+        results = await async_bulk_command(coordinators, {"setTemp": 18}, 1, 0.02)
+
+    assert all(result["success"] for result in results.values())
+    # Sleeping inside the single slot would take 10 x 0.02 s
+    assert loop.time() - started < 0.1
+
+
+@pytest.mark.asyncio
+async def test_bulk_command_jitter_runs_on_the_coordinator_clock() -> None:
+    """Test each device waits its jitter in virtual time."""
+    clock = VirtualClock()
+    coordinators = []
+    for i in range(3):
+        coordinator = MagicMock()
+        coordinator.client_id = f"dev{i}"
+        coordinator.clock = clock
+        coordinator.publish_command = AsyncMock()
+        coordinators.append(coordinator)
+
+    with patch("custom_components.terneo.bulk.random.uniform", side_effect=[5, 1, 3]):
+        task = asyncio.ensure_future(
+            async_bulk_command(coordinators, {"setTemp": 18}, jitter=5)
+        )
+        for _ in range(5):
+            await asyncio.sleep(0)
+    assert not any(c.publish_command.await_count for c in coordinators)
+
+    clock.advance(1)
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert [c.publish_command.await_count for c in coordinators] == [0, 1, 0]
+
+    clock.advance(4)
+    results = await task
+    assert all(result["success"] for result in results.values())
+    assert [c.publish_command.await_count for c in coordinators] == [1, 1, 1]
@@ -1,10 +1,12 @@
 """Test TerneoMQ climate entity."""
 
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from homeassistant.helpers.restore_state import RestoredExtraData
 
 from custom_components.terneo.climate import TerneoMQTTClimate
+from custom_components.terneo.clock import VirtualClock
 
 
 @pytest.mark.asyncio
@@ -272,6 +274,7 @@ async def test_climate_async_set_hvac_mode_heat_from_off() -> None:
     hass = MagicMock()
     hass.loop.create_task = MagicMock()
     coordinator = MagicMock()
+    coordinator.clock = VirtualClock()
     coordinator.client_id = "terneo_ax_1B0026"
     coordinator.telemetry_prefix = "terneo"
     coordinator.command_prefix = "terneo"
@@ -298,6 +301,7 @@ async def test_climate_async_set_hvac_mode_auto_from_off() -> None:
     hass = MagicMock()
     hass.loop.create_task = MagicMock()
     coordinator = MagicMock()
+    coordinator.clock = VirtualClock()
     coordinator.client_id = "terneo_ax_1B0026"
     coordinator.telemetry_prefix = "terneo"
     coordinator.command_prefix = "terneo"
@@ -322,6 +326,7 @@ async def test_climate_async_set_hvac_mode_off_updates_power_off() -> None:
     hass = MagicMock()
     hass.loop.create_task = MagicMock()
     coordinator = MagicMock()
+    coordinator.clock = VirtualClock()
     coordinator.client_id = "terneo_ax_1B0026"
     coordinator.telemetry_prefix = "terneo"
     coordinator.command_prefix = "terneo"
@@ -353,12 +358,12 @@ async def test_climate_power_off_clears_optimistic_mode() -> None:
     entity.async_write_ha_state = MagicMock()
 
     entity._optimistic_mode = "auto"
-    entity._optimistic_task = MagicMock()
+    entity._unsub_optimistic_reset = MagicMock()
 
     entity._handle_coordinator_update("powerOff", 1)
 
     assert entity._optimistic_mode is None
-    assert entity._optimistic_task is None
+    assert entity._unsub_optimistic_reset is None
     assert entity._attr_hvac_mode == "off"
     assert entity._attr_hvac_action == "off"
     entity.async_write_ha_state.assert_called_once()
@@ -444,6 +449,7 @@ async def test_climate_async_set_temperature() -> None:
     hass = MagicMock()
     hass.loop.create_task = MagicMock()
     coordinator = MagicMock()
+    coordinator.clock = VirtualClock()
     coordinator.client_id = "terneo_ax_1B0026"
     coordinator.telemetry_prefix = "terneo"
     coordinator.command_prefix = "terneo"
@@ -468,6 +474,7 @@ async def test_climate_async_set_temperature_from_off() -> None:
     hass = MagicMock()
     hass.loop.create_task = MagicMock()
     coordinator = MagicMock()
+    coordinator.clock = VirtualClock()
     coordinator.client_id = "terneo_ax_1B0026"
     coordinator.telemetry_prefix = "terneo"
     coordinator.command_prefix = "terneo"
@@ -496,6 +503,7 @@ async def test_climate_async_set_temperature_from_auto_optimistic_heat() -> None
     hass = MagicMock()
     hass.loop.create_task = MagicMock()
     coordinator = MagicMock()
+    coordinator.clock = VirtualClock()
     coordinator.client_id = "terneo_ax_1B0026"
     coordinator.telemetry_prefix = "terneo"
     coordinator.command_prefix = "terneo"
@@ -514,7 +522,7 @@ async def test_climate_async_set_temperature_from_auto_optimistic_heat() -> None
     assert entity._attr_target_temperature == 25.0
     assert entity._attr_hvac_mode == "heat"
     assert entity._optimistic_mode == "heat"
-    assert entity._optimistic_task is not None
+    assert entity._unsub_optimistic_reset is not None
     entity.async_write_ha_state.assert_called_once()
 
 
@@ -636,6 +644,7 @@ async def test_climate_optimistic_mode_heat() -> None:
     hass = MagicMock()
     hass.loop.create_task = MagicMock()
     coordinator = MagicMock()
+    coordinator.clock = VirtualClock()
     coordinator.client_id = "terneo_ax_1B0026"
     coordinator.telemetry_prefix = "terneo"
     coordinator.command_prefix = "terneo"
@@ -656,7 +665,7 @@ async def test_climate_optimistic_mode_heat() -> None:
     # Should be optimistically set to HEAT
     assert entity._attr_hvac_mode == "heat"
     assert entity._optimistic_mode == "heat"
-    assert entity._optimistic_task is not None
+    assert entity._unsub_optimistic_reset is not None
 
     # Simulate powerOff=0 message (from the command)
     entity._handle_coordinator_update("powerOff", 0)
@@ -678,7 +687,7 @@ async def test_climate_optimistic_mode_heat() -> None:
     # Should still be HEAT, and optimistic mode reset since load=1 confirms heating
     assert entity._attr_hvac_mode == "heat"
     assert entity._optimistic_mode is None
-    assert entity._optimistic_task is None
+    assert entity._unsub_optimistic_reset is None
 
 
 @pytest.mark.asyncio
@@ -687,6 +696,7 @@ async def test_climate_optimistic_mode_temperature_auto() -> None:
     hass = MagicMock()
     hass.loop.create_task = MagicMock()
     coordinator = MagicMock()
+    coordinator.clock = VirtualClock()
     coordinator.client_id = "terneo_ax_1B0026"
     coordinator.telemetry_prefix = "terneo"
     coordinator.command_prefix = "terneo"
@@ -709,7 +719,7 @@ async def test_climate_optimistic_mode_temperature_auto() -> None:
     # Should be optimistically set to AUTO
     assert entity._attr_hvac_mode == "auto"
     assert entity._optimistic_mode == "auto"
-    assert entity._optimistic_task is not None
+    assert entity._unsub_optimistic_reset is not None
     assert entity._attr_target_temperature == 20.0
 
     # Simulate load=1 message (device still thinks it should heat)
@@ -725,4 +735,124 @@ async def test_climate_optimistic_mode_temperature_auto() -> None:
     # Should still be AUTO, and optimistic mode reset since load=0 confirms AUTO
     assert entity._attr_hvac_mode == "auto"
     assert entity._optimistic_mode is None
-    assert entity._optimistic_task is None
+    assert entity._unsub_optimistic_reset is None
+
+
+@pytest.mark.asyncio
+async def test_climate_optimistic_mode_times_out() -> None:
+    """Test optimistic mode is reset by the clock after the timeout."""
+    hass = MagicMock()
+    coordinator = MagicMock()
+    coordinator.client_id = "terneo_ax_1B0026"
+    coordinator.telemetry_prefix = "terneo"
+    coordinator.command_prefix = "terneo"
+    coordinator.supports_air_temp = True
+    coordinator.publish_command = AsyncMock()
+    coordinator.clock = VirtualClock()
+    entity = TerneoMQTTClimate(hass, coordinator, "AX")
+    entity.async_write_ha_state = MagicMock()
+    entity._power_off = 1
+    entity._load = 0
+
+    await entity.async_set_hvac_mode("heat")
+    assert entity._optimistic_mode == "heat"
+
+    coordinator.clock.advance(59)
+    assert entity._optimistic_mode == "heat"
+
+    coordinator.clock.advance(1)
+    assert entity._optimistic_mode is None
+    assert entity._unsub_optimistic_reset is None
+
+
+@pytest.mark.asyncio
+async def test_climate_ignores_stale_telemetry_while_pending() -> None:
+    """Test telemetry older than a command does not flip the state back."""
+    hass = MagicMock()
+    coordinator = MagicMock()
+    coordinator.clock = VirtualClock()
+    coordinator.client_id = "terneo_ax_1B0026"
+    coordinator.telemetry_prefix = "terneo"
+    coordinator.command_prefix = "cmd"
+    coordinator.supports_air_temp = True
+    coordinator.publish_command = AsyncMock()
+    coordinator.get_value.return_value = 0
+    entity = TerneoMQTTClimate(hass, coordinator, "AX")
+    entity.async_write_ha_state = MagicMock()
+    entity._power_off = 0
+    entity._load = 0
+    entity._update_hvac_mode_from_temps()
+
+    await entity.async_set_hvac_mode("off")
+    entity._handle_coordinator_update("powerOff", 0)
+    assert entity._attr_hvac_mode == "off"
+    assert entity._power_off == 1
+
+    entity._handle_coordinator_update("powerOff", 1)
+    assert entity._attr_hvac_mode == "off"
+    assert "powerOff" not in entity._pending
+
+    await entity.async_set_temperature(temperature=25.0)
+    entity._handle_coordinator_update("setTemp", 21.0)
+    assert entity._attr_target_temperature == 25.0
+
+    reported = {"powerOff": 1, "mode": 0, "setTemp": 21.0}
+    coordinator.get_value.side_effect = reported.get
+    coordinator.clock.advance(60)
+    assert entity._attr_target_temperature == 21.0
+    assert entity._power_off == 1
+    assert entity._attr_hvac_mode == "off"
+
+
+@pytest.mark.asyncio
+async def test_climate_snapshot_writes_state_once() -> None:
+    """Test a bootstrap snapshot applies every cached key with a single write."""
+    hass = MagicMock()
+    coordinator = MagicMock()
+    coordinator.clock = VirtualClock()
+    coordinator.client_id = "terneo_ax_1B0026"
+    coordinator.telemetry_prefix = "terneo"
+    coordinator.command_prefix = "terneo"
+    coordinator.supports_air_temp = False
+    cached = {"floorTemp": 20.0, "setTemp": 23.0, "load": 1, "powerOff": 0, "mode": 1}
+    coordinator.get_value.side_effect = cached.get
+    entity = TerneoMQTTClimate(hass, coordinator, "AX")
+    entity.async_write_ha_state = MagicMock()
+
+    entity._handle_snapshot()
+
+    entity.async_write_ha_state.assert_called_once()
+    assert entity._attr_hvac_mode == "heat"
+    assert entity._attr_target_temperature == 23.0
+    assert entity._attr_current_temperature == 20.0
+
+
+@pytest.mark.asyncio
+async def test_climate_reduced_recording_restores_from_extra_data() -> None:
+    """Test restore-only values leave the state attributes when reduced."""
+    hass = MagicMock()
+    coordinator = MagicMock()
+    coordinator.clock = VirtualClock()
+    coordinator.client_id = "terneo_ax_1B0026"
+    coordinator.telemetry_prefix = "terneo"
+    coordinator.command_prefix = "terneo"
+    coordinator.supports_air_temp = False
+    coordinator.get_value.return_value = None
+    entity = TerneoMQTTClimate(hass, coordinator, "AX", reduced_recording=True)
+    entity.async_write_ha_state = MagicMock()
+    entity.async_get_last_state = AsyncMock(
+        return_value=MagicMock(attributes={"temperature": 22.0}, state="auto")
+    )
+    entity.async_get_last_extra_data = AsyncMock(
+        return_value=RestoredExtraData({"power_off": 1, "load": 0})
+    )
+
+    with patch("custom_components.terneo.climate.async_dispatcher_connect"):
+        await entity.async_added_to_hass()
+
+    assert entity._power_off == 1
+    assert entity._load == 0
+    assert entity.extra_state_attributes == {}
+    assert entity.extra_restore_state_data.as_dict() == {"power_off": 1, "load": 0}
+    entity._handle_coordinator_update("floorTemp", 20.0625)
+    assert entity._attr_current_temperature == 20.1
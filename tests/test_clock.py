@@ -0,0 +1,53 @@
+"""Test TerneoMQ clock abstraction."""
+
+from unittest.mock import MagicMock
+
+from custom_components.terneo.clock import MonotonicClock, VirtualClock, get_clock
+from custom_components.terneo.const import DATA_CLOCK, DOMAIN
+
+
+def test_virtual_clock_fires_timers_in_order() -> None:
+    """Test timers fire in deadline order as the clock advances."""
+    clock = VirtualClock()
+    fired = []
+
+    clock.call_later(10, lambda: fired.append(("b", clock.monotonic())))
+    clock.call_later(5, lambda: fired.append(("a", clock.monotonic())))
+    cancel = clock.call_later(7, lambda: fired.append(("cancelled", 0)))
+    cancel()
+
+    clock.advance(4)
+    assert fired == []
+    assert clock.monotonic() == 4
+
+    clock.advance(20)
+    assert fired == [("a", 5), ("b", 10)]
+    assert clock.monotonic() == 24
+
+
+def test_virtual_clock_track_interval() -> None:
+    """Test interval tracking runs repeatedly until cancelled."""
+    clock = VirtualClock()
+    action = MagicMock()
+
+    cancel = clock.track_interval(action, 300)
+    clock.advance(7 * 24 * 3600)
+    assert action.call_count == 2016
+
+    cancel()
+    clock.advance(3600)
+    assert action.call_count == 2016
+
+
+def test_get_clock_defaults_to_monotonic() -> None:
+    """Test the shared clock is created once and can be overridden."""
+    hass = MagicMock()
+    hass.data = {}
+
+    clock = get_clock(hass)
+    assert isinstance(clock, MonotonicClock)
+    assert get_clock(hass) is clock
+
+    virtual = VirtualClock()
+    hass.data[DOMAIN][DATA_CLOCK] = virtual
+    assert get_clock(hass) is virtual
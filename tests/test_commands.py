@@ -0,0 +1,171 @@
+"""Test TerneoMQ command delivery tracking."""
+
+import asyncio
+import logging
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.terneo.clock import VirtualClock
+from custom_components.terneo.commands import TerneoCommandTracker
+from custom_components.terneo.coordinator import TerneoCoordinator
+from custom_components.terneo.outbound import PRIORITY_AUTOMATION, PRIORITY_BACKGROUND
+
+
+def _make_tracker():
+    clock = VirtualClock()
+    hass = MagicMock()
+    publish = MagicMock()
+    on_change = MagicMock()
+    tracker = TerneoCommandTracker(hass, clock, publish, on_change)
+    return tracker, clock, hass, publish, on_change
+
+
+def test_echo_confirms_command_and_records_rtt() -> None:
+    """Test a matching echo confirms the command and measures latency."""
+    tracker, clock, _, publish, on_change = _make_tracker()
+
+    tracker.track("setTemp", 22.0, "22", False)
+    assert tracker.pending == 1
+    clock.advance(0.4)
+    tracker.handle_echo("setTemp", 21.0)
+    assert tracker.pending == 1
+
+    tracker.handle_echo("setTemp", 22.0)
+    assert tracker.pending == 0
+    assert tracker.confirmed == 1
+    assert tracker.last_rtt == pytest.approx(0.4)
+    assert tracker.average_rtt == pytest.approx(0.4)
+    on_change.assert_called_once()
+
+    clock.advance(60)
+    publish.assert_not_called()
+    assert tracker.retries == 0
+
+
+def test_unconfirmed_command_is_retried_then_fails() -> None:
+    """Test retries back off exponentially and give up after the last attempt."""
+    tracker, clock, hass, publish, _ = _make_tracker()
+
+    tracker.track("powerOff", 1, "1", True, PRIORITY_BACKGROUND)
+    clock.advance(5)
+    assert tracker.retries == 1
+    # Retried at the priority it was first published with
+    publish.assert_called_once_with("powerOff", "1", True, PRIORITY_BACKGROUND)
+    hass.async_create_task.assert_called_once()
+
+    clock.advance(9.9)
+    assert tracker.retries == 1
+    clock.advance(0.1)
+    assert tracker.retries == 2
+
+    clock.advance(20)
+    assert tracker.failures == 1
+    assert tracker.pending == 0
+    assert publish.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_retry_is_logged(caplog: pytest.LogCaptureFixture) -> None:
+    """Test a resend that raises is logged instead of lost."""
+    tracker, clock, hass, publish, _ = _make_tracker()
+    hass.async_create_task = lambda coro, _name: asyncio.ensure_future(coro)
+    publish.side_effect = AsyncMock(side_effect=OSError("broker gone"))
+
+    tracker.track("setTemp", 21, "21", False)
+    with caplog.at_level(logging.WARNING):
+        clock.advance(5)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+    assert "Could not resend command setTemp: broker gone" in caplog.text
+    assert not tracker._retries
+
+
+@pytest.mark.asyncio
+async def test_shutdown_cancels_retries_in_flight() -> None:
+    """Test a resend still waiting to be published is cancelled on shutdown."""
+    tracker, clock, hass, publish, _ = _make_tracker()
+    hass.async_create_task = lambda coro, _name: asyncio.ensure_future(coro)
+    release = asyncio.Event()
+    publish.side_effect = lambda *_args: release.wait()
+
+    tracker.track("setTemp", 21, "21", False)
+    clock.advance(5)
+    (task,) = tracker._retries
+    tracker.shutdown()
+    await asyncio.sleep(0)
+
+    assert task.cancelled()
+    assert not tracker._retries
+
+
+def test_retry_rtt_measured_from_last_attempt() -> None:
+    """Test latency after a retry is measured from the resend."""
+    tracker, clock, _, _, _ = _make_tracker()
+
+    tracker.track("mode", 3, "3", False)
+    clock.advance(5)
+    clock.advance(1)
+    tracker.handle_echo("mode", 3)
+    assert tracker.last_rtt == pytest.approx(1)
+
+    tracker.track("mode", 0, "0", False)
+    clock.advance(0.2)
+    tracker.shutdown()
+    assert tracker.pending == 0
+    clock.advance(60)
+    assert tracker.retries == 1
+
+
+@pytest.mark.asyncio
+async def test_coordinator_tracks_only_with_separate_prefixes() -> None:
+    """Test commands are tracked only when their echo is distinguishable."""
+    hass = MagicMock()
+    shared = TerneoCoordinator(hass, "dev", "terneo", "terneo", clock=VirtualClock())
+    split = TerneoCoordinator(hass, "dev", "terneo", "cmd", clock=VirtualClock())
+
+    with patch(
+        "custom_components.terneo.coordinator.mqtt.async_publish", AsyncMock()
+    ) as mock_publish:
+        await shared.publish_command("setTemp", "22")
+        await split.publish_command("setTemp", "22")
+        await split.publish_command("floorTemp", "22")
+
+    assert mock_publish.call_count == 3
+    assert shared.commands.pending == 0
+    assert split.commands.pending == 1
+
+    msg = MagicMock()
+    msg.topic = "cmd/dev/setTemp"
+    msg.payload = "22"
+    with patch("custom_components.terneo.coordinator.async_dispatcher_send"):
+        split._handle_message(msg)
+        assert split.commands.pending == 1
+        msg.topic = "terneo/dev/setTemp"
+        split._handle_message(msg)
+    assert split.commands.pending == 0
+    assert split.commands.confirmed == 1
+
+
+@pytest.mark.asyncio
+async def test_coordinator_retries_at_command_priority() -> None:
+    """Test an unconfirmed automation command is not retried as interactive."""
+    clock = VirtualClock()
+    governor = MagicMock()
+    governor.async_acquire = AsyncMock()
+    coordinator = TerneoCoordinator(
+        MagicMock(), "dev", "terneo", "cmd", clock=clock, publish_governor=governor
+    )
+
+    with patch("custom_components.terneo.coordinator.mqtt.async_publish", AsyncMock()):
+        await coordinator.publish_command("setTemp", "18", priority=PRIORITY_AUTOMATION)
+        clock.advance(5)
+        retry = coordinator.hass.async_create_task.call_args.args[0]
+        await retry
+
+    assert governor.async_acquire.await_args_list[-1].args == (
+        "dev",
+        PRIORITY_AUTOMATION,
+    )
+    assert governor.async_acquire.await_count == 2
@@ -1,6 +1,6 @@
 """Test TerneoMQ config flow."""
 
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from homeassistant import config_entries
@@ -106,3 +106,37 @@ async def test_options_flow() -> None:
         "command_prefix": "cmd",
         "rated_power_w": 1500,
     }
+    # Options are applied by the update listener, not by a reload
+    hass.config_entries.async_reload.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_discovery_flow_adds_device() -> None:
+    """Test confirming a discovered device adds it to its entry."""
+    hass = MagicMock()
+    config_entry = MagicMock()
+    config_entry.title = "TerneoMQ"
+    hass.config_entries.async_get_entry.return_value = config_entry
+    hass.config_entries.async_entry_for_domain_unique_id.return_value = None
+    hass.config_entries.flow.async_progress_by_handler.return_value = []
+    flow = TerneoMQTTConfigFlow()
+    flow.hass = hass
+    flow.context = {}
+
+    result = await flow.async_step_integration_discovery(
+        {"entry_id": "test_entry", "client_id": "terneo_ax_3"}
+    )
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "discovery_confirm"
+    assert flow.unique_id == "terneo_ax_3"
+
+    with patch(
+        "custom_components.terneo.config_flow.async_add_device",
+        AsyncMock(return_value=True),
+    ) as mock_add_device:
+        result = await flow.async_step_discovery_confirm({})
+
+    mock_add_device.assert_awaited_once_with(hass, config_entry, "terneo_ax_3")
+    assert result["type"] == FlowResultType.ABORT
+    assert result["reason"] == "device_added"
@@ -0,0 +1,123 @@
+"""Test TerneoMQ coordinator."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.terneo.clock import VirtualClock
+from custom_components.terneo.coordinator import TerneoCoordinator
+
+
+def _message(topic: str, payload: str) -> MagicMock:
+    msg = MagicMock()
+    msg.topic = topic
+    msg.payload = payload
+    return msg
+
+
+@pytest.mark.asyncio
+async def test_bootstrap_fills_cache_then_sends_one_snapshot() -> None:
+    """Test a retained burst only fills the cache until telemetry settles."""
+    clock = VirtualClock()
+    coordinator = TerneoCoordinator(MagicMock(), "dev", "terneo", "terneo", clock=clock)
+
+    with (
+        patch("custom_components.terneo.coordinator.mqtt") as mock_mqtt,
+        patch(
+            "custom_components.terneo.coordinator.async_dispatcher_send"
+        ) as mock_send,
+    ):
+        mock_mqtt.async_subscribe = AsyncMock(return_value=MagicMock())
+        await coordinator.async_setup()
+        assert coordinator.bootstrapping
+
+        for key, payload in (("floorTemp", "21.5"), ("load", "1"), ("setTemp", "23")):
+            coordinator._handle_message(_message(f"terneo/dev/{key}", payload))
+            clock.advance(0.3)
+        mock_send.assert_not_called()
+        assert coordinator.get_value("load") == 1
+
+        clock.advance(0.25)
+        assert not coordinator.bootstrapping
+        mock_send.assert_called_once_with(coordinator.hass, "terneo_dev_snapshot")
+
+        mock_send.reset_mock()
+        coordinator._handle_message(_message("terneo/dev/load", "0"))
+        mock_send.assert_called_once_with(
+            coordinator.hass, "terneo_dev_update", "load", 0
+        )
+
+        # A reconnect starts another bootstrap bounded by the deadline
+        status_callback = mock_mqtt.async_subscribe_connection_status.call_args[0][1]
+        status_callback(True)
+        mock_send.reset_mock()
+        for i in range(20):
+            coordinator._handle_message(_message("terneo/dev/floorTemp", str(20 + i)))
+            clock.advance(0.4)
+        signals = [call.args[1] for call in mock_send.call_args_list]
+        assert signals == ["terneo_dev_snapshot"] + ["terneo_dev_update"] * 7
+
+        await coordinator.async_teardown()
+    mock_mqtt.async_subscribe_connection_status.return_value.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_change_filter_skips_jitter_but_not_control_keys() -> None:
+    """Test insignificant changes update the cache without notifying entities."""
+    clock = VirtualClock()
+    coordinator = TerneoCoordinator(MagicMock(), "dev", "terneo", "terneo", clock=clock)
+    coordinator.set_change_filter(0.2, 30, 120)
+
+    with patch(
+        "custom_components.terneo.coordinator.async_dispatcher_send"
+    ) as mock_send:
+        for payload in ("21.5", "21.6", "21.4", "21.5"):
+            coordinator._handle_message(_message("terneo/dev/floorTemp", payload))
+            clock.advance(1)
+        for payload in ("1", "0", "1"):
+            coordinator._handle_message(_message("terneo/dev/load", payload))
+        assert coordinator.get_value("floorTemp") == 21.5
+        updates = [call.args[2:] for call in mock_send.call_args_list]
+        assert updates == [("floorTemp", 21.5), ("load", 1), ("load", 0), ("load", 1)]
+
+        # A significant change inside the minimum interval is delivered late
+        mock_send.reset_mock()
+        coordinator._handle_message(_message("terneo/dev/floorTemp", "22.0"))
+        coordinator._handle_message(_message("terneo/dev/floorTemp", "22.5"))
+        mock_send.assert_not_called()
+        clock.advance(26)
+        mock_send.assert_called_once_with(
+            coordinator.hass, "terneo_dev_update", "floorTemp", 22.5
+        )
+
+        # An unchanged value still passes after the maximum silent interval
+        mock_send.reset_mock()
+        clock.advance(119)
+        coordinator._handle_message(_message("terneo/dev/floorTemp", "22.5"))
+        mock_send.assert_not_called()
+        clock.advance(1)
+        coordinator._handle_message(_message("terneo/dev/floorTemp", "22.5"))
+        mock_send.assert_called_once()
+    assert coordinator.changes.suppressed == 6
+
+
+@pytest.mark.asyncio
+async def test_shed_value_is_not_filtered_as_unchanged() -> None:
+    """Test a value shed by the ingest budget passes the filter next time."""
+    clock = VirtualClock()
+    budget = MagicMock()
+    budget.admit.side_effect = [False, True]
+    coordinator = TerneoCoordinator(
+        MagicMock(), "dev", "terneo", "terneo", clock=clock, ingest_budget=budget
+    )
+
+    with patch(
+        "custom_components.terneo.coordinator.async_dispatcher_send"
+    ) as mock_send:
+        coordinator._handle_message(_message("terneo/dev/protTemp", "30.0"))
+        clock.advance(1)
+        coordinator._handle_message(_message("terneo/dev/protTemp", "30.0"))
+    assert coordinator.ingest.shed == 1
+    mock_send.assert_called_once_with(
+        coordinator.hass, "terneo_dev_update", "protTemp", 30.0
+    )
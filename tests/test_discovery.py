@@ -0,0 +1,69 @@
+"""Test TerneoMQ device discovery."""
+
+from unittest.mock import MagicMock, patch
+
+from homeassistant.config_entries import SOURCE_INTEGRATION_DISCOVERY
+
+from custom_components.terneo.const import DATA_HUB, DOMAIN
+from custom_components.terneo.discovery import TerneoDiscovery
+
+
+def test_discovery_offers_unknown_devices_once() -> None:
+    """Test unknown devices start a single discovery flow."""
+    hass = MagicMock()
+    hub = MagicMock()
+    hub.has_device.side_effect = lambda _prefix, client_id: client_id == "known"
+    hass.data = {DOMAIN: {DATA_HUB: hub}}
+    entry = MagicMock()
+    entry.entry_id = "test_entry"
+    discovery = TerneoDiscovery(hass, entry, "terneo")
+
+    with patch(
+        "custom_components.terneo.discovery.discovery_flow.async_create_flow"
+    ) as mock_create_flow:
+        for topic in (
+            "terneo/known/floorTemp",
+            "terneo/new_device/floorTemp",
+            "terneo/new_device/floorTemp",
+            "floorTemp",
+        ):
+            msg = MagicMock()
+            msg.topic = topic
+            discovery._handle_message(msg)
+
+    mock_create_flow.assert_called_once_with(
+        hass,
+        DOMAIN,
+        context={"source": SOURCE_INTEGRATION_DISCOVERY},
+        data={"entry_id": "test_entry", "client_id": "new_device"},
+    )
+
+
+def test_discovery_offers_removed_devices_again() -> None:
+    """Test configured devices are not marked seen and forgotten ones return."""
+    hass = MagicMock()
+    hub = MagicMock()
+    configured = {"dev1"}
+    hub.has_device.side_effect = lambda _prefix, client_id: client_id in configured
+    hass.data = {DOMAIN: {DATA_HUB: hub}}
+    entry = MagicMock()
+    entry.entry_id = "test_entry"
+    discovery = TerneoDiscovery(hass, entry, "terneo")
+    msg = MagicMock()
+    msg.topic = "terneo/dev1/floorTemp"
+
+    with patch(
+        "custom_components.terneo.discovery.discovery_flow.async_create_flow"
+    ) as mock_create_flow:
+        discovery._handle_message(msg)
+        mock_create_flow.assert_not_called()
+
+        # Removed from its entry, so it is offered on its next report
+        configured.clear()
+        discovery._handle_message(msg)
+        discovery._handle_message(msg)
+        assert mock_create_flow.call_count == 1
+
+        discovery.forget("dev1")
+        discovery._handle_message(msg)
+        assert mock_create_flow.call_count == 2
@@ -0,0 +1,95 @@
+"""Test TerneoMQ fleet aggregates."""
+
+import random
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from custom_components.terneo.clock import VirtualClock
+from custom_components.terneo.coordinator import TerneoCoordinator
+from custom_components.terneo.fleet import TerneoFleetAggregate
+from custom_components.terneo.sensor import TerneoFleetSensor
+
+
+def test_fleet_totals_follow_device_deltas() -> None:
+    """Test incremental totals match recomputing them and writes are throttled."""
+    rng = random.Random(4)  # noqa: S311
+    clock = VirtualClock()
+    hass = MagicMock()
+    coordinators = [
+        TerneoCoordinator(hass, f"dev{i}", "terneo", "terneo", clock=clock)
+        for i in range(5)
+    ]
+    listeners: dict[str, list] = {}
+
+    def _connect(_hass, signal, target):
+        listeners.setdefault(signal, []).append(target)
+        return lambda: listeners[signal].remove(target)
+
+    with (
+        patch("custom_components.terneo.fleet.async_dispatcher_connect", _connect),
+        patch("custom_components.terneo.fleet.async_dispatcher_send") as mock_send,
+    ):
+        fleet = TerneoFleetAggregate(hass, "entry", rated_power_w=1000)
+        for coordinator in coordinators:
+            fleet.add_device(coordinator)
+        assert fleet.unavailable == 5
+        assert fleet.average_floor_temp is None
+
+        for _ in range(300):
+            coordinator = rng.choice(coordinators[:4])
+            key, value = rng.choice(
+                [
+                    ("load", rng.randint(0, 1)),
+                    ("powerOff", rng.randint(0, 1)),
+                    ("floorTemp", round(rng.uniform(18, 26), 1)),
+                ]
+            )
+            coordinator.set_cached_value(key, value)
+            for listener in listeners[f"terneo_{coordinator.client_id}_update"]:
+                listener(key, value)
+            clock.advance(1)
+
+            reporting = [c for c in coordinators[:4] if c.client_id in fleet._last_seen]
+            floors = [
+                c.get_value("floorTemp")
+                for c in reporting
+                if c.get_value("floorTemp") is not None
+            ]
+            assert fleet.heating == sum(c.get_value("load") == 1 for c in reporting)
+            assert fleet.off == sum(c.get_value("powerOff") == 1 for c in reporting)
+            assert fleet.unavailable == 5 - len(reporting)
+            assert fleet.total_power == fleet.heating * 1000
+            if floors:
+                assert fleet.average_floor_temp == pytest.approx(
+                    sum(floors) / len(floors), abs=0.01
+                )
+        # 300 updates over 300 seconds are written every 10 seconds
+        assert 25 <= mock_send.call_count <= 31
+        mock_send.assert_called_with(hass, "terneo_entry_fleet")
+
+        # Silent devices become unavailable, removed ones leave the totals
+        clock.advance(400)
+        assert fleet.unavailable == 5
+        assert fleet.heating == 0
+        fleet.remove_device("dev4")
+        assert fleet.unavailable == 4
+        fleet.shutdown()
+    assert not any(listeners.values())
+
+
+def test_fleet_sensor_writes_changed_totals() -> None:
+    """Test fleet sensors write only when their own total changed."""
+    fleet = MagicMock()
+    fleet.entry_id = "entry"
+    fleet.as_dict.return_value = {"heating": 2}
+    sensor = TerneoFleetSensor(MagicMock(), fleet, "heating")
+    sensor.async_write_ha_state = MagicMock()
+    assert sensor.native_value == 2
+    assert sensor.unique_id == "entry_fleet_heating"
+
+    sensor._handle_fleet_update()
+    fleet.as_dict.return_value = {"heating": 3}
+    sensor._handle_fleet_update()
+    assert sensor.native_value == 3
+    sensor.async_write_ha_state.assert_called_once()
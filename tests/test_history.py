@@ -0,0 +1,100 @@
+"""Test TerneoMQ in-memory telemetry history."""
+
+from unittest.mock import MagicMock, patch
+
+from custom_components.terneo.clock import VirtualClock
+from custom_components.terneo.coordinator import TerneoCoordinator
+from custom_components.terneo.history import (
+    TerneoRingBuffer,
+    get_recent_samples,
+    history_capacity,
+)
+from custom_components.terneo.hub import TerneoHub
+
+
+def _flatten(segments) -> list[tuple[float, float]]:
+    return [
+        (timestamp, value)
+        for times, values in segments
+        for timestamp, value in zip(times, values, strict=True)
+    ]
+
+
+def test_ring_buffer_wraps_and_slices_without_copying() -> None:
+    """Test the buffer keeps the newest samples as views into its arrays."""
+    buffer = TerneoRingBuffer(4)
+    assert buffer.views() == []
+    for i in range(6):
+        buffer.append(float(i), i * 10.0)
+
+    assert len(buffer) == 4
+    segments = buffer.views()
+    assert len(segments) == 2
+    assert _flatten(segments) == [(2, 20), (3, 30), (4, 40), (5, 50)]
+    assert segments[0][1].obj is buffer._values
+
+    assert _flatten(buffer.views(since=3)) == [(4, 40), (5, 50)]
+    assert _flatten(buffer.views(since=4)) == [(5, 50)]
+    assert buffer.views(since=5) == []
+
+    smaller = buffer.resized(3)
+    assert _flatten(smaller.views()) == [(3, 30), (4, 40), (5, 50)]
+    larger = buffer.resized(8)
+    assert _flatten(larger.views()) == _flatten(segments)
+
+
+def test_coordinator_records_history_and_query_api() -> None:
+    """Test received telemetry can be queried by device and key."""
+    clock = VirtualClock()
+    hass = MagicMock()
+    coordinator = TerneoCoordinator(hass, "dev", "terneo", "terneo", clock=clock)
+    coordinator.set_history_horizon(1)
+    assert coordinator.history["floorTemp"].capacity == history_capacity(1)
+    hub = TerneoHub(hass)
+    hub._coordinators[("terneo", "dev")] = coordinator
+    hass.data = {"terneo": {"hub": hub}}
+
+    with patch("custom_components.terneo.coordinator.async_dispatcher_send"):
+        for i in range(200):
+            msg = MagicMock()
+            msg.topic = "terneo/dev/floorTemp"
+            msg.payload = str(20 + i / 10)
+            coordinator._handle_message(msg)
+            clock.advance(30)
+
+    # One hour at 30 second resolution holds the last 120 samples
+    assert len(coordinator.history["floorTemp"]) == 120
+    recent = _flatten(get_recent_samples(hass, "dev", "floorTemp", 100))
+    assert [value for _, value in recent] == [39.7, 39.8, 39.9]
+    assert get_recent_samples(hass, "dev", "bright", 90) == []
+    assert get_recent_samples(hass, "other", "floorTemp", 90) == []
+
+
+def test_flood_keeps_the_history_horizon() -> None:
+    """Test a burst of samples cannot push the horizon out of the buffer."""
+    clock = VirtualClock()
+    coordinator = TerneoCoordinator(MagicMock(), "dev", "terneo", "terneo", clock=clock)
+    coordinator.set_history_horizon(1)
+
+    with patch("custom_components.terneo.coordinator.async_dispatcher_send"):
+        for i in range(4000):
+            msg = MagicMock()
+            msg.topic = "terneo/dev/floorTemp"
+            msg.payload = str(20 + (i % 50) / 10)
+            coordinator._handle_message(msg)
+            clock.advance(1)
+
+    times, values = coordinator.history["floorTemp"].copy()
+    # One sample per 30 second slot, the latest received in it
+    assert len(times) == history_capacity(1)
+    assert clock.monotonic() - times[0] > 3500
+    assert (times[-1], values[-1]) == (3999, 24.9)
+
+
+def test_transition_history_keeps_changes_and_drops_repeats() -> None:
+    """Test load keeps every switch but not repeats within a slot."""
+    buffer = TerneoRingBuffer(10, 30, keep_transitions=True)
+    for timestamp, value in ((0, 0), (5, 0), (10, 1), (12, 1), (20, 0), (40, 0)):
+        buffer.append(timestamp, value)
+
+    assert _flatten(buffer.views()) == [(0, 0), (10, 1), (20, 0), (40, 0)]
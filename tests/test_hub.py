@@ -0,0 +1,70 @@
+"""Test TerneoMQ shared coordinator hub."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.terneo.hub import TerneoHub, get_hub
+
+
+def _make_coordinator(_hass, client_id, telemetry_prefix, command_prefix, *_, **__):
+    coordinator = MagicMock()
+    coordinator.client_id = client_id
+    coordinator.telemetry_prefix = telemetry_prefix
+    coordinator.command_prefix = command_prefix
+    coordinator.supports_air_temp = True
+    coordinator.async_setup = AsyncMock()
+    coordinator.async_teardown = AsyncMock()
+    return coordinator
+
+
+@pytest.mark.asyncio
+@patch("custom_components.terneo.hub.TerneoCoordinator", side_effect=_make_coordinator)
+async def test_hub_shares_coordinator_between_entries(mock_coordinator) -> None:
+    """Test overlapping entries share one coordinator and subscriptions."""
+    hass = MagicMock()
+    hass.data = {}
+    hub = get_hub(hass)
+    assert get_hub(hass) is hub
+
+    first = await hub.async_acquire("entry_a", "dev1", "terneo", "terneo")
+    second = await hub.async_acquire("entry_b", "dev1", "terneo", "terneo")
+    other = await hub.async_acquire("entry_b", "dev1", "other", "other")
+
+    assert first is second
+    assert other is not first
+    assert mock_coordinator.call_count == 2
+    first.async_setup.assert_awaited_once()
+    assert hub.owners(first) == {"entry_a", "entry_b"}
+    assert hub.entity_owner("terneo", "dev1") == "entry_a"
+
+    await hub.async_release("entry_a", first)
+    first.async_teardown.assert_not_awaited()
+    assert hub.entity_owner("terneo", "dev1") == "entry_b"
+
+    await hub.async_release("entry_b", first)
+    first.async_teardown.assert_awaited_once()
+    assert hub.owners(first) == set()
+
+    # Releasing again is a no-op
+    await hub.async_release("entry_b", first)
+    first.async_teardown.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_hub_recreates_coordinator_after_release() -> None:
+    """Test a released device gets a fresh coordinator on next acquire."""
+    hass = MagicMock()
+    hass.data = {}
+    hub = TerneoHub(hass)
+
+    with patch(
+        "custom_components.terneo.hub.TerneoCoordinator",
+        side_effect=_make_coordinator,
+    ):
+        first = await hub.async_acquire("entry_a", "dev1", "terneo", "terneo")
+        await hub.async_release("entry_a", first)
+        second = await hub.async_acquire("entry_a", "dev1", "terneo", "terneo")
+
+    assert second is not first
+    second.async_setup.assert_awaited_once()
@@ -0,0 +1,86 @@
+"""Test TerneoMQ inbound telemetry rate limiting."""
+
+from unittest.mock import MagicMock
+
+from custom_components.terneo.clock import VirtualClock
+from custom_components.terneo.ingest import (
+    DEVICE_BURST,
+    GLOBAL_BURST,
+    TerneoIngestBudget,
+    TerneoIngestLimiter,
+)
+
+
+def _make_limiter(clock, budget=None):
+    delivered = []
+    on_change = MagicMock()
+    limiter = TerneoIngestLimiter(
+        clock, lambda key, value: delivered.append((key, value)), on_change, budget
+    )
+    return limiter, delivered, on_change
+
+
+def test_limiter_coalesces_latest_value_per_key() -> None:
+    """Test a flooding device keeps only the latest value per key."""
+    clock = VirtualClock()
+    limiter, delivered, on_change = _make_limiter(clock)
+
+    for i in range(int(DEVICE_BURST)):
+        limiter.submit("floorTemp", float(i))
+    assert len(delivered) == DEVICE_BURST
+
+    for i in range(100):
+        limiter.submit("floorTemp", 100.0 + i)
+        limiter.submit("bright", i % 10)
+    limiter.submit("powerOff", 1)
+    assert len(delivered) == DEVICE_BURST
+    assert limiter.backlog == 3
+    assert limiter.received == DEVICE_BURST + 201
+
+    clock.advance(0.2)
+    assert delivered[-1] == ("powerOff", 1)
+    clock.advance(0.4)
+    assert delivered[-2:] == [("floorTemp", 199.0), ("bright", 9)]
+    assert limiter.backlog == 0
+    assert limiter.coalesced == 198
+
+    on_change.assert_not_called()
+    clock.advance(10)
+    on_change.assert_called_once()
+
+
+def test_budget_sheds_low_priority_keys_first() -> None:
+    """Test global overload sheds bright and protTemp before control keys."""
+    clock = VirtualClock()
+    budget = TerneoIngestBudget(clock)
+    limiters = [_make_limiter(clock, budget) for _ in range(20)]
+
+    for limiter, _, _ in limiters:
+        for _ in range(5):
+            limiter.submit("floorTemp", 21.0)
+    assert all(len(delivered) == 5 for _, delivered, _ in limiters)
+
+    for limiter, _, _ in limiters:
+        limiter.submit("protTemp", 30.0)
+        limiter.submit("powerOff", 0)
+    shed = sum(limiter.shed for limiter, _, _ in limiters)
+    assert shed == 20
+    assert all(delivered[-1] == ("powerOff", 0) for _, delivered, _ in limiters)
+
+    clock.advance(GLOBAL_BURST / 100)
+    limiter, delivered, _ = limiters[0]
+    limiter.submit("bright", 3)
+    assert delivered[-1] == ("bright", 3)
+
+
+def test_limiter_shutdown_drops_backlog() -> None:
+    """Test shutdown drops pending values and stops flushing."""
+    clock = VirtualClock()
+    limiter, delivered, _ = _make_limiter(clock)
+
+    for _ in range(int(DEVICE_BURST) + 1):
+        limiter.submit("load", 1)
+    assert limiter.backlog == 1
+    limiter.shutdown()
+    clock.advance(60)
+    assert len(delivered) == DEVICE_BURST
@@ -4,8 +4,20 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from custom_components.terneo import async_setup_entry
-from custom_components.terneo.const import DOMAIN
+from custom_components.terneo import (
+    async_add_device,
+    async_remove_device,
+    async_setup_entry,
+    async_unload_entry,
+    async_update_options,
+)
+from custom_components.terneo.archive import ARCHIVE_MAINTENANCE_INTERVAL
+from custom_components.terneo.clock import VirtualClock
+from custom_components.terneo.const import DATA_CLOCK, DATA_HUB, DATA_RUNTIME, DOMAIN
+from custom_components.terneo.helpers import get_entry_settings
+from custom_components.terneo.outbound import PRIORITY_BACKGROUND
+from custom_components.terneo.runtime import TerneoEntryRuntime
+from custom_components.terneo.scheduler import TerneoScheduler
 
 
 @pytest.mark.asyncio
@@ -30,7 +42,9 @@ async def test_async_setup_entry_resets_status_on_start() -> None:
     coordinator.publish_command = AsyncMock()
     coordinator.set_cached_value = MagicMock()
 
-    with patch("custom_components.terneo.TerneoCoordinator", return_value=coordinator):
+    with patch(
+        "custom_components.terneo.hub.TerneoCoordinator", return_value=coordinator
+    ):
         await async_setup_entry(hass, config_entry)
 
     assert DOMAIN in hass.data
@@ -38,5 +52,238 @@ async def test_async_setup_entry_resets_status_on_start() -> None:
     coordinator.async_setup.assert_awaited_once()
     coordinator.set_cached_value.assert_any_call("powerOff", 1)
     coordinator.set_cached_value.assert_any_call("setTemp", 18.0)
-    coordinator.publish_command.assert_any_await("powerOff", "1")
-    coordinator.publish_command.assert_any_await("setTemp", "18")
+    # The reset is published after the platforms are set up, in the background
+    hass.config_entries.async_forward_entry_setups.assert_awaited_once()
+    coordinator.publish_command.assert_not_awaited()
+    await config_entry.async_create_background_task.call_args.args[1]
+    coordinator.publish_command.assert_any_await(
+        "powerOff", "1", priority=PRIORITY_BACKGROUND
+    )
+    coordinator.publish_command.assert_any_await(
+        "setTemp", "18", priority=PRIORITY_BACKGROUND
+    )
+
+
+@pytest.mark.asyncio
+async def test_device_shared_between_entries_is_shown_once() -> None:
+    """Test a shared device is shown by one entry and handed over on unload."""
+    hass = MagicMock()
+    hass.data = {}
+    hass.config_entries.async_forward_entry_setups = AsyncMock()
+    hass.config_entries.async_unload_platforms = AsyncMock(return_value=True)
+    entries = []
+    for entry_id in ("entry_a", "entry_b"):
+        config_entry = MagicMock()
+        config_entry.entry_id = entry_id
+        config_entry.data = {"devices": [{"client_id": "terneo_ax_1"}]}
+        config_entry.options = {"topic_prefix": "terneo"}
+        entries.append(config_entry)
+    coordinator = MagicMock(async_setup=AsyncMock(), async_teardown=AsyncMock())
+    coordinator.client_id = "terneo_ax_1"
+    coordinator.telemetry_prefix = "terneo"
+
+    with (
+        patch(
+            "custom_components.terneo.hub.TerneoCoordinator", return_value=coordinator
+        ) as mock_coordinator,
+        patch("custom_components.terneo.hub.async_dispatcher_send"),
+        patch("custom_components.terneo.async_dispatcher_send") as mock_send,
+    ):
+        await async_setup_entry(hass, entries[0])
+        await async_setup_entry(hass, entries[1])
+        hub = hass.data[DOMAIN][DATA_HUB]
+
+        mock_coordinator.assert_called_once()
+        assert hub.owners(coordinator) == {"entry_a", "entry_b"}
+        assert hass.data[DOMAIN]["entry_a"] == {"terneo_ax_1": coordinator}
+        assert hass.data[DOMAIN]["entry_b"] == {}
+
+        # The remaining entry takes over once the first one's entities are gone
+        await async_unload_entry(hass, entries[0])
+        coordinator.async_teardown.assert_not_awaited()
+        assert hass.data[DOMAIN]["entry_b"] == {"terneo_ax_1": coordinator}
+        mock_send.assert_called_once_with(
+            hass, "terneo_entry_b_device_added", "terneo_ax_1"
+        )
+
+        await async_unload_entry(hass, entries[1])
+    coordinator.async_teardown.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_async_add_device_without_reload() -> None:
+    """Test a device is added to a loaded entry without reloading it."""
+    hass = MagicMock()
+    config_entry = MagicMock()
+    config_entry.entry_id = "test_entry"
+    config_entry.data = {"devices": [{"client_id": "terneo_ax_1"}]}
+    config_entry.options = {"topic_prefix": "terneo"}
+    existing = MagicMock()
+    hub = MagicMock()
+    hub.entity_owner.return_value = "test_entry"
+    hub.async_acquire = AsyncMock(return_value=MagicMock())
+    runtime = TerneoEntryRuntime(
+        get_entry_settings(config_entry), TerneoScheduler(VirtualClock()).scope()
+    )
+    hass.data = {
+        DOMAIN: {
+            DATA_HUB: hub,
+            DATA_RUNTIME: {"test_entry": runtime},
+            "test_entry": {"terneo_ax_1": existing},
+        }
+    }
+
+    with patch("custom_components.terneo.async_dispatcher_send") as mock_send:
+        assert await async_add_device(hass, config_entry, "terneo_ax_2")
+        assert not await async_add_device(hass, config_entry, "terneo_ax_1")
+
+    hub.async_acquire.assert_awaited_once_with(
+        "test_entry", "terneo_ax_2", "terneo", "terneo", True
+    )
+    assert hass.data[DOMAIN]["test_entry"]["terneo_ax_1"] is existing
+    assert "terneo_ax_2" in hass.data[DOMAIN]["test_entry"]
+    hass.config_entries.async_update_entry.assert_called_once_with(
+        config_entry,
+        data={"devices": [{"client_id": "terneo_ax_1"}, {"client_id": "terneo_ax_2"}]},
+    )
+    mock_send.assert_called_once_with(
+        hass, "terneo_test_entry_device_added", "terneo_ax_2"
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_update_options_applies_changes_in_place() -> None:
+    """Test option changes are applied without reloading the entry."""
+    hass = MagicMock()
+    config_entry = MagicMock()
+    config_entry.entry_id = "test_entry"
+    config_entry.data = {"devices": [{"client_id": "terneo_ax_1"}]}
+    config_entry.options = {"topic_prefix": "terneo", "rated_power_w": 0}
+    coordinator = MagicMock()
+    coordinator.async_set_supports_air_temp = AsyncMock()
+    hass.data = {
+        DOMAIN: {
+            "test_entry": {"terneo_ax_1": coordinator},
+            DATA_RUNTIME: {
+                "test_entry": TerneoEntryRuntime(
+                    get_entry_settings(config_entry),
+                    TerneoScheduler(VirtualClock()).scope(),
+                )
+            },
+        }
+    }
+
+    config_entry.options = {
+        "topic_prefix": "terneo",
+        "rated_power_w": 1500,
+        "supports_air_temp": False,
+    }
+    with patch("custom_components.terneo.async_dispatcher_send") as mock_send:
+        await async_update_options(hass, config_entry)
+
+    coordinator.async_set_supports_air_temp.assert_awaited_once_with(False)
+    mock_send.assert_called_once_with(
+        hass,
+        "terneo_test_entry_options_updated",
+        {"rated_power_w": 1500, "supports_air_temp": False},
+    )
+    hass.config_entries.async_schedule_reload.assert_not_called()
+
+    # Unchanged options are a no-op
+    with patch("custom_components.terneo.async_dispatcher_send") as mock_send:
+        await async_update_options(hass, config_entry)
+    mock_send.assert_not_called()
+
+    # Prefix changes still need a reload
+    config_entry.options = {**config_entry.options, "topic_prefix": "other"}
+    await async_update_options(hass, config_entry)
+    hass.config_entries.async_schedule_reload.assert_called_once_with("test_entry")
+
+
+@pytest.mark.asyncio
+async def test_async_remove_device_without_reload() -> None:
+    """Test a device is removed without touching the other devices."""
+    hass = MagicMock()
+    config_entry = MagicMock()
+    config_entry.entry_id = "test_entry"
+    config_entry.data = {
+        "devices": [{"client_id": "terneo_ax_1"}, {"client_id": "terneo_ax_2"}]
+    }
+    config_entry.options = {"topic_prefix": "terneo"}
+    kept = MagicMock()
+    removed = MagicMock()
+    hub = MagicMock()
+    hub.async_release = AsyncMock()
+    hub.entity_owner.return_value = None
+    runtime = TerneoEntryRuntime(
+        get_entry_settings(config_entry), TerneoScheduler(VirtualClock()).scope()
+    )
+    hass.data = {
+        DOMAIN: {
+            DATA_HUB: hub,
+            DATA_RUNTIME: {"test_entry": runtime},
+            "test_entry": {"terneo_ax_1": kept, "terneo_ax_2": removed},
+        }
+    }
+    device_registry = MagicMock()
+    device_registry.async_get_device.return_value.id = "device_2"
+
+    with (
+        patch("custom_components.terneo.async_dispatcher_send") as mock_send,
+        patch("custom_components.terneo.dr.async_get", return_value=device_registry),
+    ):
+        assert await async_remove_device(hass, config_entry, "terneo_ax_2")
+        assert not await async_remove_device(hass, config_entry, "terneo_ax_3")
+
+    hass.config_entries.async_update_entry.assert_called_once_with(
+        config_entry, data={"devices": [{"client_id": "terneo_ax_1"}]}
+    )
+    device_registry.async_update_device.assert_called_once_with(
+        "device_2", remove_config_entry_id="test_entry"
+    )
+    assert hass.data[DOMAIN]["test_entry"] == {"terneo_ax_1": kept}
+    mock_send.assert_called_once_with(
+        hass, "terneo_test_entry_device_removed", "terneo_ax_2"
+    )
+    hub.async_release.assert_awaited_once_with("test_entry", removed)
+
+
+@pytest.mark.asyncio
+async def test_archive_is_kept_per_entry(tmp_path) -> None:
+    """Test unloading an entry only detaches its own archive."""
+    clock = VirtualClock()
+    hass = MagicMock()
+    hass.data = {DOMAIN: {DATA_CLOCK: clock}}
+    hass.config.path = lambda *parts: str(tmp_path.joinpath(*parts))
+    hass.config_entries.async_forward_entry_setups = AsyncMock()
+    hass.config_entries.async_unload_platforms = AsyncMock(return_value=True)
+
+    async def run_in_executor(target, *args):
+        return target(*args)
+
+    hass.async_add_executor_job = run_in_executor
+    config_entry = MagicMock()
+    config_entry.entry_id = "test_entry"
+    config_entry.data = {"devices": [{"client_id": "terneo_ax_1"}]}
+    config_entry.options = {"topic_prefix": "terneo", "archive_days": 7}
+    coordinator = MagicMock(async_setup=AsyncMock(), async_teardown=AsyncMock())
+    coordinator.archives = []
+    other_archive = MagicMock()
+
+    with patch(
+        "custom_components.terneo.hub.TerneoCoordinator", return_value=coordinator
+    ):
+        await async_setup_entry(hass, config_entry)
+        runtime = hass.data[DOMAIN][DATA_RUNTIME]["test_entry"]
+        assert coordinator.archives == [runtime.archive]
+        coordinator.archives.append(other_archive)
+
+        # File maintenance is handed to the executor on a timer
+        with patch.object(runtime.archive, "maintain") as mock_maintain:
+            clock.advance(ARCHIVE_MAINTENANCE_INTERVAL)
+            config_entry.async_create_background_task.assert_called_once()
+            await config_entry.async_create_background_task.call_args.args[1]
+        mock_maintain.assert_called_once()
+
+        await async_unload_entry(hass, config_entry)
+    assert coordinator.archives == [other_archive]
@@ -4,6 +4,7 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from custom_components.terneo.clock import VirtualClock
 from custom_components.terneo.number import TerneoNumber
 
 
@@ -73,6 +74,7 @@ async def test_number_set_native_value() -> None:
     """Test setting the native value."""
     hass = MagicMock()
     coordinator = MagicMock()
+    coordinator.clock = VirtualClock()
     coordinator.client_id = "terneo_ax_1B0026"
     coordinator.telemetry_prefix = "terneo"
     coordinator.command_prefix = "terneo"
@@ -137,3 +139,66 @@ async def test_number_restore_state() -> None:
     # Should restore value but not publish
     assert entity.native_value == 5.0
     coordinator.publish_command.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_number_pending_value_reconciliation() -> None:
+    """Test stale telemetry is ignored and unconfirmed values roll back."""
+    hass = MagicMock()
+    coordinator = MagicMock()
+    coordinator.clock = VirtualClock()
+    coordinator.client_id = "terneo_ax_1B0026"
+    coordinator.telemetry_prefix = "terneo"
+    coordinator.command_prefix = "cmd"
+    coordinator.publish_command = AsyncMock()
+    coordinator.get_value.return_value = 3
+    entity = TerneoNumber(
+        hass, coordinator, "brightness", "Brightness", 0, 9, 1, "bright", "AX"
+    )
+    entity.async_write_ha_state = MagicMock()
+
+    await entity.async_set_native_value(5.0)
+    entity._handle_coordinator_update("bright", 3)
+    assert entity.native_value == 5
+    entity._handle_coordinator_update("bright", 5)
+    assert entity.native_value == 5
+    assert "bright" not in entity._pending
+
+    await entity.async_set_native_value(7.0)
+    assert entity.native_value == 7
+    coordinator.clock.advance(59)
+    assert entity.native_value == 7
+    coordinator.clock.advance(1)
+    assert entity.native_value == 3
+    assert "bright" not in entity._pending
+
+
+@pytest.mark.asyncio
+async def test_number_pending_registered_before_publish() -> None:
+    """Test an echo during the publish confirms it and failures cancel it."""
+    hass = MagicMock()
+    coordinator = MagicMock()
+    coordinator.clock = VirtualClock()
+    coordinator.client_id = "terneo_ax_1B0026"
+    coordinator.telemetry_prefix = "terneo"
+    coordinator.command_prefix = "terneo"
+    coordinator.get_value.return_value = 3
+    entity = TerneoNumber(
+        hass, coordinator, "brightness", "Brightness", 0, 9, 1, "bright", "AX"
+    )
+    entity.async_write_ha_state = MagicMock()
+
+    async def echo(*_args, **_kwargs) -> None:
+        # With a shared prefix our own publish arrives as telemetry
+        entity._handle_coordinator_update("bright", 5)
+
+    coordinator.publish_command = AsyncMock(side_effect=echo)
+    await entity.async_set_native_value(5.0)
+    assert "bright" not in entity._pending
+    coordinator.clock.advance(60)
+    assert entity.native_value == 5
+
+    coordinator.publish_command = AsyncMock(side_effect=RuntimeError)
+    with pytest.raises(RuntimeError):
+        await entity.async_set_native_value(7.0)
+    assert "bright" not in entity._pending
@@ -0,0 +1,122 @@
+"""Test TerneoMQ outbound publish governor."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from homeassistant.exceptions import HomeAssistantError
+
+from custom_components.terneo.clock import VirtualClock
+from custom_components.terneo.outbound import (
+    PRIORITY_AUTOMATION,
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    PUBLISH_BURST,
+    PUBLISH_RATE,
+    STATS_INTERVAL,
+    TerneoPublishGovernor,
+)
+
+
+@pytest.mark.asyncio
+async def test_governor_orders_by_priority_then_round_robin() -> None:
+    """Test queued publishes go out by class, fairly between devices."""
+    clock = VirtualClock()
+    on_change = MagicMock()
+    governor = TerneoPublishGovernor(clock, on_change)
+    released: list[tuple[str, int]] = []
+
+    async def _publish(client_id: str, priority: int) -> None:
+        await governor.async_acquire(client_id, priority)
+        released.append((client_id, priority))
+
+    # The burst goes out immediately
+    for _ in range(int(PUBLISH_BURST)):
+        await governor.async_acquire("dev0", PRIORITY_BACKGROUND)
+    assert governor.device_stats("dev0").published == int(PUBLISH_BURST)
+
+    tasks = [
+        asyncio.create_task(_publish("dev0", PRIORITY_BACKGROUND)) for _ in range(5)
+    ]
+    tasks += [
+        asyncio.create_task(_publish(f"dev{i}", PRIORITY_AUTOMATION))
+        for i in (1, 1, 1, 2)
+    ]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(_publish("dev3", PRIORITY_INTERACTIVE)))
+    await asyncio.sleep(0)
+    assert governor.queue_depth == 10
+    assert governor.depth(PRIORITY_BACKGROUND) == 5
+    assert governor.device_stats("dev1").queued == 3
+
+    for _ in range(20):
+        clock.advance(1 / PUBLISH_RATE)
+        await asyncio.sleep(0)
+        if not governor.queue_depth:
+            break
+    await asyncio.gather(*tasks)
+
+    assert released == [
+        ("dev3", PRIORITY_INTERACTIVE),
+        ("dev1", PRIORITY_AUTOMATION),
+        ("dev2", PRIORITY_AUTOMATION),
+        ("dev1", PRIORITY_AUTOMATION),
+        ("dev1", PRIORITY_AUTOMATION),
+        *[("dev0", PRIORITY_BACKGROUND)] * 5,
+    ]
+    assert governor.queue_depth == 0
+    stats = governor.device_stats("dev0")
+    assert stats.delayed == 5
+    assert stats.max_wait == pytest.approx(10 / PUBLISH_RATE)
+    assert governor.device_stats("dev3").max_wait == pytest.approx(1 / PUBLISH_RATE)
+
+    on_change.assert_not_called()
+    clock.advance(STATS_INTERVAL)
+    on_change.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_publish_leaves_the_queue() -> None:
+    """Test a cancelled waiter gives up its place and shutdown drops all."""
+    clock = VirtualClock()
+    governor = TerneoPublishGovernor(clock)
+    for _ in range(int(PUBLISH_BURST)):
+        await governor.async_acquire("dev0", PRIORITY_INTERACTIVE)
+
+    cancelled = asyncio.create_task(governor.async_acquire("dev1", PRIORITY_AUTOMATION))
+    waiting = asyncio.create_task(governor.async_acquire("dev2", PRIORITY_AUTOMATION))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await asyncio.gather(cancelled, return_exceptions=True)
+    assert governor.queue_depth == 1
+    assert governor.device_stats("dev1").queued == 0
+
+    governor.shutdown()
+    with pytest.raises(HomeAssistantError):
+        await waiting
+    assert governor.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_discard_drops_only_one_device() -> None:
+    """Test a released device's queued publishes fail and the others go out."""
+    clock = VirtualClock()
+    governor = TerneoPublishGovernor(clock)
+    for _ in range(int(PUBLISH_BURST)):
+        await governor.async_acquire("dev0", PRIORITY_INTERACTIVE)
+
+    dropped = [
+        asyncio.create_task(governor.async_acquire("dev1", priority))
+        for priority in (PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND)
+    ]
+    kept = asyncio.create_task(governor.async_acquire("dev2", PRIORITY_AUTOMATION))
+    await asyncio.sleep(0)
+    governor.discard("dev1")
+
+    for task in dropped:
+        with pytest.raises(HomeAssistantError):
+            await task
+    assert governor.queue_depth == 1
+    assert governor.device_stats("dev1").queued == 0
+    clock.advance(1)
+    await kept
@@ -0,0 +1,110 @@
+"""Measure recorder rows per device-day with and without reduced recording."""
+
+import random
+from unittest.mock import MagicMock, patch
+
+from custom_components.terneo.binary_sensor import TerneoBinarySensor
+from custom_components.terneo.climate import TerneoMQTTClimate
+from custom_components.terneo.clock import VirtualClock
+from custom_components.terneo.coordinator import TerneoCoordinator
+from custom_components.terneo.sensor import (
+    TerneoEnergySensor,
+    TerneoPowerSensor,
+    TerneoSensor,
+)
+
+DAY = 24 * 3600
+
+
+def _count_rows(entity, snapshot) -> list[int]:
+    """Count writes that change the recorded state, like the recorder does."""
+    rows = [0]
+    last = [None]
+
+    def _write() -> None:
+        current = snapshot()
+        if current != last[0]:
+            rows[0] += 1
+            last[0] = current
+
+    entity.async_write_ha_state = _write
+    return rows
+
+
+def _simulate_device_day(reduced: bool) -> dict[str, int]:
+    """Feed one day of simulated telemetry through a coordinator."""
+    clock = VirtualClock()
+    hass = MagicMock()
+    coordinator = TerneoCoordinator(hass, "dev", "terneo", "terneo", False, clock)
+    precision = 1 if reduced else None
+    climate = TerneoMQTTClimate(hass, coordinator, "AX", reduced)
+    floor = TerneoSensor(
+        hass, coordinator, "floorTemp", "Floor", None, None, "°C", precision=precision
+    )
+    prot = TerneoSensor(
+        hass, coordinator, "protTemp", "Prot", None, None, "°C", precision=precision
+    )
+    heating = TerneoBinarySensor(hass, coordinator, "heating", "Heating", None)
+    power = TerneoPowerSensor(hass, coordinator, 1500)
+    energy = TerneoEnergySensor(hass, coordinator, 1500, precision=3 if reduced else 6)
+    rows = {
+        "climate": _count_rows(
+            climate,
+            lambda: (
+                climate.hvac_mode,
+                climate.hvac_action,
+                climate.current_temperature,
+                climate.target_temperature,
+                tuple(sorted(climate.extra_state_attributes.items())),
+            ),
+        ),
+        "floor": _count_rows(floor, lambda: floor.native_value),
+        "prot": _count_rows(prot, lambda: prot.native_value),
+        "heating": _count_rows(heating, lambda: heating.is_on),
+        "power": _count_rows(power, lambda: power.native_value),
+        "energy": _count_rows(energy, lambda: energy.native_value),
+    }
+
+    def _dispatch(_hass, _signal, key, value) -> None:
+        climate._handle_coordinator_update(key, value)
+        for entity in (floor, prot, heating, power):
+            entity._handle_coordinator_update(key, value)
+        energy._handle_load_update(key, value)
+
+    def _publish(key: str, value: float) -> None:
+        msg = MagicMock()
+        msg.topic = f"terneo/dev/{key}"
+        msg.payload = str(value)
+        coordinator._handle_message(msg)
+
+    rng = random.Random(1)  # noqa: S311
+    temperature = 21.0
+    load = 1
+    with patch("custom_components.terneo.coordinator.async_dispatcher_send", _dispatch):
+        _publish("powerOff", 0)
+        _publish("setTemp", 22)
+        for step in range(DAY // 30):
+            temperature += 0.02 if load else -0.01
+            if load and temperature > 22.5:
+                load = 0
+                _publish("load", 0)
+            elif not load and temperature < 21.5:
+                load = 1
+                _publish("load", 1)
+            _publish("floorTemp", round(temperature + rng.gauss(0, 0.05), 2))
+            if step % 2 == 0:
+                _publish("protTemp", round(25 + rng.gauss(0, 0.05), 2))
+            clock.advance(30)
+    return {name: count[0] for name, count in rows.items()}
+
+
+def test_reduced_recording_writes_fewer_rows_per_device_day() -> None:
+    """Test reduced recording cuts rows without touching on/off history."""
+    full = _simulate_device_day(reduced=False)
+    reduced = _simulate_device_day(reduced=True)
+
+    assert reduced["heating"] == full["heating"]
+    assert reduced["power"] == full["power"]
+    assert reduced["climate"] < full["climate"]
+    assert reduced["floor"] < full["floor"]
+    assert sum(reduced.values()) < 0.8 * sum(full.values())
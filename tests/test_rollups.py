@@ -0,0 +1,103 @@
+"""Test TerneoMQ daily rollups."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from custom_components.terneo.clock import VirtualClock
+from custom_components.terneo.coordinator import TerneoCoordinator
+from custom_components.terneo.rollups import TerneoRollup, TerneoRollupEngine
+from custom_components.terneo.sensor import TerneoRollupSensor
+
+
+def test_daily_rollup_accumulates_and_rolls_over() -> None:
+    """Test heating time spans midnight and the range restarts each day."""
+    rollup = TerneoRollup()
+    assert rollup.today(0).heating_hours == 0
+    rollup.add(0, "floorTemp", 21.0)
+    rollup.add(0, "load", 1)
+    rollup.add(1800, "floorTemp", 23.5)
+    rollup.add(3600, "load", 0)
+    rollup.add(5400, "floorTemp", 20.5)
+    rollup.add(7200, "load", 1)
+
+    assert rollup.today(9000) == (1.5, 20.5, 23.5)
+    assert rollup.roll_over(9000, 20.5) == (1.5, 20.5, 23.5)
+    rollup.add(10800, "load", 0)
+    assert rollup.today(12000) == (0.5, 20.5, 20.5)
+    assert rollup.yesterday.as_dict(2000) == {
+        "heating_hours": 1.5,
+        "energy_kwh": 3.0,
+        "floor_min": 20.5,
+        "floor_max": 23.5,
+    }
+    assert rollup.yesterday.as_dict()["energy_kwh"] is None
+
+
+def test_engine_rolls_over_all_devices_from_one_callback() -> None:
+    """Test one midnight callback closes the day of every device."""
+    clock = VirtualClock()
+    hass = MagicMock()
+    coordinators = [
+        TerneoCoordinator(hass, client_id, "terneo", "terneo", clock=clock)
+        for client_id in ("dev1", "dev2")
+    ]
+    with patch("custom_components.terneo.coordinator.async_dispatcher_send"):
+        for coordinator in coordinators:
+            msg = MagicMock()
+            msg.topic = f"terneo/{coordinator.client_id}/load"
+            msg.payload = "1"
+            coordinator._handle_message(msg)
+    clock.advance(1800)
+    sensors = [
+        TerneoRollupSensor(hass, coordinators[0], "heating_hours"),
+        TerneoRollupSensor(hass, coordinators[0], "energy_kwh", 1000),
+    ]
+    for sensor in sensors:
+        sensor.async_write_ha_state = MagicMock()
+        sensor._handle_rollup()
+    assert sensors[0].native_value is None
+
+    engine = TerneoRollupEngine(hass, lambda: coordinators)
+    with patch(
+        "custom_components.terneo.rollups.async_track_time_change"
+    ) as mock_track:
+        engine.start()
+        engine.start()
+    mock_track.assert_called_once_with(
+        hass, engine._roll_over, hour=0, minute=0, second=0
+    )
+    with patch("custom_components.terneo.rollups.async_dispatcher_send") as mock_send:
+        mock_track.call_args.args[1](None)
+    assert [call.args[1] for call in mock_send.call_args_list] == [
+        "terneo_dev1_rollup",
+        "terneo_dev2_rollup",
+    ]
+
+    for sensor in sensors:
+        sensor._handle_rollup()
+    assert sensors[0].native_value == 0.5
+    assert sensors[1].native_value == 0.5
+    sensors[1].set_rated_power(2000)
+    assert sensors[1].native_value == 1.0
+    assert sensors[1].unique_id == "dev1_energy_kwh_yesterday"
+
+    engine.stop()
+    mock_track.return_value.assert_called_once()
+    assert coordinators[1].rollup.today(clock.monotonic()).heating_hours == 0
+
+
+@pytest.mark.asyncio
+async def test_rollup_sensor_restores_last_value() -> None:
+    """Test the previous day's value survives a restart."""
+    coordinator = MagicMock()
+    coordinator.client_id = "dev"
+    sensor = TerneoRollupSensor(MagicMock(), coordinator, "floor_max")
+    last_state = MagicMock()
+    last_state.state = "24.5"
+    with (
+        patch.object(sensor, "async_get_last_state", return_value=last_state),
+        patch("custom_components.terneo.sensor.async_dispatcher_connect"),
+    ):
+        await sensor.async_added_to_hass()
+    assert sensor.native_value == 24.5
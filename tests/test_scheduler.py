@@ -0,0 +1,101 @@
+"""Test TerneoMQ deadline scheduler."""
+
+from unittest.mock import MagicMock, patch
+
+from custom_components.terneo.clock import VirtualClock
+from custom_components.terneo.scheduler import TerneoScheduler
+
+
+def test_scheduler_reschedule_keeps_single_timer() -> None:
+    """Test moving a deadline later does not create new clock timers."""
+    clock = VirtualClock()
+    scheduler = TerneoScheduler(clock)
+    action = MagicMock()
+
+    with patch.object(clock, "call_later", wraps=clock.call_later) as call_later:
+        for _ in range(100):
+            scheduler.schedule("optimistic", 60, action)
+            clock.advance(0.1)
+        assert call_later.call_count == 1
+        assert len(scheduler) == 1
+
+        clock.advance(59.8)
+        action.assert_not_called()
+        clock.advance(0.2)
+
+    action.assert_called_once()
+    assert len(scheduler) == 0
+
+
+def test_scheduler_cancel_and_interval() -> None:
+    """Test cancellation, periodic work and cancel_all."""
+    clock = VirtualClock()
+    scheduler = TerneoScheduler(clock)
+    cancelled = MagicMock()
+    periodic = MagicMock()
+    earlier = MagicMock()
+
+    cancel = scheduler.schedule("a", 10, cancelled)
+    scheduler.schedule_interval("b", 300, periodic)
+    scheduler.schedule("c", 5, earlier)
+    cancel()
+
+    clock.advance(900)
+    cancelled.assert_not_called()
+    earlier.assert_called_once()
+    assert periodic.call_count == 3
+
+    scheduler.cancel_all()
+    clock.advance(900)
+    assert periodic.call_count == 3
+    assert len(scheduler) == 0
+
+
+def test_scheduler_stale_cancel_keeps_new_deadline() -> None:
+    """Test a cancel callback from a replaced deadline is a no-op."""
+    clock = VirtualClock()
+    scheduler = TerneoScheduler(clock)
+    first = MagicMock()
+    second = MagicMock()
+
+    cancel_first = scheduler.schedule("key", 10, first)
+    scheduler.schedule("key", 20, second)
+    cancel_first()
+    clock.advance(20)
+
+    first.assert_not_called()
+    second.assert_called_once()
+
+
+def test_scheduler_isolates_failing_actions() -> None:
+    """Test one failing action does not stop the others."""
+    clock = VirtualClock()
+    scheduler = TerneoScheduler(clock)
+    action = MagicMock()
+
+    scheduler.schedule("bad", 1, MagicMock(side_effect=ValueError))
+    scheduler.schedule("good", 1, action)
+    clock.advance(1)
+
+    action.assert_called_once()
+
+
+def test_scheduler_scopes_share_timer_but_not_keys() -> None:
+    """Test scopes keep their own keys and cancel only their own deadlines."""
+    clock = VirtualClock()
+    scheduler = TerneoScheduler(clock)
+    first = scheduler.scope()
+    second = scheduler.scope()
+    kept = MagicMock()
+    dropped = MagicMock()
+
+    first.schedule("flush", 5, dropped)
+    second.schedule("flush", 5, kept)
+    assert "flush" in first
+    assert len(scheduler) == 2
+    first.cancel_all()
+    clock.advance(5)
+
+    dropped.assert_not_called()
+    kept.assert_called_once()
+    assert "flush" not in second
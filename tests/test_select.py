@@ -4,6 +4,7 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from custom_components.terneo.clock import VirtualClock
 from custom_components.terneo.select import TerneoSelect
 
 
@@ -38,6 +39,7 @@ async def test_select_async_select_option() -> None:
     """Test selecting an option."""
     hass = MagicMock()
     coordinator = MagicMock()
+    coordinator.clock = VirtualClock()
     coordinator.client_id = "terneo_ax_1B0026"
     coordinator.telemetry_prefix = "terneo"
     coordinator.command_prefix = "terneo"
@@ -4,11 +4,14 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from custom_components.terneo.aggregates import TerneoRollingWindow
+from custom_components.terneo.clock import VirtualClock
 from custom_components.terneo.sensor import (
     TerneoEnergySensor,
     TerneoPowerSensor,
     TerneoSensor,
     TerneoStateSensor,
+    TerneoWindowSensor,
     async_setup_entry,
 )
 
@@ -42,6 +45,7 @@ async def test_sensor_async_added_to_hass(mock_dispatcher) -> None:
     """Test dispatcher connection when entity is added."""
     hass = MagicMock()
     coordinator = MagicMock()
+    coordinator.clock = VirtualClock()
     coordinator.client_id = "terneo_ax_1B0026"
     coordinator.get_value.return_value = None
     entity = TerneoSensor(
@@ -58,9 +62,13 @@ async def test_sensor_async_added_to_hass(mock_dispatcher) -> None:
 
     await entity.async_added_to_hass()
 
-    mock_dispatcher.assert_called_once_with(
+    assert mock_dispatcher.call_count == 2
+    mock_dispatcher.assert_any_call(
         hass, "terneo_terneo_ax_1B0026_update", entity._handle_coordinator_update
     )
+    mock_dispatcher.assert_any_call(
+        hass, "terneo_terneo_ax_1B0026_snapshot", entity._handle_snapshot
+    )
 
 
 @pytest.mark.asyncio
@@ -71,6 +79,7 @@ async def test_sensor_async_will_remove_from_hass(mock_dispatcher) -> None:
     mock_dispatcher.return_value = unsubscribe_mock
     hass = MagicMock()
     coordinator = MagicMock()
+    coordinator.clock = VirtualClock()
     coordinator.client_id = "terneo_ax_1B0026"
     coordinator.get_value.return_value = None
     entity = TerneoSensor(
@@ -88,7 +97,7 @@ async def test_sensor_async_will_remove_from_hass(mock_dispatcher) -> None:
     await entity.async_added_to_hass()
     await entity.async_will_remove_from_hass()
 
-    unsubscribe_mock.assert_called_once()
+    assert unsubscribe_mock.call_count == 2
 
 
 @pytest.mark.asyncio
@@ -162,7 +171,7 @@ async def test_sensor_async_setup_entry(mock_coordinator_class) -> None:
     # Verify entities were added
     async_add_entities.assert_called_once()
     entities = async_add_entities.call_args[0][0]
-    assert len(entities) == 3  # floor_temp, prot_temp, state_sensor
+    assert len(entities) == 11  # floor_temp, prot_temp, state, diagnostics
     assert sum(1 for e in entities if isinstance(e, TerneoSensor)) == 2
     assert sum(1 for e in entities if isinstance(e, TerneoStateSensor)) == 1
 
@@ -259,7 +268,7 @@ async def test_sensor_async_setup_entry_with_energy(mock_coordinator_class) -> N
     # Verify entities were added
     async_add_entities.assert_called_once()
     entities = async_add_entities.call_args[0][0]
-    assert len(entities) == 5  # 3 basic + 2 energy sensors per device
+    assert len(entities) == 13  # 11 basic + 2 energy sensors per device
     assert sum(1 for e in entities if isinstance(e, TerneoSensor)) == 2
     assert sum(1 for e in entities if isinstance(e, TerneoPowerSensor)) == 1
     assert sum(1 for e in entities if isinstance(e, TerneoEnergySensor)) == 1
@@ -306,6 +315,7 @@ async def test_energy_sensor() -> None:
     coordinator = MagicMock()
     coordinator.client_id = "terneo_ax_1B0026"
     coordinator.get_value.return_value = None
+    coordinator.clock = VirtualClock()
 
     entity = TerneoEnergySensor(
         hass=hass,
@@ -328,7 +338,7 @@ async def test_energy_sensor() -> None:
     entity._handle_load_update("load", 1)
 
     # Simulate time passing (1 hour = 3600 seconds)
-    entity._last_update = entity._last_update - 3600
+    coordinator.clock.advance(3600)
 
     # Second update after 1 hour
     entity._handle_load_update("load", 1)
@@ -336,3 +346,93 @@ async def test_energy_sensor() -> None:
     # Should have consumed 1.5 kWh (1500W * 1h = 1.5 kWh)
     assert abs(entity._attr_native_value - 1.5) < 0.01
     assert entity.async_write_ha_state.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_energy_sensor_rated_power_change() -> None:
+    """Test a rated power change closes the running interval at the old rate."""
+    hass = MagicMock()
+    coordinator = MagicMock()
+    coordinator.client_id = "terneo_ax_1B0026"
+    coordinator.get_value.return_value = None
+    coordinator.clock = VirtualClock()
+
+    entity = TerneoEnergySensor(
+        hass=hass,
+        coordinator=coordinator,
+        rated_power_w=1000,
+        model="AX",
+    )
+    entity.async_write_ha_state = MagicMock()
+
+    entity._handle_load_update("load", 1)
+    coordinator.clock.advance(3600)
+    entity.set_rated_power(2000)
+    coordinator.clock.advance(3600)
+    entity._handle_load_update("load", 0)
+
+    # 1 kWh at the old rate plus 2 kWh at the new one
+    assert abs(entity._attr_native_value - 3.0) < 0.01
+
+
+@pytest.mark.asyncio
+async def test_window_sensor_publishes_its_statistic() -> None:
+    """Test a window sensor only writes for its own window length."""
+    hass = MagicMock()
+    coordinator = MagicMock()
+    coordinator.clock = VirtualClock()
+    coordinator.client_id = "terneo_ax_1B0026"
+    window = TerneoRollingWindow(3600)
+    window.add(0, 20.0)
+    window.add(10, 21.5)
+    coordinator.windows = {"floorTemp": {3600: window}}
+    entity = TerneoWindowSensor(hass, coordinator, "floorTemp", 3600, "mean")
+    entity.async_write_ha_state = MagicMock()
+
+    assert entity.unique_id == "terneo_ax_1B0026_floorTemp_mean_60m"
+    assert entity.name == "Terneo terneo_ax_1B0026 Floor Temperature Mean 60 min"
+
+    entity._handle_aggregates(900)
+    entity.async_write_ha_state.assert_not_called()
+    entity._handle_aggregates(3600)
+    entity.async_write_ha_state.assert_called_once()
+    assert entity.native_value == 20.75
+
+
+@pytest.mark.asyncio
+async def test_air_temp_window_sensors_follow_option() -> None:
+    """Test airTemp window sensors are added and removed with the option."""
+    coordinator = MagicMock()
+    coordinator.client_id = "test_device"
+    coordinator.supports_air_temp = False
+    hass = MagicMock()
+    hass.data = {"terneo": {"test_entry": {"test_device": coordinator}}}
+    config_entry = MagicMock()
+    config_entry.entry_id = "test_entry"
+    config_entry.data = {"devices": [{"client_id": "test_device"}]}
+    config_entry.options = {"topic_prefix": "terneo", "aggregate_windows": ["60"]}
+    async_add_entities = MagicMock()
+
+    with patch(
+        "custom_components.terneo.sensor.async_dispatcher_connect"
+    ) as mock_connect:
+        await async_setup_entry(hass, config_entry, async_add_entities)
+    options_updated = mock_connect.call_args.args[2]
+
+    def window_keys(entities):
+        return {e._key for e in entities if isinstance(e, TerneoWindowSensor)}
+
+    assert window_keys(async_add_entities.call_args.args[0]) == {"floorTemp"}
+
+    coordinator.supports_air_temp = True
+    options_updated({"supports_air_temp": True})
+    added = async_add_entities.call_args.args[0]
+    assert len(added) == 3
+    assert window_keys(added) == {"airTemp"}
+
+    for entity in added:
+        entity.entity_id = f"sensor.{entity.unique_id}"
+    coordinator.supports_air_temp = False
+    with patch("custom_components.terneo.sensor.er.async_get") as mock_registry:
+        options_updated({"supports_air_temp": False})
+    assert mock_registry.return_value.async_remove.call_count == 3
@@ -0,0 +1,237 @@
+"""Test TerneoMQ services."""
+
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+from zoneinfo import ZoneInfo
+
+import pytest
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util import dt as dt_util
+
+from custom_components.terneo.clock import VirtualClock
+from custom_components.terneo.const import DATA_RUNTIME, DOMAIN
+from custom_components.terneo.rollups import TerneoRollup
+from custom_components.terneo.services import async_setup_services
+
+
+def _registered_handlers(hass: MagicMock) -> dict:
+    return {
+        call.args[1]: call.args[2]
+        for call in hass.services.async_register.call_args_list
+    }
+
+
+@pytest.mark.asyncio
+async def test_device_services() -> None:
+    """Test add and remove device services target one entry."""
+    hass = MagicMock()
+    entry = MagicMock()
+    entry.domain = DOMAIN
+    hass.config_entries.async_get_entry.side_effect = lambda entry_id: (
+        entry if entry_id == "test_entry" else None
+    )
+
+    call = MagicMock()
+    call.data = {"config_entry_id": "test_entry", "client_id": "terneo_ax_2"}
+    with (
+        patch(
+            "custom_components.terneo.async_add_device", AsyncMock(return_value=True)
+        ) as mock_add,
+        patch(
+            "custom_components.terneo.async_remove_device",
+            AsyncMock(return_value=False),
+        ) as mock_remove,
+    ):
+        async_setup_services(hass)
+        handlers = _registered_handlers(hass)
+        await handlers["add_device"](call)
+        with pytest.raises(ServiceValidationError):
+            await handlers["remove_device"](call)
+
+    mock_add.assert_awaited_once_with(hass, entry, "terneo_ax_2")
+    mock_remove.assert_awaited_once_with(hass, entry, "terneo_ax_2")
+
+    call.data = {"config_entry_id": "missing", "client_id": "terneo_ax_2"}
+    with pytest.raises(ServiceValidationError):
+        await handlers["add_device"](call)
+
+
+def test_get_daily_rollups_service() -> None:
+    """Test the rollup service returns totals of the matching devices."""
+    clock = VirtualClock()
+    coordinator = MagicMock()
+    coordinator.clock = clock
+    coordinator.rollup = TerneoRollup()
+    coordinator.rollup.add(0, "load", 1)
+    clock.advance(5400)
+    runtime = MagicMock()
+    runtime.settings = {"rated_power_w": 1000}
+    hass = MagicMock()
+    hass.data = {
+        DOMAIN: {
+            DATA_RUNTIME: {"entry_a": runtime, "entry_b": runtime},
+            "entry_a": {"dev1": coordinator},
+            "entry_b": {"dev2": coordinator},
+        }
+    }
+    async_setup_services(hass)
+    handler = _registered_handlers(hass)["get_daily_rollups"]
+
+    call = MagicMock()
+    call.data = {"client_id": "dev1"}
+    assert handler(call) == {
+        "devices": {
+            "dev1": {
+                "today": {
+                    "heating_hours": 1.5,
+                    "energy_kwh": 1.5,
+                    "floor_min": None,
+                    "floor_max": None,
+                },
+                "yesterday": None,
+            }
+        }
+    }
+    call.data = {"config_entry_id": "entry_b"}
+    assert list(handler(call)["devices"]) == ["dev2"]
+    call.data = {}
+    assert list(handler(call)["devices"]) == ["dev1", "dev2"]
+
+
+@pytest.mark.asyncio
+async def test_export_service(tmp_path) -> None:
+    """Test the export service writes the archive of an entry to a CSV file."""
+    entry = MagicMock()
+    entry.domain = DOMAIN
+    entry.entry_id = "entry_a"
+    runtime = MagicMock()
+    runtime.archive = None
+    hass = MagicMock()
+    hass.data = {DOMAIN: {DATA_RUNTIME: {"entry_a": runtime}}}
+    hass.config_entries.async_get_entry.return_value = entry
+    hass.config.path.side_effect = lambda name: str(tmp_path / name)
+    hass.async_add_executor_job = AsyncMock(return_value=3)
+    async_setup_services(hass)
+    handler = _registered_handlers(hass)["export"]
+
+    call = MagicMock()
+    call.data = {
+        "config_entry_id": "entry_a",
+        "start": datetime(2024, 3, 1, tzinfo=UTC),
+        "filename": "export.csv",
+    }
+    with pytest.raises(ServiceValidationError):
+        await handler(call)
+
+    runtime.archive = MagicMock()
+    hass.config.is_allowed_path.return_value = False
+    with pytest.raises(ServiceValidationError):
+        await handler(call)
+
+    hass.config.is_allowed_path.return_value = True
+    assert await handler(call) == {"path": str(tmp_path / "export.csv"), "rows": 3}
+    args = hass.async_add_executor_job.call_args.args
+    assert args[0] is runtime.archive.export_csv
+    assert args[1:3] == (tmp_path / "export.csv", datetime(2024, 3, 1, tzinfo=UTC))
+    assert args[4] is None
+
+    # Times without a time zone are local time
+    call.data = {**call.data, "start": datetime(2024, 3, 1)}  # noqa: DTZ001
+    with patch.object(dt_util, "DEFAULT_TIME_ZONE", ZoneInfo("Europe/Kyiv")):
+        await handler(call)
+    args = hass.async_add_executor_job.call_args.args
+    assert args[2] == datetime(2024, 2, 29, 22, tzinfo=UTC)
+
+
+def test_get_snapshot_service() -> None:
+    """Test the snapshot service reads values and derived state of devices."""
+    clock = VirtualClock()
+    heating = MagicMock()
+    heating.clock = clock
+    heating.last_seen = 0.0
+    heating.get_values.return_value = {
+        "powerOff": 0,
+        "load": 1,
+        "setTemp": 26.0,
+        "floorTemp": 22.0,
+    }
+    silent = MagicMock()
+    silent.clock = clock
+    silent.last_seen = None
+    silent.get_values.return_value = {}
+    clock.advance(12.5)
+    hass = MagicMock()
+    hass.data = {
+        DOMAIN: {
+            DATA_RUNTIME: {"entry_a": MagicMock(), "entry_b": MagicMock()},
+            "entry_a": {"dev1": heating, "dev2": silent},
+            "entry_b": {"dev1": heating, "dev3": silent},
+        }
+    }
+    async_setup_services(hass)
+    handler = _registered_handlers(hass)["get_snapshot"]
+
+    call = MagicMock()
+    call.data = {}
+    devices = handler(call)["devices"]
+    assert sorted(devices) == ["dev1", "dev2", "dev3"]
+    assert devices["dev1"] == {
+        "values": {"powerOff": 0, "load": 1, "setTemp": 26.0, "floorTemp": 22.0},
+        "hvac_mode": "heat",
+        "hvac_action": "heating",
+        "last_seen_age": 12.5,
+        "available": True,
+    }
+    assert devices["dev2"] == {
+        "values": {},
+        "hvac_mode": None,
+        "hvac_action": None,
+        "last_seen_age": None,
+        "available": False,
+    }
+
+    call.data = {"config_entry_id": "entry_b", "client_id": ["dev1", "dev2"]}
+    assert list(handler(call)["devices"]) == ["dev1"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_command_service_targets_areas() -> None:
+    """Test the bulk command service resolves its target to coordinators."""
+    coordinators = {f"dev{i}": MagicMock() for i in range(3)}
+    hass = MagicMock()
+    hass.data = {
+        DOMAIN: {DATA_RUNTIME: {"entry_a": MagicMock()}, "entry_a": coordinators}
+    }
+    areas = {"dev0": "bedroom", "dev1": "kitchen", "dev2": "bedroom"}
+    device_registry = MagicMock()
+    device_registry.async_get_device.side_effect = lambda identifiers: MagicMock(
+        area_id=areas[next(iter(identifiers))[1]]
+    )
+    call = MagicMock()
+    call.data = {
+        "client_id": ["dev0", "dev1"],
+        "area_id": ["bedroom"],
+        "fields": {"mode": "away"},
+        "max_concurrency": 5,
+        "jitter": 0.0,
+    }
+    with (
+        patch(
+            "custom_components.terneo.services.dr.async_get",
+            return_value=device_registry,
+        ),
+        patch(
+            "custom_components.terneo.services.async_bulk_command",
+            AsyncMock(return_value={"dev0": {"success": True}}),
+        ) as mock_bulk,
+    ):
+        async_setup_services(hass)
+        handler = _registered_handlers(hass)["bulk_command"]
+        assert await handler(call) == {"devices": {"dev0": {"success": True}}}
+        args = mock_bulk.call_args.args
+        assert list(args[0]) == [coordinators["dev0"]]
+        assert args[1:] == ({"mode": "away"}, 5, 0.0)
+
+        call.data = {**call.data, "area_id": ["garage"]}
+        with pytest.raises(ServiceValidationError):
+            await handler(call)
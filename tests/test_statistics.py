@@ -0,0 +1,138 @@
+"""Test TerneoMQ long-term statistics import."""
+
+import asyncio
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.terneo.clock import VirtualClock
+from custom_components.terneo.coordinator import TerneoCoordinator
+from custom_components.terneo.statistics import (
+    TerneoStatisticsImporter,
+    statistic_id,
+)
+
+
+@pytest.mark.asyncio
+async def test_hourly_statistics_are_batched_and_continue_sums() -> None:
+    """Test every device is closed hourly and its sums continue from the last."""
+    clock = VirtualClock()
+    hass = MagicMock()
+    hass.async_create_background_task = lambda coro, _name: asyncio.ensure_future(coro)
+    coordinators = [
+        TerneoCoordinator(hass, f"dev{i}", "terneo", "terneo", clock=clock)
+        for i in range(3)
+    ]
+    listeners: dict[str, list] = {}
+
+    def _connect(_hass, signal, target):
+        listeners.setdefault(signal, []).append(target)
+        return lambda: listeners[signal].remove(target)
+
+    last_sums = {statistic_id("dev0", "energy"): 10.0}
+
+    async def _get_last_sum(_hass, statistic):
+        return last_sums.get(statistic, 0.0)
+
+    with (
+        patch("custom_components.terneo.statistics.async_dispatcher_connect", _connect),
+        patch(
+            "custom_components.terneo.statistics._async_get_last_sum",
+            AsyncMock(side_effect=_get_last_sum),
+        ),
+        patch("custom_components.terneo.statistics._add_statistics") as mock_add,
+        patch(
+            "custom_components.terneo.statistics.async_track_time_change"
+        ) as mock_track,
+    ):
+        importer = TerneoStatisticsImporter(hass, "entry", rated_power_w=2000)
+        importer.start()
+        for coordinator in coordinators:
+            importer.add_device(coordinator)
+        # The sums of all devices load in the background, not in setup
+        await asyncio.gather(*importer._loads)
+        close_hour = mock_track.call_args.args[1]
+        assert "terneo_entry_options_updated" in listeners
+        assert mock_track.call_args.kwargs == {"minute": 0, "second": 0}
+
+        # dev0 heats for 30 minutes, dev1 for the whole hour, dev2 stays idle
+        for listener in listeners["terneo_dev0_update"]:
+            listener("load", 1)
+        for listener in listeners["terneo_dev1_update"]:
+            listener("load", 1)
+        clock.advance(1800)
+        for listener in listeners["terneo_dev0_update"]:
+            listener("load", 0)
+        clock.advance(1800)
+        close_hour(datetime(2024, 1, 1, 13, 0, 5, tzinfo=UTC))
+
+        assert mock_add.call_count == 6
+        batches = {
+            call.args[1]["statistic_id"]: (call.args[1], call.args[2])
+            for call in mock_add.call_args_list
+        }
+        metadata, rows = batches["terneo:dev0_energy"]
+        assert metadata["has_sum"] is True
+        assert metadata["unit_of_measurement"] == "kWh"
+        assert rows == [
+            {
+                "start": datetime(2024, 1, 1, 12, tzinfo=UTC),
+                "state": 11.0,
+                "sum": 11.0,
+            }
+        ]
+        assert batches["terneo:dev1_heating_time"][1][0]["sum"] == pytest.approx(1.0)
+        assert batches["terneo:dev1_heating_time"][0]["unit_of_measurement"] == "h"
+        assert batches["terneo:dev2_energy"][1][0]["sum"] == 0.0
+
+        # dev1 keeps heating into the next hour
+        mock_add.reset_mock()
+        clock.advance(3600)
+        close_hour(datetime(2024, 1, 1, 14, 0, 5, tzinfo=UTC))
+        batches = {
+            call.args[1]["statistic_id"]: call.args[2]
+            for call in mock_add.call_args_list
+        }
+        assert batches["terneo:dev1_energy"][0]["sum"] == pytest.approx(4.0)
+        assert batches["terneo:dev0_energy"][0]["sum"] == pytest.approx(11.0)
+
+        importer.stop()
+        assert all(not targets for targets in listeners.values())
+
+
+@pytest.mark.asyncio
+async def test_hours_closed_while_sums_load_are_imported_later() -> None:
+    """Test an hour closed before the last sum is known waits for it."""
+    clock = VirtualClock()
+    hass = MagicMock()
+    hass.async_create_background_task = lambda coro, _name: asyncio.ensure_future(coro)
+    coordinator = TerneoCoordinator(hass, "dev0", "terneo", "terneo", clock=clock)
+    loaded = asyncio.Event()
+
+    async def _get_last_sum(_hass, _statistic):
+        await loaded.wait()
+        return 5.0
+
+    with (
+        patch("custom_components.terneo.statistics.async_dispatcher_connect"),
+        patch(
+            "custom_components.terneo.statistics._async_get_last_sum",
+            AsyncMock(side_effect=_get_last_sum),
+        ),
+        patch("custom_components.terneo.statistics._add_statistics") as mock_add,
+        patch(
+            "custom_components.terneo.statistics.async_track_time_change"
+        ) as mock_track,
+    ):
+        importer = TerneoStatisticsImporter(hass, "entry")
+        importer.start()
+        importer.add_device(coordinator)
+        mock_track.call_args.args[1](datetime(2024, 1, 1, 13, 0, 5, tzinfo=UTC))
+        mock_add.assert_not_called()
+
+        loaded.set()
+        await asyncio.gather(*importer._loads)
+
+    mock_add.assert_called_once()
+    assert mock_add.call_args.args[2][0]["sum"] == 5.0
@@ -0,0 +1,85 @@
+"""Test TerneoMQ thermal response estimation."""
+
+import random
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.terneo.history import TerneoRingBuffer
+from custom_components.terneo.sensor import TerneoThermalSensor
+from custom_components.terneo.thermal import (
+    TerneoThermalEstimator,
+    estimate_fleet,
+    estimate_thermal_response,
+)
+
+HEATING_RATE = 1.2  # °C/h
+COOLING_RATE = 0.6  # °C/h
+LAG = 600  # seconds
+
+
+def _simulate_floor(hours: float) -> tuple[TerneoRingBuffer, TerneoRingBuffer]:
+    """Return floor and load history of a floor with a delayed response."""
+    rng = random.Random(2)  # noqa: S311
+    floor = TerneoRingBuffer(10000)
+    load = TerneoRingBuffer(1000)
+    temperature = 22.0
+    state = 0
+    switched = -LAG
+    for step in range(int(hours * 120)):
+        now = step * 30.0
+        if state and temperature > 22.5 and now - switched > LAG:
+            state, switched = 0, now
+            load.append(now, 0)
+        elif not state and temperature < 21.5 and now - switched > LAG:
+            state, switched = 1, now
+            load.append(now, 1)
+        # The floor keeps its previous trend until the lag has passed
+        heating = state if now - switched >= LAG else 1 - state
+        temperature += (HEATING_RATE if heating else -COOLING_RATE) / 120
+        floor.append(now, temperature + rng.gauss(0, 0.02))
+    return floor, load
+
+
+def test_estimate_recovers_rates_and_lag() -> None:
+    """Test the pooled fit finds the simulated rates and lag."""
+    floor, load = _simulate_floor(12)
+    estimate = estimate_thermal_response(floor.copy(), load.copy())
+
+    assert estimate.heating_rate == pytest.approx(HEATING_RATE, rel=0.05)
+    assert estimate.cooling_rate == pytest.approx(COOLING_RATE, rel=0.05)
+    assert estimate.lag == pytest.approx(LAG, abs=120)
+
+
+def test_estimate_without_transitions() -> None:
+    """Test devices without enough data get an empty estimate."""
+    floor = TerneoRingBuffer(10)
+    estimate = estimate_thermal_response(floor.copy(), floor.copy())
+    assert estimate == (None, None, None)
+
+
+@pytest.mark.asyncio
+async def test_estimator_publishes_to_coordinators_and_sensors() -> None:
+    """Test estimates are computed in the executor and reach the sensors."""
+    floor, load = _simulate_floor(12)
+    coordinator = MagicMock()
+    coordinator.client_id = "dev"
+    coordinator.history = {"floorTemp": floor, "load": load}
+    coordinator.thermal = None
+    hass = MagicMock()
+    hass.async_add_executor_job = AsyncMock(
+        side_effect=lambda target, *args: target(*args)
+    )
+    estimator = TerneoThermalEstimator(hass, lambda: [coordinator])
+
+    with patch("custom_components.terneo.thermal.async_dispatcher_send") as mock_send:
+        await estimator.async_update()
+    assert hass.async_add_executor_job.call_args.args[0] is estimate_fleet
+    mock_send.assert_called_once_with(hass, "terneo_dev_thermal")
+    assert coordinator.thermal.heating_rate == pytest.approx(HEATING_RATE, rel=0.05)
+
+    sensor = TerneoThermalSensor(hass, coordinator, "lag")
+    sensor.async_write_ha_state = MagicMock()
+    sensor._handle_estimate()
+    assert sensor.native_value == pytest.approx(LAG / 60, abs=2)
+    assert sensor.unique_id == "dev_lag"
@@ -0,0 +1,145 @@
+"""Test TerneoMQ websocket API."""
+
+from unittest.mock import MagicMock, patch
+
+from custom_components.terneo.clock import VirtualClock
+from custom_components.terneo.const import (
+    SIGNAL_COORDINATOR_ADDED,
+    SIGNAL_COORDINATOR_REMOVED,
+)
+from custom_components.terneo.coordinator import TerneoCoordinator
+from custom_components.terneo.scheduler import TerneoScheduler
+from custom_components.terneo.websocket import ws_subscribe_telemetry
+
+
+def _message(topic: str, payload: str) -> MagicMock:
+    msg = MagicMock()
+    msg.topic = topic
+    msg.payload = payload
+    return msg
+
+
+def test_subscribe_telemetry_sends_coalesced_deltas() -> None:
+    """Test raw telemetry is batched per interval and unchanged keys dropped."""
+    clock = VirtualClock()
+    hass = MagicMock()
+    coordinators = [
+        TerneoCoordinator(hass, f"dev{i}", "terneo", "terneo", clock=clock)
+        for i in range(3)
+    ]
+    coordinators[0].set_cached_value("floorTemp", 21.0)
+    hub = MagicMock()
+    hub.coordinators.return_value = coordinators
+    connection = MagicMock()
+    connection.subscriptions = {}
+
+    with (
+        patch("custom_components.terneo.websocket.get_hub", return_value=hub),
+        patch(
+            "custom_components.terneo.websocket.get_scheduler",
+            return_value=TerneoScheduler(clock),
+        ),
+        patch("custom_components.terneo.coordinator.async_dispatcher_send"),
+    ):
+        ws_subscribe_telemetry(
+            hass,
+            connection,
+            {
+                "id": 5,
+                "type": "terneo/subscribe_telemetry",
+                "client_ids": ["dev0", "dev1"],
+                "keys": ["floorTemp", "load"],
+                "interval": 2.0,
+            },
+        )
+        connection.send_result.assert_called_once_with(5)
+        events = [call.args[0] for call in connection.send_message.call_args_list]
+        assert events[-1]["event"] == {"devices": {"dev0": {"floorTemp": 21.0}}}
+
+        connection.send_message.reset_mock()
+        for payload in ("21.5", "22.0", "22.5"):
+            coordinators[0]._handle_message(_message("terneo/dev0/floorTemp", payload))
+        coordinators[0]._handle_message(_message("terneo/dev0/setTemp", "25"))
+        coordinators[1]._handle_message(_message("terneo/dev1/load", "1"))
+        coordinators[2]._handle_message(_message("terneo/dev2/load", "1"))
+        clock.advance(1.9)
+        connection.send_message.assert_not_called()
+        clock.advance(0.1)
+        assert connection.send_message.call_count == 1
+        event = connection.send_message.call_args.args[0]
+        assert event["id"] == 5
+        assert event["event"] == {
+            "devices": {"dev0": {"floorTemp": 22.5}, "dev1": {"load": 1}}
+        }
+
+        # A repeated value produces no batch
+        connection.send_message.reset_mock()
+        coordinators[1]._handle_message(_message("terneo/dev1/load", "1"))
+        clock.advance(2)
+        connection.send_message.assert_not_called()
+
+        connection.subscriptions[5]()
+        coordinators[0]._handle_message(_message("terneo/dev0/floorTemp", "23.0"))
+        clock.advance(2)
+        connection.send_message.assert_not_called()
+        assert not coordinators[0]._telemetry_listeners
+
+
+def test_subscribe_telemetry_follows_replaced_coordinators() -> None:
+    """Test a reloaded device keeps streaming through its new coordinator."""
+    clock = VirtualClock()
+    hass = MagicMock()
+    old = TerneoCoordinator(hass, "dev0", "terneo", "terneo", clock=clock)
+    hub = MagicMock()
+    hub.coordinators.return_value = [old]
+    connection = MagicMock()
+    connection.subscriptions = {}
+    signals = {}
+
+    def connect(_hass, signal, target):
+        signals[signal] = target
+        return MagicMock()
+
+    with (
+        patch("custom_components.terneo.websocket.get_hub", return_value=hub),
+        patch(
+            "custom_components.terneo.websocket.get_scheduler",
+            return_value=TerneoScheduler(clock),
+        ),
+        patch(
+            "custom_components.terneo.websocket.async_dispatcher_connect",
+            side_effect=connect,
+        ),
+        patch("custom_components.terneo.coordinator.async_dispatcher_send"),
+    ):
+        ws_subscribe_telemetry(
+            hass,
+            connection,
+            {
+                "id": 7,
+                "type": "terneo/subscribe_telemetry",
+                "client_ids": ["dev0"],
+                "keys": ["floorTemp"],
+                "interval": 1.0,
+            },
+        )
+        signals[SIGNAL_COORDINATOR_REMOVED](old)
+        assert not old._telemetry_listeners
+
+        new = TerneoCoordinator(hass, "dev0", "terneo", "terneo", clock=clock)
+        new.set_cached_value("floorTemp", 21.0)
+        signals[SIGNAL_COORDINATOR_ADDED](new)
+        signals[SIGNAL_COORDINATOR_ADDED](
+            TerneoCoordinator(hass, "dev1", "terneo", "terneo", clock=clock)
+        )
+        clock.advance(1)
+        event = connection.send_message.call_args.args[0]
+        assert event["event"] == {"devices": {"dev0": {"floorTemp": 21.0}}}
+
+        new._handle_message(_message("terneo/dev0/floorTemp", "22.0"))
+        clock.advance(1)
+        event = connection.send_message.call_args.args[0]
+        assert event["event"] == {"devices": {"dev0": {"floorTemp": 22.0}}}
+
+        connection.subscriptions[7]()
+        assert not new._telemetry_listeners